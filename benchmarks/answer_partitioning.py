@@ -0,0 +1,130 @@
+import argparse
+import asyncio
+import random
+import statistics
+import sys
+import time
+from collections.abc import Awaitable, Callable
+from typing import Any
+from uuid import UUID
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncEngine, create_async_engine
+
+from kittens_answers_core.models import Answer
+from kittens_answers_core.models.db_models import Base, partition_answers
+from kittens_answers_core.uow.db import SQLAlchemyUnitOfWork
+
+LOAD_QUESTIONS = text(
+    """
+    WITH roots AS (
+        INSERT INTO root_questions (root_uid, question_type, text, normalized_text)
+        SELECT gen_random_uuid(), 'ONE', 'question ' || g, 'question ' || g FROM generate_series(1, :questions) AS g
+        RETURNING root_uid
+    )
+    INSERT INTO questions (uid, creator_id, options, extra_options, root_question_uid)
+    SELECT gen_random_uuid(), :creator, '{}', '{}', root_uid FROM roots
+    """
+)
+LOAD_ANSWERS = text(
+    """
+    INSERT INTO answers (uid, creator_id, question_uid, answer, extra_answer, is_correct)
+    SELECT gen_random_uuid(), :creator, uids[1 + g % cardinality(uids)], ARRAY[g::text], '{}', g % 2 = 0
+    FROM generate_series(1, :rows) AS g, (SELECT array_agg(uid) AS uids FROM questions) AS q
+    """
+)
+
+
+async def _latencies(samples: int, operation: Callable[[], Awaitable[Any]]) -> str:
+    timings = []
+    for _ in range(samples):
+        started = time.perf_counter()
+        await operation()
+        timings.append((time.perf_counter() - started) * 1000)
+    timings.sort()
+    return f"p50 {statistics.median(timings):.2f} ms, p99 {timings[int(len(timings) * 0.99) - 1]:.2f} ms"
+
+
+async def _run(engine: AsyncEngine, partitions: int, arguments: argparse.Namespace) -> None:
+    async with engine.begin() as connection:
+        await connection.run_sync(Base.metadata.drop_all)
+        await connection.run_sync(partition_answers(partitions).create_all)
+
+    uow = SQLAlchemyUnitOfWork(engine)
+    async with uow:
+        creator = (await uow.user_services.create("benchmark")).uid
+        await uow.commit()
+    started = time.perf_counter()
+    async with engine.begin() as connection:
+        await connection.execute(LOAD_QUESTIONS, {"questions": arguments.questions, "creator": creator})
+        await connection.execute(LOAD_ANSWERS, {"rows": arguments.rows, "creator": creator})
+    async with engine.connect() as connection:
+        await connection.execution_options(isolation_level="AUTOCOMMIT")
+        await connection.execute(text("VACUUM ANALYZE answers"))
+        question_uids: list[UUID] = list(await connection.scalars(text("SELECT uid FROM questions")))
+        answers = [
+            Answer(
+                uid=uid, creator=creator, question_uid=question_uid, answer=answer, extra_answer=[], is_correct=correct
+            )
+            for uid, question_uid, answer, correct in await connection.execute(
+                text("SELECT uid, question_uid, answer, is_correct FROM answers TABLESAMPLE SYSTEM (1) LIMIT :limit"),
+                {"limit": arguments.samples},
+            )
+        ]
+    report = [f"partitions={partitions}: load {arguments.rows / (time.perf_counter() - started):,.0f} rows/s"]
+
+    async def list_for_question() -> None:
+        async with uow:
+            await uow.answer_services.list_for_question(random.choice(question_uids))  # noqa: S311
+
+    async def get() -> None:
+        answer = random.choice(answers)  # noqa: S311
+        async with uow:
+            await uow.answer_services.get(
+                answer.answer, answer.extra_answer, answer.question_uid, is_correct=answer.is_correct
+            )
+
+    async def get_by_uid() -> None:
+        async with uow:
+            await uow.answer_services.get_by_uid(random.choice(answers).uid)  # noqa: S311
+
+    counter = iter(range(arguments.samples))
+
+    async def create() -> None:
+        async with uow:
+            await uow.answer_services.create(
+                [f"new {next(counter)}"], [], random.choice(question_uids), creator, is_correct=True  # noqa: S311
+            )
+            await uow.commit()
+
+    for name, operation in (
+        ("list_for_question", list_for_question),
+        ("get", get),
+        ("get_by_uid", get_by_uid),
+        ("create", create),
+    ):
+        report.append(f"  {name}: {await _latencies(arguments.samples, operation)}")
+    sys.stdout.write("\n".join(report) + "\n")
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description="Compare answer lookups and inserts with and without partitioning.")
+    parser.add_argument("url", help="postgresql+psycopg:// URL of a scratch database")
+    parser.add_argument("--rows", type=int, default=10_000_000)
+    parser.add_argument("--questions", type=int, default=100_000)
+    parser.add_argument("--partitions", type=int, default=16)
+    parser.add_argument("--samples", type=int, default=1_000)
+    arguments = parser.parse_args()
+
+    engine = create_async_engine(arguments.url)
+    try:
+        for partitions in (0, arguments.partitions):
+            await _run(engine, partitions, arguments)
+    finally:
+        async with engine.begin() as connection:
+            await connection.run_sync(Base.metadata.drop_all)
+        await engine.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
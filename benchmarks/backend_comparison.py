@@ -0,0 +1,129 @@
+import argparse
+import asyncio
+import random
+import statistics
+import sys
+import tempfile
+import time
+from collections.abc import Awaitable, Callable
+from pathlib import Path
+from typing import Any
+
+from kittens_answers_core.models import AnswerSubmission, Question, QuestionTypes
+from kittens_answers_core.models.db_models import Base
+from kittens_answers_core.uow.base import BaseUnitOfWork
+from kittens_answers_core.uow.db import SQLAlchemyUnitOfWork
+from kittens_answers_core.uow.memory import MemoryUnitOfWork
+from kittens_answers_core.uow.sqlite import SQLiteUnitOfWork
+
+
+async def _latencies(samples: int, operation: Callable[[], Awaitable[Any]]) -> str:
+    timings = []
+    for _ in range(samples):
+        started = time.perf_counter()
+        await operation()
+        timings.append((time.perf_counter() - started) * 1000)
+    timings.sort()
+    return f"p50 {statistics.median(timings):.2f} ms, p99 {timings[int(len(timings) * 0.99) - 1]:.2f} ms"
+
+
+async def _run(name: str, uow: BaseUnitOfWork[Any, Any, Any], arguments: argparse.Namespace) -> None:
+    started = time.perf_counter()
+    async with uow:
+        creator = (await uow.user_services.create("benchmark")).uid
+        questions: list[Question] = [
+            await uow.question_services.create(
+                QuestionTypes.ONE, f"question number {index}", {"a", "b"}, set(), creator
+            )
+            for index in range(arguments.questions)
+        ]
+        await uow.commit()
+    for offset in range(0, arguments.answers, arguments.batch_size):
+        async with uow:
+            await uow.answer_services.create_many(
+                [
+                    AnswerSubmission(
+                        creator=creator,
+                        question_uid=questions[index % len(questions)].uid,
+                        answer=[f"answer {index}"],
+                        extra_answer=[],
+                        is_correct=index % 2 == 0,
+                    )
+                    for index in range(offset, min(offset + arguments.batch_size, arguments.answers))
+                ]
+            )
+            await uow.commit()
+    report = [f"{name}: load {time.perf_counter() - started:.2f} s"]
+
+    async def get_question() -> None:
+        question = random.choice(questions)  # noqa: S311
+        async with uow:
+            await uow.question_services.get(
+                question.question_type, question.text, question.options, question.extra_options
+            )
+
+    async def list_for_question() -> None:
+        async with uow:
+            await uow.answer_services.list_for_question(random.choice(questions).uid)  # noqa: S311
+
+    async def get_statistics() -> None:
+        async with uow:
+            await uow.answer_services.get_statistics(random.choice(questions).uid)  # noqa: S311
+
+    async def search() -> None:
+        async with uow:
+            await uow.question_services.search(f"question numbr {random.randrange(arguments.questions)}")  # noqa: S311
+
+    counter = iter(range(arguments.samples))
+
+    async def create() -> None:
+        async with uow:
+            await uow.answer_services.create(
+                [f"new {next(counter)}"], [], random.choice(questions).uid, creator, is_correct=True  # noqa: S311
+            )
+            await uow.commit()
+
+    for operation_name, operation in (
+        ("get_question", get_question),
+        ("list_for_question", list_for_question),
+        ("get_statistics", get_statistics),
+        ("search", search),
+        ("create", create),
+    ):
+        report.append(f"  {operation_name}: {await _latencies(arguments.samples, operation)}")
+    sys.stdout.write("\n".join(report) + "\n")
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Run the same workload against the memory, SQLite and Postgres backends."
+    )
+    parser.add_argument("--postgres", help="postgresql+psycopg:// URL of a scratch database")
+    parser.add_argument("--questions", type=int, default=2_000)
+    parser.add_argument("--answers", type=int, default=50_000)
+    parser.add_argument("--batch-size", type=int, default=500)
+    parser.add_argument("--samples", type=int, default=500)
+    arguments = parser.parse_args()
+
+    await _run("memory", MemoryUnitOfWork(), arguments)
+    with tempfile.TemporaryDirectory() as directory:
+        sqlite_uow = SQLiteUnitOfWork(f"sqlite+aiosqlite:///{Path(directory) / 'benchmark.db'}")
+        async with sqlite_uow._engine.begin() as connection:
+            await connection.run_sync(Base.metadata.create_all)
+        await _run("sqlite", sqlite_uow, arguments)
+        await sqlite_uow._engine.dispose()
+    if arguments.postgres:
+        postgres_uow = SQLAlchemyUnitOfWork(arguments.postgres)
+        async with postgres_uow._engine.begin() as connection:
+            await connection.run_sync(Base.metadata.drop_all)
+            await connection.run_sync(Base.metadata.create_all)
+        try:
+            await _run("postgres", postgres_uow, arguments)
+        finally:
+            async with postgres_uow._engine.begin() as connection:
+                await connection.run_sync(Base.metadata.drop_all)
+            await postgres_uow._engine.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,100 @@
+import argparse
+import asyncio
+import sys
+import tempfile
+import tracemalloc
+from pathlib import Path
+from typing import Any
+
+import pyarrow as pa
+
+from kittens_answers_core.models import AnswerSubmission, QuestionTypes
+from kittens_answers_core.models.db_models import Base
+from kittens_answers_core.services.export import DEFAULT_BATCH_SIZE, export_parquet
+from kittens_answers_core.uow.base import BaseUnitOfWork
+from kittens_answers_core.uow.db import SQLAlchemyUnitOfWork
+from kittens_answers_core.uow.memory import MemoryUnitOfWork
+
+OPTIONS = [f"option {index}" for index in range(20)]
+
+
+def _subset(mask: int) -> list[str]:
+    return [option for bit, option in enumerate(OPTIONS) if mask >> bit & 1]
+
+
+async def _load(uow: BaseUnitOfWork[Any, Any, Any], questions: int, answers: int) -> None:
+    async with uow:
+        creators = [
+            (await uow.user_services.create(f"benchmark {index}")).uid for index in range(-(-answers // questions))
+        ]
+        creator = creators[0]
+        created = [
+            await uow.question_services.create(
+                QuestionTypes.MANY,
+                f"question number {index}",
+                set(OPTIONS[index % 15 : index % 15 + 5]),
+                set(),
+                creator,
+            )
+            for index in range(questions)
+        ]
+        await uow.commit()
+    for start in range(0, answers, 5_000):
+        async with uow:
+            await uow.answer_services.create_many(
+                [
+                    AnswerSubmission(
+                        creator=creators[index // questions],
+                        question_uid=created[index % questions].uid,
+                        answer=_subset(index // questions + 1),
+                        extra_answer=[],
+                        is_correct=index % 2 == 0,
+                    )
+                    for index in range(start, min(start + 5_000, answers))
+                ]
+            )
+            await uow.commit()
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description="Export a synthetic dataset to Parquet and report throughput.")
+    parser.add_argument("url", nargs="?", help="postgresql+psycopg:// URL of a scratch database, memory if omitted")
+    parser.add_argument("--questions", type=int, default=1_000)
+    parser.add_argument("--answers", type=int, default=100_000)
+    parser.add_argument("--batch-size", type=int, default=DEFAULT_BATCH_SIZE)
+    arguments = parser.parse_args()
+
+    uow: BaseUnitOfWork[Any, Any, Any]
+    if arguments.url is None:
+        uow = MemoryUnitOfWork()
+    else:
+        uow = SQLAlchemyUnitOfWork(arguments.url)
+        async with uow._engine.begin() as connection:
+            await connection.run_sync(Base.metadata.drop_all)
+            await connection.run_sync(Base.metadata.create_all)
+    try:
+        await _load(uow, arguments.questions, arguments.answers)
+        with tempfile.TemporaryDirectory() as directory:
+            tracemalloc.start()
+            runs = await export_parquet(uow, Path(directory), batch_size=arguments.batch_size)
+            _, python_peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+            sizes = {run.entity: run.path.stat().st_size for run in runs if run.path is not None}
+        sys.stdout.write(f"{'entity':10} {'rows':>9} {'batches':>7} {'rows/s':>10} {'parquet':>10}\n")
+        for run in runs:
+            sys.stdout.write(
+                f"{run.entity:10} {run.rows:9} {run.batches:7} {run.rows_per_second:10.0f} {sizes[run.entity]:10}\n"
+            )
+        sys.stdout.write(
+            f"peak python heap {python_peak / 2**20:.1f} MiB, "
+            f"peak arrow pool {pa.default_memory_pool().max_memory() / 2**20:.1f} MiB\n"
+        )
+    finally:
+        if isinstance(uow, SQLAlchemyUnitOfWork):
+            async with uow._engine.begin() as connection:
+                await connection.run_sync(Base.metadata.drop_all)
+            await uow._engine.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,45 @@
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+
+URLS = (
+    "memory://",
+    "sqlite://",
+    "postgresql+psycopg://user@localhost/db",
+    "postgresql+asyncpg://user@localhost/db",
+)
+
+# runs in a fresh interpreter, so every measurement starts with an empty module cache
+PROBE = """
+import json, sys, time
+started = time.perf_counter()
+from kittens_answers_core.uow import create_unit_of_work
+create_unit_of_work({url!r})
+print(json.dumps({{"seconds": time.perf_counter() - started, "modules": len(sys.modules)}}))
+"""
+
+
+def _probe(url: str) -> tuple[float, int]:
+    result = subprocess.run(  # noqa: S603
+        [sys.executable, "-c", PROBE.format(url=url)], capture_output=True, check=True, text=True
+    )
+    measurement = json.loads(result.stdout)
+    return measurement["seconds"], measurement["modules"]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Report the import cost of create_unit_of_work per URL scheme.")
+    parser.add_argument("urls", nargs="*", default=URLS, help="unit of work URLs, nothing is connected")
+    parser.add_argument("--repeats", type=int, default=5)
+    arguments = parser.parse_args()
+
+    for url in arguments.urls:
+        samples = [_probe(url) for _ in range(arguments.repeats)]
+        milliseconds = statistics.median(seconds for seconds, _ in samples) * 1_000
+        sys.stdout.write(f"{url.partition('://')[0]:>20}: {milliseconds:7.1f} ms, {samples[-1][1]} modules\n")
+
+
+if __name__ == "__main__":
+    main()
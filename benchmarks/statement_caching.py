@@ -0,0 +1,119 @@
+import argparse
+import asyncio
+import random
+import statistics
+import sys
+import time
+from collections.abc import Awaitable, Callable
+from itertools import product
+from typing import Any
+
+from sqlalchemy import make_url
+
+from kittens_answers_core.models import AnswerSubmission, Question, QuestionTypes
+from kittens_answers_core.models.db_models import Base
+from kittens_answers_core.uow.db import DEFAULT_PREPARE_THRESHOLD, SQLAlchemyUnitOfWork, create_postgres_engine
+
+DRIVERS = ("psycopg", "asyncpg")
+PREPARE_THRESHOLDS = (None, DEFAULT_PREPARE_THRESHOLD)
+# 0 switches SQLAlchemy's compiled statement cache off, 500 is its default size
+QUERY_CACHE_SIZES = (0, 500)
+
+
+async def _latency(samples: int, operation: Callable[[], Awaitable[Any]]) -> str:
+    timings = []
+    for _ in range(samples):
+        started = time.perf_counter()
+        await operation()
+        timings.append((time.perf_counter() - started) * 1_000_000)
+    return f"{statistics.median(timings):7.0f} us"
+
+
+async def _load(uow: SQLAlchemyUnitOfWork, questions: int, answers: int) -> list[Question]:
+    async with uow:
+        creator = (await uow.user_services.create("benchmark")).uid
+        created = [
+            await uow.question_services.create(
+                QuestionTypes.ONE, f"question number {index}", {"a", "b"}, set(), creator
+            )
+            for index in range(questions)
+        ]
+        await uow.answer_services.create_many(
+            [
+                AnswerSubmission(
+                    creator=creator,
+                    question_uid=created[index % questions].uid,
+                    answer=[f"answer {index}"],
+                    extra_answer=[],
+                    is_correct=index % 2 == 0,
+                )
+                for index in range(answers)
+            ]
+        )
+        await uow.commit()
+    return created
+
+
+async def _run(uow: SQLAlchemyUnitOfWork, questions: list[Question], samples: int) -> list[str]:
+    async with uow:
+
+        async def get_by_uid() -> None:
+            await uow.question_services.get_by_uid(random.choice(questions).uid)  # noqa: S311
+
+        async def get_question() -> None:
+            question = random.choice(questions)  # noqa: S311
+            await uow.question_services.get(
+                question.question_type, question.text, question.options, question.extra_options
+            )
+
+        async def list_for_question() -> None:
+            await uow.answer_services.list_for_question(random.choice(questions).uid, is_correct=True)  # noqa: S311
+
+        async def get_statistics() -> None:
+            await uow.answer_services.get_statistics(random.choice(questions).uid)  # noqa: S311
+
+        return [
+            await _latency(samples, operation)
+            for operation in (get_by_uid, get_question, list_for_question, get_statistics)
+        ]
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Compare per-call latency of the hot repository reads across drivers and statement caches."
+    )
+    parser.add_argument("url", help="postgresql:// URL of a scratch database")
+    parser.add_argument("--questions", type=int, default=1_000)
+    parser.add_argument("--answers", type=int, default=20_000)
+    parser.add_argument("--samples", type=int, default=2_000)
+    arguments = parser.parse_args()
+    url = make_url(arguments.url)
+
+    setup = SQLAlchemyUnitOfWork(url.set(drivername="postgresql+psycopg").render_as_string(hide_password=False))
+    async with setup._engine.begin() as connection:
+        await connection.run_sync(Base.metadata.drop_all)
+        await connection.run_sync(Base.metadata.create_all)
+    try:
+        questions = await _load(setup, arguments.questions, arguments.answers)
+        sys.stdout.write(f"{'driver':8} {'prepared':>8} {'cache':>5}  get_by_uid        get  list_for_q  statistics\n")
+        for driver, prepare_threshold, query_cache_size in product(DRIVERS, PREPARE_THRESHOLDS, QUERY_CACHE_SIZES):
+            engine = create_postgres_engine(
+                url.set(drivername=f"postgresql+{driver}").render_as_string(hide_password=False),
+                prepare_threshold=prepare_threshold,
+                query_cache_size=query_cache_size,
+            )
+            try:
+                timings = await _run(SQLAlchemyUnitOfWork(engine), questions, arguments.samples)
+            finally:
+                await engine.dispose()
+            sys.stdout.write(
+                f"{driver:8} {prepare_threshold is not None!s:>8} {query_cache_size:>5}  {'  '.join(timings)}\n"
+            )
+    finally:
+        async with setup._engine.begin() as connection:
+            await connection.run_sync(Base.metadata.drop_all)
+        await setup._engine.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,77 @@
+import argparse
+import asyncio
+import sys
+import time
+from collections.abc import Callable
+from uuid import UUID, uuid4
+
+from sqlalchemy import Column, MetaData, Table, Text, func, insert, select
+from sqlalchemy.dialects.postgresql import UUID as PGUUID
+from sqlalchemy.ext.asyncio import AsyncEngine, create_async_engine
+
+from kittens_answers_core.identifiers import uuid7
+
+SCHEMES: dict[str, Callable[[], UUID]] = {"uuid4": uuid4, "uuid7": uuid7}
+
+
+def _table(metadata: MetaData, scheme: str) -> Table:
+    return Table(
+        f"bench_{scheme}",
+        metadata,
+        Column("uid", PGUUID(as_uuid=True), primary_key=True),
+        Column("parent_uid", PGUUID(as_uuid=True), index=True),
+        Column("payload", Text()),
+    )
+
+
+async def _run(engine: AsyncEngine, table: Table, factory: Callable[[], UUID], rows: int, batch_size: int) -> str:
+    started = time.perf_counter()
+    parent = factory()
+    for offset in range(0, rows, batch_size):
+        if offset % (batch_size * 10) == 0:
+            parent = factory()
+        batch = [
+            {"uid": factory(), "parent_uid": parent, "payload": "x"} for _ in range(min(batch_size, rows - offset))
+        ]
+        async with engine.begin() as connection:
+            await connection.execute(insert(table), batch)
+    elapsed = time.perf_counter() - started
+    async with engine.connect() as connection:
+        primary_key, parent_index = (
+            await connection.execute(
+                select(
+                    func.pg_relation_size(f"{table.name}_pkey"),
+                    func.pg_relation_size(f"ix_{table.name}_parent_uid"),
+                )
+            )
+        ).one()
+    return (
+        f"{table.name}: {rows / elapsed:,.0f} rows/s, "
+        f"pkey {primary_key / 2**20:.1f} MiB, parent index {parent_index / 2**20:.1f} MiB\n"
+    )
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description="Compare insert throughput and index size of uuid4 and uuid7 keys.")
+    parser.add_argument("url", help="postgresql+psycopg:// URL of a scratch database")
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--batch-size", type=int, default=1_000)
+    arguments = parser.parse_args()
+
+    engine = create_async_engine(arguments.url)
+    metadata = MetaData()
+    tables = {scheme: _table(metadata, scheme) for scheme in SCHEMES}
+    async with engine.begin() as connection:
+        await connection.run_sync(metadata.drop_all)
+        await connection.run_sync(metadata.create_all)
+    try:
+        for scheme, factory in SCHEMES.items():
+            sys.stdout.write(await _run(engine, tables[scheme], factory, arguments.rows, arguments.batch_size))
+    finally:
+        async with engine.begin() as connection:
+            await connection.run_sync(metadata.drop_all)
+        await engine.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
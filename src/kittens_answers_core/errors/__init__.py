@@ -24,3 +24,11 @@ class AnswerAlreadyExistError(ServiceError):
 
 class AnswerDoesNotExistError(ServiceError):
     ...
+
+
+class ReadOnlyError(ServiceError):
+    ...
+
+
+class ServiceTimeoutError(ServiceError):
+    ...
@@ -0,0 +1,71 @@
+import asyncio
+from collections import deque
+from types import TracebackType
+from typing import Final, Self
+
+from kittens_answers_core.models import Change
+
+DEFAULT_MAX_BUFFER: Final[int] = 10_000
+
+
+class Subscription:
+    def __init__(self, feed: "ChangeFeed", max_buffer: int) -> None:
+        self._feed = feed
+        self._buffer: deque[Change] = deque(maxlen=max_buffer)
+        self._ready = asyncio.Event()
+        self.max_buffer = max_buffer
+        self.dropped = 0
+
+    def put(self, changes: list[Change]) -> None:
+        self.dropped += max(len(self._buffer) + len(changes) - self.max_buffer, 0)
+        self._buffer.extend(changes)
+        self._ready.set()
+
+    def drain(self) -> list[Change]:
+        batch = list(self._buffer)
+        self._buffer.clear()
+        return batch
+
+    async def get(self) -> list[Change]:
+        while not self._buffer:
+            self._ready.clear()
+            await self._ready.wait()
+        return self.drain()
+
+    def close(self) -> None:
+        self._feed.unsubscribe(self)
+
+    def __aiter__(self) -> Self:
+        return self
+
+    async def __anext__(self) -> list[Change]:
+        return await self.get()
+
+    def __enter__(self) -> Self:
+        return self
+
+    def __exit__(
+        self, exc_type: type[BaseException] | None, exc_value: BaseException | None, traceback: TracebackType
+    ) -> None:
+        self.close()
+
+
+class ChangeFeed:
+    def __init__(self, *, max_buffer: int = DEFAULT_MAX_BUFFER) -> None:
+        self.max_buffer = max_buffer
+        self._subscriptions: set[Subscription] = set()
+
+    def subscribe(self, max_buffer: int | None = None) -> Subscription:
+        subscription = Subscription(self, max_buffer or self.max_buffer)
+        self._subscriptions.add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription) -> None:
+        self._subscriptions.discard(subscription)
+
+    def broadcast(self, changes: list[Change]) -> None:
+        for subscription in self._subscriptions:
+            subscription.put(changes)
+
+    async def publish(self, changes: list[Change]) -> None:
+        self.broadcast(changes)
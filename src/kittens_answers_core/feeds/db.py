@@ -0,0 +1,94 @@
+import asyncio
+from contextlib import suppress
+from types import TracebackType
+from typing import Any, Final, Self, cast
+
+from psycopg import AsyncConnection, sql
+from pydantic import TypeAdapter
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncConnection as SQLAlchemyAsyncConnection
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, create_async_engine
+
+from kittens_answers_core.feeds.base import DEFAULT_MAX_BUFFER, ChangeFeed
+from kittens_answers_core.models import Change
+
+DEFAULT_CHANNEL: Final[str] = "kittens_answers_changes"
+# keeps every payload well under the 8000 byte NOTIFY limit
+NOTIFY_BATCH_SIZE: Final[int] = 50
+LISTEN_DRIVERS: Final[frozenset[str]] = frozenset({"psycopg", "asyncpg"})
+
+_changes_adapter = TypeAdapter(list[Change])
+
+
+class PostgresChangeFeed(ChangeFeed):
+    def __init__(
+        self, db_url: str | AsyncEngine, *, channel: str = DEFAULT_CHANNEL, max_buffer: int = DEFAULT_MAX_BUFFER
+    ) -> None:
+        super().__init__(max_buffer=max_buffer)
+        self._engine = db_url if isinstance(db_url, AsyncEngine) else create_async_engine(url=db_url)
+        if self._engine.dialect.driver not in LISTEN_DRIVERS:
+            msg = f"the change feed cannot listen through the {self._engine.dialect.driver!r} driver"
+            raise ValueError(msg)
+        self.channel = channel
+        self._connection: SQLAlchemyAsyncConnection | None = None
+        self._listener: asyncio.Task[None] | None = None
+        self._asyncpg_connection: Any = None
+
+    async def notify(self, session: AsyncSession, changes: list[Change]) -> None:
+        if not changes:
+            return
+        await session.execute(
+            select(
+                *(
+                    func.pg_notify(
+                        self.channel, _changes_adapter.dump_json(changes[offset : offset + NOTIFY_BATCH_SIZE]).decode()
+                    )
+                    for offset in range(0, len(changes), NOTIFY_BATCH_SIZE)
+                )
+            )
+        )
+
+    async def start(self) -> None:
+        if self._connection is not None:
+            return
+        self._connection = await self._engine.connect()
+        await self._connection.execution_options(isolation_level="AUTOCOMMIT")
+        driver_connection: Any = (await self._connection.get_raw_connection()).driver_connection
+        if self._engine.dialect.driver == "asyncpg":
+            # asyncpg delivers notifications to a callback instead of an iterator
+            await driver_connection.add_listener(self.channel, self._on_notify)
+            self._asyncpg_connection = driver_connection
+            return
+        connection = cast(AsyncConnection[Any], driver_connection)
+        await connection.execute(sql.SQL("LISTEN {}").format(sql.Identifier(self.channel)))
+        self._listener = asyncio.create_task(self._listen(connection))
+
+    async def stop(self) -> None:
+        if self._asyncpg_connection is not None:
+            await self._asyncpg_connection.remove_listener(self.channel, self._on_notify)
+            self._asyncpg_connection = None
+        if self._listener is not None:
+            self._listener.cancel()
+            with suppress(asyncio.CancelledError):
+                await self._listener
+            self._listener = None
+        if self._connection is not None:
+            await self._connection.invalidate()
+            await self._connection.close()
+            self._connection = None
+
+    async def __aenter__(self) -> Self:
+        await self.start()
+        return self
+
+    async def __aexit__(
+        self, exc_type: type[BaseException] | None, exc_value: BaseException | None, traceback: TracebackType
+    ) -> None:
+        await self.stop()
+
+    async def _listen(self, connection: AsyncConnection[Any]) -> None:
+        async for notify in connection.notifies():
+            self.broadcast(_changes_adapter.validate_json(notify.payload))
+
+    def _on_notify(self, _connection: Any, _pid: int, _channel: str, payload: str) -> None:
+        self.broadcast(_changes_adapter.validate_json(payload))
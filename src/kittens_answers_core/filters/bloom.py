@@ -0,0 +1,73 @@
+from collections.abc import Iterator
+from hashlib import blake2b
+from math import ceil, exp, log
+from typing import Final
+
+from pydantic import BaseModel
+
+DEFAULT_CAPACITY: Final[int] = 1_000_000
+DEFAULT_FALSE_POSITIVE_RATE: Final[float] = 0.01
+DIGEST_SIZE: Final[int] = 16
+
+
+def key_digest(key: str) -> bytes:
+    return blake2b(key.encode(), digest_size=DIGEST_SIZE).digest()
+
+
+class BloomFilterStats(BaseModel):
+    capacity: int
+    count: int
+    hash_count: int
+    memory_bytes: int
+    false_positive_rate: float
+    estimated_false_positive_rate: float
+
+
+class BloomFilter:
+    def __init__(
+        self, capacity: int = DEFAULT_CAPACITY, false_positive_rate: float = DEFAULT_FALSE_POSITIVE_RATE
+    ) -> None:
+        self.capacity = capacity
+        self.false_positive_rate = false_positive_rate
+        self.size = max(ceil(-capacity * log(false_positive_rate) / log(2) ** 2), 8)
+        self.hash_count = max(round(self.size / capacity * log(2)), 1)
+        self.count = 0
+        self._bits = bytearray((self.size + 7) // 8)
+
+    def _positions(self, digest: bytes) -> Iterator[int]:
+        first = int.from_bytes(digest[:8], "little")
+        second = int.from_bytes(digest[8:], "little") | 1
+        for index in range(self.hash_count):
+            yield (first + index * second) % self.size
+
+    def add_digest(self, digest: bytes) -> None:
+        for position in self._positions(digest):
+            self._bits[position >> 3] |= 1 << (position & 7)
+        self.count += 1
+
+    def contains_digest(self, digest: bytes) -> bool:
+        return all(self._bits[position >> 3] & (1 << (position & 7)) for position in self._positions(digest))
+
+    def add(self, key: str) -> None:
+        self.add_digest(key_digest(key))
+
+    def __contains__(self, key: str) -> bool:
+        return self.contains_digest(key_digest(key))
+
+    @property
+    def memory_bytes(self) -> int:
+        return len(self._bits)
+
+    @property
+    def estimated_false_positive_rate(self) -> float:
+        return float((1 - exp(-self.hash_count * self.count / self.size)) ** self.hash_count)
+
+    def stats(self) -> BloomFilterStats:
+        return BloomFilterStats(
+            capacity=self.capacity,
+            count=self.count,
+            hash_count=self.hash_count,
+            memory_bytes=self.memory_bytes,
+            false_positive_rate=self.false_positive_rate,
+            estimated_false_positive_rate=self.estimated_false_positive_rate,
+        )
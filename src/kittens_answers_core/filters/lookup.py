@@ -0,0 +1,82 @@
+from typing import Any
+
+from kittens_answers_core.feeds.base import ChangeFeed, Subscription
+from kittens_answers_core.filters.bloom import (
+    DEFAULT_CAPACITY,
+    DEFAULT_FALSE_POSITIVE_RATE,
+    BloomFilter,
+    BloomFilterStats,
+)
+from kittens_answers_core.models import DEFAULT_PAGE_LIMIT, Change, ChangeKinds
+from kittens_answers_core.uow.base import BaseUnitOfWork
+
+
+class LookupFilters:
+    def __init__(
+        self, capacity: int = DEFAULT_CAPACITY, false_positive_rate: float = DEFAULT_FALSE_POSITIVE_RATE
+    ) -> None:
+        self.users = BloomFilter(capacity, false_positive_rate)
+        self.questions = BloomFilter(capacity, false_positive_rate)
+        self.ready = False
+
+    def may_have_user(self, foreign_id: str) -> bool:
+        return not self.ready or foreign_id in self.users
+
+    def may_have_question(self, fingerprint: str) -> bool:
+        return not self.ready or fingerprint in self.questions
+
+    def apply(self, changes: list[Change]) -> None:
+        for change in changes:
+            if change.key is None:
+                continue
+            if change.kind == ChangeKinds.USER:
+                self.users.add_digest(bytes.fromhex(change.key))
+            elif change.kind == ChangeKinds.QUESTION:
+                self.questions.add_digest(bytes.fromhex(change.key))
+
+    async def sync(
+        self, uow: BaseUnitOfWork[Any, Any, Any], feed: ChangeFeed, *, batch_size: int = DEFAULT_PAGE_LIMIT
+    ) -> None:
+        with feed.subscribe() as subscription:
+            await self.populate(uow, subscription=subscription, batch_size=batch_size)
+            if self.ready:
+                await self.follow(subscription)
+
+    async def populate(
+        self,
+        uow: BaseUnitOfWork[Any, Any, Any],
+        *,
+        subscription: Subscription | None = None,
+        batch_size: int = DEFAULT_PAGE_LIMIT,
+    ) -> None:
+        # the subscription must be taken before the scan, rows committed while it runs are only in the feed
+        async with uow.reader() as reader:
+            after = None
+            while users := await reader.user_services.scan(after, limit=batch_size):
+                for user in users:
+                    self.users.add(user.foreign_id)
+                after = users[-1].uid
+            after = None
+            while questions := await reader.question_services.scan(after, limit=batch_size):
+                for question in questions:
+                    self.questions.add(
+                        reader.question_services.fingerprint(
+                            question.question_type, question.text, question.options, question.extra_options
+                        )
+                    )
+                after = questions[-1].uid
+        if subscription is not None:
+            self.apply(subscription.drain())
+            if subscription.dropped:
+                return
+        self.ready = True
+
+    async def follow(self, subscription: Subscription) -> None:
+        async for changes in subscription:
+            if subscription.dropped:
+                self.ready = False
+                return
+            self.apply(changes)
+
+    def stats(self) -> dict[str, BloomFilterStats]:
+        return {"users": self.users.stats(), "questions": self.questions.stats()}
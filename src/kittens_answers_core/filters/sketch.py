@@ -0,0 +1,101 @@
+from array import array
+from hashlib import blake2b
+from typing import Final
+
+from pydantic import BaseModel
+
+DEFAULT_WIDTH: Final[int] = 4096
+DEFAULT_DEPTH: Final[int] = 4
+DEFAULT_TOP_K: Final[int] = 100
+# TinyLFU halves every counter after this many increments per counter column
+SAMPLE_FACTOR: Final[int] = 10
+
+
+class HotKey(BaseModel):
+    key: str
+    frequency: int
+
+
+class HotSet(BaseModel):
+    questions: list[HotKey] = []
+    answers: list[HotKey] = []
+
+
+class FrequencySketch:
+    def __init__(self, width: int = DEFAULT_WIDTH, depth: int = DEFAULT_DEPTH, *, top_k: int = DEFAULT_TOP_K) -> None:
+        self.width = width
+        self.depth = depth
+        self.top_k = top_k
+        self.sample_size = SAMPLE_FACTOR * width
+        self.additions = 0
+        self._counters = array("I", bytes(4 * width * depth))
+        self._top: dict[str, int] = {}
+        self._floor = 0
+
+    def _indexes(self, key: str) -> list[int]:
+        digest = blake2b(key.encode(), digest_size=16).digest()
+        first = int.from_bytes(digest[:8], "little")
+        second = int.from_bytes(digest[8:], "little") | 1
+        return [row * self.width + (first + row * second) % self.width for row in range(self.depth)]
+
+    def estimate(self, key: str) -> int:
+        return min(self._counters[index] for index in self._indexes(key))
+
+    def increment(self, key: str) -> int:
+        indexes = self._indexes(key)
+        frequency = min(self._counters[index] for index in indexes) + 1
+        for index in indexes:
+            self._counters[index] = max(self._counters[index], frequency)
+        self._offer(key, frequency)
+        self.additions += 1
+        if self.additions >= self.sample_size:
+            self._age()
+        return frequency
+
+    def admit(self, candidate: str, victim: str) -> bool:
+        return self.estimate(candidate) > self.estimate(victim)
+
+    def top(self, k: int | None = None) -> list[HotKey]:
+        ranked = sorted(self._top.items(), key=lambda item: item[1], reverse=True)
+        return [HotKey(key=key, frequency=frequency) for key, frequency in ranked[: k or self.top_k]]
+
+    def load(self, hot_keys: list[HotKey]) -> None:
+        for hot_key in hot_keys:
+            for index in self._indexes(hot_key.key):
+                self._counters[index] = max(self._counters[index], hot_key.frequency)
+            self._offer(hot_key.key, self.estimate(hot_key.key))
+
+    def _offer(self, key: str, frequency: int) -> None:
+        if key in self._top:
+            self._top[key] = frequency
+            return
+        if len(self._top) >= self.top_k:
+            if frequency <= self._floor:
+                return
+            coldest = min(self._top, key=self._top.__getitem__)
+            if frequency <= self._top[coldest]:
+                self._floor = self._top[coldest]
+                return
+            del self._top[coldest]
+        self._top[key] = frequency
+        self._floor = min(self._top.values()) if len(self._top) >= self.top_k else 0
+
+    def _age(self) -> None:
+        for index, counter in enumerate(self._counters):
+            self._counters[index] = counter >> 1
+        self._top = {key: frequency >> 1 for key, frequency in self._top.items() if frequency >> 1}
+        self._floor = min(self._top.values()) if len(self._top) >= self.top_k else 0
+        self.additions //= 2
+
+
+class HotKeyTracker:
+    def __init__(self, width: int = DEFAULT_WIDTH, depth: int = DEFAULT_DEPTH, *, top_k: int = DEFAULT_TOP_K) -> None:
+        self.questions = FrequencySketch(width, depth, top_k=top_k)
+        self.answers = FrequencySketch(width, depth, top_k=top_k)
+
+    def dump(self) -> HotSet:
+        return HotSet(questions=self.questions.top(), answers=self.answers.top())
+
+    def load(self, hot_set: HotSet) -> None:
+        self.questions.load(hot_set.questions)
+        self.answers.load(hot_set.answers)
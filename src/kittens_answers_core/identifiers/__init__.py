@@ -0,0 +1,54 @@
+import os
+import time
+from collections.abc import Callable
+from threading import Lock
+from typing import Final
+from uuid import UUID
+
+UidFactory = Callable[[], UUID]
+
+UUID7_VERSION: Final[int] = 7
+# RFC 9562 variant bits
+VARIANT: Final[int] = 0b10
+COUNTER_BITS: Final[int] = 12
+COUNTER_MAX: Final[int] = (1 << COUNTER_BITS) - 1
+
+_lock = Lock()
+_last_timestamp = 0
+_counter = 0
+
+
+def uuid7() -> UUID:
+    global _last_timestamp, _counter  # noqa: PLW0603
+    random = int.from_bytes(os.urandom(10), "big")
+    with _lock:
+        timestamp = time.time_ns() // 1_000_000
+        if timestamp > _last_timestamp:
+            _last_timestamp = timestamp
+            _counter = random >> 70
+        elif _counter < COUNTER_MAX:
+            _counter += 1
+        else:
+            _last_timestamp += 1
+            _counter = 0
+        timestamp, counter = _last_timestamp, _counter
+    return UUID(
+        int=(timestamp << 80) | (UUID7_VERSION << 76) | (counter << 64) | (VARIANT << 62) | (random & ((1 << 62) - 1))
+    )
+
+
+def uuid7_floor(timestamp: float) -> UUID:
+    # every uuid7 minted before `timestamp` sorts below this one
+    return UUID(int=int(timestamp * 1000) << 80)
+
+
+_uid_factory: UidFactory = uuid7
+
+
+def set_uid_factory(factory: UidFactory) -> None:
+    global _uid_factory  # noqa: PLW0603
+    _uid_factory = factory
+
+
+def new_uid() -> UUID:
+    return _uid_factory()
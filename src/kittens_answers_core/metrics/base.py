@@ -0,0 +1,35 @@
+from collections import deque
+from typing import Final
+
+from pydantic import BaseModel
+
+DEFAULT_MAX_SAMPLES: Final[int] = 10_000
+
+TRANSACTION_SECONDS: Final[str] = "uow.transaction.seconds"
+TRANSACTION_ALLOCATED_BYTES: Final[str] = "uow.transaction.allocated_bytes"
+TRANSACTION_PEAK_BYTES: Final[str] = "uow.transaction.peak_bytes"
+TRANSACTION_SITE_BYTES: Final[str] = "uow.transaction.site_bytes"
+REPOSITORY_ENTITIES: Final[str] = "memory.repository.entities"
+REPOSITORY_DATA_BYTES: Final[str] = "memory.repository.data_bytes"
+REPOSITORY_BACKUP_BYTES: Final[str] = "memory.repository.backup_bytes"
+REPOSITORY_INDEX_BYTES: Final[str] = "memory.repository.index_bytes"
+
+
+class Sample(BaseModel):
+    name: str
+    value: float
+    labels: dict[str, str] = {}
+
+
+class MetricsSink:
+    def __init__(self, *, max_samples: int = DEFAULT_MAX_SAMPLES) -> None:
+        self.max_samples = max_samples
+        self.samples: deque[Sample] = deque(maxlen=max_samples)
+
+    def record(self, name: str, value: float, **labels: str) -> None:
+        self.samples.append(Sample(name=name, value=value, labels=labels))
+
+    def drain(self) -> list[Sample]:
+        samples = list(self.samples)
+        self.samples.clear()
+        return samples
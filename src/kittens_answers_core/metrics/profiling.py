@@ -0,0 +1,124 @@
+import sys
+import tracemalloc
+from collections import deque
+from collections.abc import Iterable
+from typing import Any, Final
+
+from pydantic import BaseModel
+
+from kittens_answers_core.metrics.base import (
+    REPOSITORY_BACKUP_BYTES,
+    REPOSITORY_DATA_BYTES,
+    REPOSITORY_ENTITIES,
+    REPOSITORY_INDEX_BYTES,
+    TRANSACTION_ALLOCATED_BYTES,
+    TRANSACTION_PEAK_BYTES,
+    TRANSACTION_SITE_BYTES,
+    MetricsSink,
+)
+
+DEFAULT_TOP_SITES: Final[int] = 10
+
+_IGNORED_SITES: Final = (tracemalloc.Filter(inclusive=False, filename_pattern=tracemalloc.__file__),)
+
+
+class RepositoryFootprint(BaseModel):
+    repository: str
+    entities: int
+    data_bytes: int
+    backup_bytes: int
+    index_bytes: int
+
+    @property
+    def total_bytes(self) -> int:
+        return self.data_bytes + self.backup_bytes + self.index_bytes
+
+    def record(self, metrics: MetricsSink) -> None:
+        metrics.record(REPOSITORY_ENTITIES, self.entities, repository=self.repository)
+        metrics.record(REPOSITORY_DATA_BYTES, self.data_bytes, repository=self.repository)
+        metrics.record(REPOSITORY_BACKUP_BYTES, self.backup_bytes, repository=self.repository)
+        metrics.record(REPOSITORY_INDEX_BYTES, self.index_bytes, repository=self.repository)
+
+
+class AllocationSite(BaseModel):
+    site: str
+    bytes: int
+    count: int
+
+
+class AllocationProfile(BaseModel):
+    allocated_bytes: int
+    peak_bytes: int
+    sites: list[AllocationSite] = []
+
+    def record(self, metrics: MetricsSink, **labels: str) -> None:
+        metrics.record(TRANSACTION_ALLOCATED_BYTES, self.allocated_bytes, **labels)
+        metrics.record(TRANSACTION_PEAK_BYTES, self.peak_bytes, **labels)
+        for site in self.sites:
+            metrics.record(TRANSACTION_SITE_BYTES, site.bytes, site=site.site, **labels)
+
+
+def deep_sizeof(value: Any, seen: set[int]) -> int:
+    # objects reachable from several containers, like entities shared by data and indexes, are counted once
+    size = 0
+    stack = [value]
+    while stack:
+        item = stack.pop()
+        if id(item) in seen:
+            continue
+        seen.add(id(item))
+        size += sys.getsizeof(item)
+        if isinstance(item, dict):
+            stack.extend(item.keys())
+            stack.extend(item.values())
+        elif isinstance(item, list | tuple | set | frozenset | deque):
+            stack.extend(item)
+        elif isinstance(item, BaseModel):
+            stack.append(item.__dict__)
+            stack.append(item.__pydantic_fields_set__)
+    return size
+
+
+def footprint(repository: str, data: list[Any], backups: Iterable[Any], indexes: Iterable[Any]) -> RepositoryFootprint:
+    seen: set[int] = set()
+    return RepositoryFootprint(
+        repository=repository,
+        entities=len(data),
+        data_bytes=deep_sizeof(data, seen),
+        backup_bytes=sum(deep_sizeof(backup, seen) for backup in backups),
+        index_bytes=sum(deep_sizeof(index, seen) for index in indexes),
+    )
+
+
+class AllocationTracer:
+    def __init__(self, top_sites: int = DEFAULT_TOP_SITES) -> None:
+        self.top_sites = top_sites
+        self._snapshot: tracemalloc.Snapshot | None = None
+        self._traced = 0
+        self._started = False
+
+    def start(self) -> None:
+        # tracing someone else started is left running when this tracer stops
+        self._started = not tracemalloc.is_tracing()
+        if self._started:
+            tracemalloc.start()
+        # the baseline snapshot is itself traced, so the counters start after it
+        self._snapshot = tracemalloc.take_snapshot().filter_traces(_IGNORED_SITES) if self.top_sites else None
+        tracemalloc.reset_peak()
+        self._traced = tracemalloc.get_traced_memory()[0]
+
+    def stop(self) -> AllocationProfile:
+        current, peak = tracemalloc.get_traced_memory()
+        sites = []
+        if self._snapshot is not None:
+            snapshot = tracemalloc.take_snapshot().filter_traces(_IGNORED_SITES)
+            sites = [
+                AllocationSite(site=str(difference.traceback), bytes=difference.size_diff, count=difference.count_diff)
+                for difference in snapshot.compare_to(self._snapshot, "lineno")[: self.top_sites]
+                if difference.size_diff > 0
+            ]
+            self._snapshot = None
+        if self._started:
+            tracemalloc.stop()
+            self._started = False
+        return AllocationProfile(allocated_bytes=current - self._traced, peak_bytes=peak - self._traced, sites=sites)
@@ -1,11 +1,15 @@
 from enum import StrEnum
 from typing import Final
-from uuid import uuid4
+from uuid import UUID
 
-from pydantic import UUID4, BaseModel, Field
+from pydantic import BaseModel, Field
+
+from kittens_answers_core.identifiers import new_uid
 
 MAX_FOREIGN_ID_LENGTH: Final[int] = 500
 MAX_QUESTION_TEXT_LENGTH: Final[int] = 500
+DEFAULT_PAGE_LIMIT: Final[int] = 100
+DEFAULT_SEARCH_LIMIT: Final[int] = 10
 
 
 class QuestionTypes(StrEnum):
@@ -14,25 +18,125 @@ class QuestionTypes(StrEnum):
     ORDER = "ORDER"
     MATCH = "MATCH"
 
+    @property
+    def is_ordered(self) -> bool:
+        return self in (QuestionTypes.ORDER, QuestionTypes.MATCH)
+
+
+def canonical_answer(question_type: QuestionTypes, answer: list[str]) -> list[str]:
+    return list(answer) if question_type.is_ordered else sorted(answer)
+
+
+def question_fingerprint(
+    question_type: QuestionTypes, normalized_text: str, options: set[str], extra_options: set[str]
+) -> str:
+    return "\x1f".join(
+        (question_type, normalized_text, "\x1e".join(sorted(options)), "\x1e".join(sorted(extra_options)))
+    )
+
+
+class ChangeKinds(StrEnum):
+    USER = "USER"
+    QUESTION = "QUESTION"
+    ANSWER = "ANSWER"
+
 
 class User(BaseModel):
-    uid: UUID4 = Field(default_factory=uuid4)
+    uid: UUID = Field(default_factory=new_uid)
     foreign_id: str = Field(max_length=MAX_FOREIGN_ID_LENGTH)
 
 
 class Question(BaseModel):
-    uid: UUID4 = Field(default_factory=uuid4)
-    creator: UUID4
+    uid: UUID = Field(default_factory=new_uid)
+    creator: UUID
     question_type: QuestionTypes
     text: str = Field(min_length=1, max_length=MAX_QUESTION_TEXT_LENGTH)
     options: set[str]
     extra_options: set[str]
 
 
+class QuestionMatch(BaseModel):
+    question: Question
+    score: float
+
+
 class Answer(BaseModel):
-    uid: UUID4 = Field(default_factory=uuid4)
-    creator: UUID4
-    question_uid: UUID4
+    uid: UUID = Field(default_factory=new_uid)
+    creator: UUID
+    question_uid: UUID
+    answer: list[str]
+    extra_answer: list[str]
+    is_correct: bool
+
+
+class AnswerSubmission(BaseModel):
+    creator: UUID
+    question_uid: UUID
+    answer: list[str]
+    extra_answer: list[str]
+    is_correct: bool
+
+
+class AnswerSubmissionResult(BaseModel):
+    answer: Answer
+    created: bool
+
+
+class Submission(BaseModel):
+    foreign_id: str = Field(max_length=MAX_FOREIGN_ID_LENGTH)
+    question_type: QuestionTypes
+    question_text: str = Field(min_length=1, max_length=MAX_QUESTION_TEXT_LENGTH)
+    options: set[str]
+    extra_options: set[str]
     answer: list[str]
     extra_answer: list[str]
     is_correct: bool
+
+
+class SubmissionResult(BaseModel):
+    user: User
+    question: Question
+    answer: Answer
+    user_created: bool = False
+    question_created: bool = False
+    answer_created: bool = False
+
+    @property
+    def created(self) -> bool:
+        return self.user_created or self.question_created or self.answer_created
+
+
+class AnswerStatistic(BaseModel):
+    question_uid: UUID
+    answer: list[str]
+    extra_answer: list[str]
+    correct_count: int = 0
+    incorrect_count: int = 0
+
+
+class UserReputation(BaseModel):
+    user_uid: UUID
+    agreed: int = 0
+    total: int = 0
+
+    @property
+    def reputation(self) -> float:
+        return (self.agreed + 1) / (self.total + 2)
+
+
+class QuestionConsensus(BaseModel):
+    question_uid: UUID
+    answer: list[str]
+    extra_answer: list[str]
+    score: float
+
+
+class Reclaimed(BaseModel):
+    rows: int = 0
+    bytes: int = 0
+
+
+class Change(BaseModel):
+    kind: ChangeKinds
+    uid: UUID
+    key: str | None = None
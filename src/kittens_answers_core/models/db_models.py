@@ -1,15 +1,73 @@
+import json
+from collections.abc import Sequence
+from functools import partial
+from typing import Any
 from uuid import UUID
 
-from sqlalchemy import ForeignKey, UniqueConstraint
+from sqlalchemy import (
+    DDL,
+    BigInteger,
+    Connection,
+    Dialect,
+    ForeignKey,
+    Identity,
+    Index,
+    MetaData,
+    PrimaryKeyConstraint,
+    Table,
+    UniqueConstraint,
+    event,
+)
 from sqlalchemy.dialects.postgresql import ARRAY, TEXT
 from sqlalchemy.ext.asyncio import AsyncAttrs
+from sqlalchemy.ext.compiler import compiles
 from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column, relationship
+from sqlalchemy.schema import CreateColumn
+from sqlalchemy.sql.compiler import DDLCompiler
+from sqlalchemy.types import TypeDecorator, TypeEngine
+
+
+class StringList(TypeDecorator[Sequence[str]]):
+    impl = TEXT
+    cache_ok = True
+
+    def __init__(self, *, as_tuple: bool = False) -> None:
+        super().__init__()
+        self.as_tuple = as_tuple
+
+    def load_dialect_impl(self, dialect: Dialect) -> TypeEngine[Any]:
+        if dialect.name == "postgresql":
+            return dialect.type_descriptor(ARRAY(TEXT(), as_tuple=self.as_tuple))
+        return dialect.type_descriptor(TEXT())
+
+    def process_bind_param(self, value: Sequence[str] | None, dialect: Dialect) -> Any:
+        if value is None or dialect.name == "postgresql":
+            return value
+        return json.dumps(list(value), ensure_ascii=False, separators=(",", ":"))
+
+    def process_result_value(self, value: Any, dialect: Dialect) -> Sequence[str] | None:
+        if value is None or dialect.name == "postgresql":
+            return value
+        items = json.loads(value)
+        return tuple(items) if self.as_tuple else items
+
+
+@compiles(CreateColumn, "sqlite")
+def _sqlite_identity_column(element: CreateColumn, compiler: DDLCompiler, **kw: Any) -> str | None:
+    column = element.element
+    if column.identity is not None:
+        return f"{compiler.preparer.format_column(column)} INTEGER NOT NULL DEFAULT 0"
+    return compiler.visit_create_column(element, **kw)
 
 
 class Base(AsyncAttrs, DeclarativeBase):
     ...
 
 
+_PG_TRGM = DDL("CREATE EXTENSION IF NOT EXISTS pg_trgm").execute_if(dialect="postgresql")
+event.listen(Base.metadata, "before_create", _PG_TRGM)
+
+
 class DBUser(Base):
     __tablename__ = "users"
 
@@ -19,33 +77,116 @@ class DBUser(Base):
 
 class DBRootQuestion(Base):
     __tablename__ = "root_questions"
-    __table_args__ = (UniqueConstraint("question_type", "text"),)
+    __table_args__ = (
+        UniqueConstraint("question_type", "normalized_text"),
+        Index(
+            "ix_root_questions_normalized_text_trgm",
+            "normalized_text",
+            postgresql_using="gin",
+            postgresql_ops={"normalized_text": "gin_trgm_ops"},
+        ),
+    )
 
     root_uid: Mapped[UUID] = mapped_column(primary_key=True)
     question_type: Mapped[str] = mapped_column()
     text: Mapped[str] = mapped_column()
+    normalized_text: Mapped[str] = mapped_column()
     questions: Mapped[list["DBQuestion"]] = relationship(back_populates="root_question")
 
 
 class DBQuestion(Base):
     __tablename__ = "questions"
-    __table_args__ = (UniqueConstraint("options", "extra_options", "root_question_uid"),)
+    __table_args__ = (
+        UniqueConstraint("options", "extra_options", "root_question_uid"),
+        Index("ix_questions_creator_id_uid", "creator_id", "uid"),
+    )
 
     uid: Mapped[UUID] = mapped_column(primary_key=True)
     creator_id: Mapped[UUID] = mapped_column(ForeignKey("users.uid"))
-    options: Mapped[list[str]] = mapped_column(ARRAY(TEXT()))
-    extra_options: Mapped[list[str]] = mapped_column(ARRAY(TEXT()))
+    options: Mapped[list[str]] = mapped_column(StringList())
+    extra_options: Mapped[list[str]] = mapped_column(StringList())
     root_question_uid: Mapped[UUID] = mapped_column(ForeignKey("root_questions.root_uid"))
     root_question: Mapped[DBRootQuestion] = relationship(back_populates="questions")
 
 
 class DBAnswer(Base):
     __tablename__ = "answers"
-    __table_args__ = (UniqueConstraint("question_uid", "answer", "extra_answer", "is_correct"),)
+    __table_args__ = (
+        UniqueConstraint("question_uid", "answer", "extra_answer", "is_correct"),
+        Index("ix_answers_question_uid_uid", "question_uid", "uid"),
+        Index("ix_answers_creator_id_uid", "creator_id", "uid"),
+        Index("ix_answers_seq", "seq"),
+    )
 
     uid: Mapped[UUID] = mapped_column(primary_key=True)
     creator_id: Mapped[UUID] = mapped_column(ForeignKey("users.uid"))
     question_uid: Mapped[UUID] = mapped_column(ForeignKey("questions.uid"))
-    answer: Mapped[list[str]] = mapped_column(ARRAY(TEXT()))
-    extra_answer: Mapped[list[str]] = mapped_column(ARRAY(TEXT()))
+    question: Mapped[DBQuestion] = relationship()
+    answer: Mapped[list[str]] = mapped_column(StringList())
+    extra_answer: Mapped[list[str]] = mapped_column(StringList())
     is_correct: Mapped[bool]
+    seq: Mapped[int] = mapped_column(BigInteger, Identity())
+
+
+def _create_partitions(partitions: int, target: Table, connection: Connection, **_: Any) -> None:
+    for remainder in range(partitions):
+        connection.execute(
+            DDL(
+                f"CREATE TABLE {target.name}_p{remainder} PARTITION OF {target.name} "
+                f"FOR VALUES WITH (MODULUS {partitions}, REMAINDER {remainder})"
+            )
+        )
+
+
+event.listen(
+    DBAnswer.__table__,
+    "after_create",
+    DDL(
+        "CREATE TRIGGER answers_seq AFTER INSERT ON answers FOR EACH ROW BEGIN "
+        "UPDATE answers SET seq = (SELECT coalesce(max(seq), 0) + 1 FROM answers) WHERE rowid = NEW.rowid; END"
+    ).execute_if(dialect="sqlite"),
+)
+
+
+def partition_answers(partitions: int) -> MetaData:
+    if not partitions:
+        return Base.metadata
+    # a configured copy for create_all, the mapped metadata always describes the plain answers table
+    metadata = MetaData()
+    # metadata listeners are not copied with the tables
+    event.listen(metadata, "before_create", _PG_TRGM)
+    for table in Base.metadata.sorted_tables:
+        table.to_metadata(metadata)
+    answers = metadata.tables[DBAnswer.__tablename__]
+    # postgres requires the partition key in every unique constraint, the primary key included
+    answers.append_constraint(PrimaryKeyConstraint(answers.c.uid, answers.c.question_uid))
+    answers.dialect_options["postgresql"]["partition_by"] = "HASH (question_uid)"
+    event.listen(answers, "after_create", partial(_create_partitions, partitions))
+    return metadata
+
+
+class DBAnswerStatistic(Base):
+    __tablename__ = "answer_statistics"
+
+    question_uid: Mapped[UUID] = mapped_column(ForeignKey("questions.uid"), primary_key=True)
+    answer: Mapped[tuple[str, ...]] = mapped_column(StringList(as_tuple=True), primary_key=True)
+    extra_answer: Mapped[tuple[str, ...]] = mapped_column(StringList(as_tuple=True), primary_key=True)
+    correct_count: Mapped[int] = mapped_column(default=0)
+    incorrect_count: Mapped[int] = mapped_column(default=0)
+
+
+class DBUserReputation(Base):
+    __tablename__ = "user_reputations"
+
+    user_uid: Mapped[UUID] = mapped_column(ForeignKey("users.uid"), primary_key=True)
+    agreed: Mapped[int] = mapped_column(default=0)
+    total: Mapped[int] = mapped_column(default=0)
+
+
+class DBQuestionConsensus(Base):
+    __tablename__ = "question_consensus"
+
+    question_uid: Mapped[UUID] = mapped_column(ForeignKey("questions.uid"), primary_key=True)
+    answer: Mapped[list[str]] = mapped_column(StringList())
+    extra_answer: Mapped[list[str]] = mapped_column(StringList())
+    score: Mapped[float]
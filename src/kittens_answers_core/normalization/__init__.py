@@ -0,0 +1,90 @@
+import re
+import unicodedata
+from collections.abc import Callable, Sequence
+from functools import lru_cache
+from typing import Final
+
+NormalizationStep = Callable[[str], str]
+
+DEFAULT_CACHE_SIZE: Final[int] = 4096
+TRAILING_PUNCTUATION: Final[str] = " .,:;!?…"
+SIMILARITY_THRESHOLD: Final[float] = 0.3
+
+_WORD = re.compile(r"[^\W_]+")
+
+_QUOTES = str.maketrans(
+    {
+        "\N{LEFT SINGLE QUOTATION MARK}": "'",
+        "\N{RIGHT SINGLE QUOTATION MARK}": "'",
+        "\N{SINGLE LOW-9 QUOTATION MARK}": "'",
+        "\N{SINGLE HIGH-REVERSED-9 QUOTATION MARK}": "'",
+        "\N{PRIME}": "'",
+        "\N{LEFT DOUBLE QUOTATION MARK}": '"',
+        "\N{RIGHT DOUBLE QUOTATION MARK}": '"',
+        "\N{DOUBLE LOW-9 QUOTATION MARK}": '"',
+        "\N{DOUBLE HIGH-REVERSED-9 QUOTATION MARK}": '"',
+        "\N{DOUBLE PRIME}": '"',
+        "«": '"',
+        "»": '"',
+    }
+)
+
+
+def nfkc(text: str) -> str:
+    return unicodedata.normalize("NFKC", text)
+
+
+def straighten_quotes(text: str) -> str:
+    return text.translate(_QUOTES)
+
+
+def collapse_whitespace(text: str) -> str:
+    return " ".join(text.split())
+
+
+def strip_trailing_punctuation(text: str) -> str:
+    return text.rstrip(TRAILING_PUNCTUATION)
+
+
+def casefold(text: str) -> str:
+    return text.casefold()
+
+
+DEFAULT_STEPS: Final[tuple[NormalizationStep, ...]] = (
+    nfkc,
+    straighten_quotes,
+    collapse_whitespace,
+    strip_trailing_punctuation,
+)
+
+
+class TextNormalizer:
+    def __init__(
+        self, steps: Sequence[NormalizationStep] = DEFAULT_STEPS, cache_size: int = DEFAULT_CACHE_SIZE
+    ) -> None:
+        self.steps = tuple(steps)
+        self._normalize = lru_cache(maxsize=cache_size)(self._apply)
+
+    def _apply(self, text: str) -> str:
+        normalized = text
+        for step in self.steps:
+            normalized = step(normalized)
+        return normalized or text
+
+    def __call__(self, text: str) -> str:
+        return self._normalize(text)
+
+
+def trigrams(text: str) -> frozenset[str]:
+    result: set[str] = set()
+    for word in _WORD.findall(text.lower()):
+        padded = f"  {word} "
+        result.update(padded[index : index + 3] for index in range(len(padded) - 2))
+    return frozenset(result)
+
+
+def similarity(left: frozenset[str], right: frozenset[str]) -> float:
+    if not left or not right:
+        return 0.0
+    shared = len(left & right)
+    return shared / (len(left) + len(right) - shared)
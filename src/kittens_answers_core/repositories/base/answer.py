@@ -2,13 +2,30 @@ import abc
 from typing import Any
 from uuid import UUID
 
-from kittens_answers_core.models import Answer
+from kittens_answers_core.filters.sketch import FrequencySketch
+from kittens_answers_core.models import (
+    DEFAULT_PAGE_LIMIT,
+    Answer,
+    AnswerStatistic,
+    AnswerSubmission,
+    AnswerSubmissionResult,
+    Change,
+    QuestionConsensus,
+    Reclaimed,
+)
 
 
 class BaseAnswerRepository(abc.ABC):  # pragma: no cover
+    changes: list[Change]
+    hot_keys: FrequencySketch | None = None
+
     def __set_name__(self, owner: Any, name: str) -> None:
         self.name = name
 
+    def record_hit(self, uid: UUID) -> None:
+        if self.hot_keys is not None:
+            self.hot_keys.increment(str(uid))
+
     @abc.abstractmethod
     async def create(
         self,
@@ -21,6 +38,10 @@ class BaseAnswerRepository(abc.ABC):  # pragma: no cover
     ) -> Answer:
         ...
 
+    @abc.abstractmethod
+    async def create_many(self, submissions: list[AnswerSubmission]) -> list[AnswerSubmissionResult]:
+        ...
+
     @abc.abstractmethod
     async def get(
         self,
@@ -35,3 +56,56 @@ class BaseAnswerRepository(abc.ABC):  # pragma: no cover
     @abc.abstractmethod
     async def get_by_uid(self, answer_uid: UUID) -> Answer:
         ...
+
+    @abc.abstractmethod
+    async def get_many_by_uid(self, answer_uids: list[UUID]) -> list[Answer]:
+        ...
+
+    @abc.abstractmethod
+    async def list_for_question(
+        self,
+        question_uid: UUID,
+        *,
+        is_correct: bool | None = None,
+        after: UUID | None = None,
+        limit: int = DEFAULT_PAGE_LIMIT,
+    ) -> list[Answer]:
+        ...
+
+    @abc.abstractmethod
+    async def list_by_creator(
+        self, creator_id: UUID, after: UUID | None = None, *, limit: int = DEFAULT_PAGE_LIMIT
+    ) -> list[Answer]:
+        ...
+
+    @abc.abstractmethod
+    async def count_by_creator(self, creator_ids: list[UUID]) -> dict[UUID, int]:
+        ...
+
+    @abc.abstractmethod
+    async def get_statistics(self, question_uid: UUID) -> list[AnswerStatistic]:
+        ...
+
+    @abc.abstractmethod
+    async def rebuild_statistics(self) -> None:
+        ...
+
+    @abc.abstractmethod
+    async def list_since(self, watermark: int = 0, *, limit: int = DEFAULT_PAGE_LIMIT) -> tuple[list[Answer], int]:
+        ...
+
+    @abc.abstractmethod
+    async def get_consensus(self, question_uid: UUID) -> QuestionConsensus:
+        ...
+
+    @abc.abstractmethod
+    async def save_consensus(self, consensus: list[QuestionConsensus]) -> None:
+        ...
+
+    @abc.abstractmethod
+    async def merge_duplicates(self) -> int:
+        ...
+
+    @abc.abstractmethod
+    async def delete_superseded(self, before: UUID, *, limit: int) -> Reclaimed:
+        ...
@@ -1,14 +1,42 @@
 import abc
 from uuid import UUID
 
-from kittens_answers_core.models import Question, QuestionTypes
+from kittens_answers_core.filters.sketch import FrequencySketch
+from kittens_answers_core.models import (
+    DEFAULT_PAGE_LIMIT,
+    DEFAULT_SEARCH_LIMIT,
+    Change,
+    Question,
+    QuestionMatch,
+    QuestionTypes,
+    Reclaimed,
+    question_fingerprint,
+)
+from kittens_answers_core.normalization import TextNormalizer
 
 
 class BaseQuestionRepository(abc.ABC):  # pragma: no cover
+    changes: list[Change]
+    hot_keys: FrequencySketch | None = None
+    normalizer: TextNormalizer
+
+    def record_hit(self, uid: UUID) -> None:
+        if self.hot_keys is not None:
+            self.hot_keys.increment(str(uid))
+
+    def fingerprint(
+        self, question_type: QuestionTypes, question_text: str, options: set[str], extra_options: set[str]
+    ) -> str:
+        return question_fingerprint(question_type, self.normalizer(question_text), options, extra_options)
+
     @abc.abstractmethod
     async def get_by_uid(self, uid: UUID) -> Question:
         ...
 
+    @abc.abstractmethod
+    async def get_many_by_uid(self, uids: list[UUID]) -> list[Question]:
+        ...
+
     @abc.abstractmethod
     async def get(
         self,
@@ -29,3 +57,31 @@ class BaseQuestionRepository(abc.ABC):  # pragma: no cover
         creator_id: UUID,
     ) -> Question:
         ...
+
+    @abc.abstractmethod
+    async def search(
+        self, text: str, question_type: QuestionTypes | None = None, *, limit: int = DEFAULT_SEARCH_LIMIT
+    ) -> list[QuestionMatch]:
+        ...
+
+    @abc.abstractmethod
+    async def scan(self, after: UUID | None = None, *, limit: int = DEFAULT_PAGE_LIMIT) -> list[Question]:
+        ...
+
+    @abc.abstractmethod
+    async def list_by_creator(
+        self, creator_id: UUID, after: UUID | None = None, *, limit: int = DEFAULT_PAGE_LIMIT
+    ) -> list[Question]:
+        ...
+
+    @abc.abstractmethod
+    async def count_by_creator(self, creator_ids: list[UUID]) -> dict[UUID, int]:
+        ...
+
+    @abc.abstractmethod
+    async def delete_unanswered(self, before: UUID, *, limit: int) -> Reclaimed:
+        ...
+
+    @abc.abstractmethod
+    async def delete_orphaned_roots(self, *, limit: int) -> Reclaimed:
+        ...
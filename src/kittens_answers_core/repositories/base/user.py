@@ -1,10 +1,12 @@
 import abc
 from uuid import UUID
 
-from kittens_answers_core.models import User
+from kittens_answers_core.models import DEFAULT_PAGE_LIMIT, Change, User, UserReputation
 
 
 class BaseUserRepository(abc.ABC):  # pragma: no cover
+    changes: list[Change]
+
     @abc.abstractmethod
     async def get_by_foreign_id(self, foreign_id: str) -> User:
         ...
@@ -13,6 +15,22 @@ class BaseUserRepository(abc.ABC):  # pragma: no cover
     async def get_by_uid(self, uid: UUID) -> User:
         ...
 
+    @abc.abstractmethod
+    async def get_many_by_uid(self, uids: list[UUID]) -> list[User]:
+        ...
+
     @abc.abstractmethod
     async def create(self, foreign_id: str) -> User:
         ...
+
+    @abc.abstractmethod
+    async def get_reputations(self, user_uids: list[UUID]) -> list[UserReputation]:
+        ...
+
+    @abc.abstractmethod
+    async def save_reputations(self, reputations: list[UserReputation]) -> None:
+        ...
+
+    @abc.abstractmethod
+    async def scan(self, after: UUID | None = None, *, limit: int = DEFAULT_PAGE_LIMIT) -> list[User]:
+        ...
@@ -1,25 +1,164 @@
-from uuid import UUID, uuid4
+from collections import Counter, defaultdict
+from itertools import takewhile
+from typing import Any, Final
+from uuid import UUID
 
-from sqlalchemy import select
+from sqlalchemy import (
+    and_,
+    bindparam,
+    delete,
+    exists,
+    func,
+    lambda_stmt,
+    literal_column,
+    not_,
+    or_,
+    select,
+    update,
+)
 from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import aliased
 
 from kittens_answers_core.errors import (
     AnswerAlreadyExistError,
     AnswerDoesNotExistError,
+    QuestionDoesNotExistError,
+)
+from kittens_answers_core.identifiers import new_uid
+from kittens_answers_core.models import (
+    DEFAULT_PAGE_LIMIT,
+    Answer,
+    AnswerStatistic,
+    AnswerSubmission,
+    AnswerSubmissionResult,
+    Change,
+    ChangeKinds,
+    QuestionConsensus,
+    QuestionTypes,
+    Reclaimed,
+    canonical_answer,
+)
+from kittens_answers_core.models.db_models import (
+    Base,
+    DBAnswer,
+    DBAnswerStatistic,
+    DBQuestion,
+    DBQuestionConsensus,
+    DBRootQuestion,
 )
-from kittens_answers_core.models import Answer
-from kittens_answers_core.models.db_models import DBAnswer
 from kittens_answers_core.repositories.base.answer import BaseAnswerRepository
+from kittens_answers_core.repositories.db.dialect import dialect_name, insert, is_uuid7, row_size
+
+_QUESTION_TYPE: Final = (
+    select(DBRootQuestion.question_type)
+    .join(DBRootQuestion.questions)
+    .where(DBQuestion.uid == bindparam("question_uid"))
+)
+_BY_UID: Final = select(DBAnswer).where(DBAnswer.uid == bindparam("uid"))
+_MANY_BY_UID: Final = select(DBAnswer).where(DBAnswer.uid.in_(bindparam("uids", expanding=True)))
+_BY_CONTENT: Final = select(DBAnswer).where(
+    DBAnswer.answer == bindparam("answer"),
+    DBAnswer.extra_answer == bindparam("extra_answer"),
+    DBAnswer.question_uid == bindparam("question_uid"),
+    DBAnswer.is_correct == bindparam("is_correct"),
+)
+_STATISTICS: Final = (
+    select(DBAnswerStatistic)
+    .where(DBAnswerStatistic.question_uid == bindparam("question_uid"))
+    .order_by(
+        (DBAnswerStatistic.correct_count - DBAnswerStatistic.incorrect_count).desc(),
+        DBAnswerStatistic.correct_count.desc(),
+    )
+    .execution_options(populate_existing=True)
+)
+_SINCE: Final = (
+    select(DBAnswer)
+    .where(DBAnswer.seq > bindparam("watermark"))
+    .order_by(DBAnswer.seq)
+    .limit(bindparam("limit"))
+    .execution_options(populate_existing=True)
+)
+# seq is taken at insert time, not at commit time, so a lower seq can still become visible after higher ones.
+# only rows written by transactions older than every in-flight one are settled; a page stops at the first row
+# that is not, otherwise the watermark would move past rows that commit later. xid has no ordering, age() has.
+_SETTLED: Final = func.age(literal_column("answers.xmin")) > func.age(
+    func.xid(func.pg_snapshot_xmin(func.pg_current_snapshot()))
+)
+_SINCE_SETTLED: Final = (
+    select(DBAnswer, _SETTLED.label("settled"))
+    .where(DBAnswer.seq > bindparam("watermark"))
+    .order_by(DBAnswer.seq)
+    .limit(bindparam("limit"))
+    .execution_options(populate_existing=True)
+)
+_CONSENSUS: Final = (
+    select(DBQuestionConsensus)
+    .where(DBQuestionConsensus.question_uid == bindparam("question_uid"))
+    .execution_options(populate_existing=True)
+)
+
+_COUNT_BY_CREATOR: Final = (
+    select(DBAnswer.creator_id, func.count())
+    .where(DBAnswer.creator_id.in_(bindparam("creator_ids", expanding=True)))
+    .group_by(DBAnswer.creator_id)
+)
+
+_answers = Base.metadata.tables[DBAnswer.__tablename__]
+_statistics = Base.metadata.tables[DBAnswerStatistic.__tablename__]
+_UNCOUNT: Final = (
+    update(_statistics)
+    .where(
+        _statistics.c.question_uid == bindparam("b_question_uid"),
+        _statistics.c.answer == bindparam("b_answer"),
+        _statistics.c.extra_answer == bindparam("b_extra_answer"),
+    )
+    .values(incorrect_count=_statistics.c.incorrect_count - bindparam("b_count"))
+)
 
 
 class SQLAlchemyAnswerRepository(BaseAnswerRepository):
     session: AsyncSession
 
+    async def _question_type(self, question_uid: UUID) -> QuestionTypes | None:
+        question_type = await self.session.scalar(_QUESTION_TYPE, {"question_uid": question_uid})
+        return None if question_type is None else QuestionTypes(question_type)
+
+    async def _count(self, answers: list[DBAnswer]) -> None:
+        counts: defaultdict[tuple[UUID, tuple[str, ...], tuple[str, ...]], list[int]] = defaultdict(lambda: [0, 0])
+        for _answer in answers:
+            counts[_answer.question_uid, tuple(_answer.answer), tuple(_answer.extra_answer)][_answer.is_correct] += 1
+        statistic = insert(self.session, DBAnswerStatistic).values(
+            [
+                {
+                    "question_uid": question_uid,
+                    "answer": list(answer),
+                    "extra_answer": list(extra_answer),
+                    "correct_count": correct_count,
+                    "incorrect_count": incorrect_count,
+                }
+                for (question_uid, answer, extra_answer), (incorrect_count, correct_count) in counts.items()
+            ]
+        )
+        await self.session.execute(
+            statistic.on_conflict_do_update(
+                index_elements=[
+                    DBAnswerStatistic.question_uid,
+                    DBAnswerStatistic.answer,
+                    DBAnswerStatistic.extra_answer,
+                ],
+                set_={
+                    "correct_count": DBAnswerStatistic.correct_count + statistic.excluded.correct_count,
+                    "incorrect_count": DBAnswerStatistic.incorrect_count + statistic.excluded.incorrect_count,
+                },
+            )
+        )
+
     async def get_by_uid(self, answer_uid: UUID) -> Answer:
-        answer = await self.session.scalar(select(DBAnswer).where(DBAnswer.uid == answer_uid))
+        answer = await self.session.scalar(_BY_UID, {"uid": answer_uid})
         if answer is None:
             raise AnswerDoesNotExistError
+        self.record_hit(answer.uid)
         return Answer(
             uid=answer.uid,
             creator=answer.creator_id,
@@ -29,17 +168,32 @@ class SQLAlchemyAnswerRepository(BaseAnswerRepository):
             is_correct=answer.is_correct,
         )
 
+    async def get_many_by_uid(self, answer_uids: list[UUID]) -> list[Answer]:
+        answers = await self.session.scalars(_MANY_BY_UID, {"uids": answer_uids})
+        return [
+            Answer(
+                uid=answer.uid,
+                creator=answer.creator_id,
+                question_uid=answer.question_uid,
+                answer=answer.answer,
+                extra_answer=answer.extra_answer,
+                is_correct=answer.is_correct,
+            )
+            for answer in answers
+        ]
+
     async def get(self, answer: list[str], extra_answer: list[str], question_uid: UUID, *, is_correct: bool) -> Answer:
+        if (question_type := await self._question_type(question_uid)) is None:
+            raise AnswerDoesNotExistError
+        answer = canonical_answer(question_type, answer)
+        extra_answer = canonical_answer(question_type, extra_answer)
         _answer = await self.session.scalar(
-            select(DBAnswer).where(
-                DBAnswer.answer == answer,
-                DBAnswer.extra_answer == extra_answer,
-                DBAnswer.question_uid == question_uid,
-                DBAnswer.is_correct == is_correct,
-            )
+            _BY_CONTENT,
+            {"answer": answer, "extra_answer": extra_answer, "question_uid": question_uid, "is_correct": is_correct},
         )
         if _answer is None:
             raise AnswerDoesNotExistError
+        self.record_hit(_answer.uid)
         return Answer(
             uid=_answer.uid,
             creator=_answer.creator_id,
@@ -52,19 +206,25 @@ class SQLAlchemyAnswerRepository(BaseAnswerRepository):
     async def create(
         self, answer: list[str], extra_answer: list[str], question_uid: UUID, creator_id: UUID, *, is_correct: bool
     ) -> Answer:
+        if (question_type := await self._question_type(question_uid)) is None:
+            raise QuestionDoesNotExistError
+        answer = canonical_answer(question_type, answer)
+        extra_answer = canonical_answer(question_type, extra_answer)
         _answer = DBAnswer(
-            uid=uuid4(),
+            uid=new_uid(),
             creator_id=creator_id,
             question_uid=question_uid,
             answer=answer,
             extra_answer=extra_answer,
             is_correct=is_correct,
         )
-        self.session.add(_answer)
         try:
-            await self.session.flush()
+            async with self.session.begin_nested():
+                self.session.add(_answer)
         except IntegrityError as error:
             raise AnswerAlreadyExistError from error
+        await self._count([_answer])
+        self.changes.append(Change(kind=ChangeKinds.ANSWER, uid=_answer.uid))
         return Answer(
             uid=_answer.uid,
             creator=_answer.creator_id,
@@ -73,3 +233,322 @@ class SQLAlchemyAnswerRepository(BaseAnswerRepository):
             extra_answer=_answer.extra_answer,
             is_correct=_answer.is_correct,
         )
+
+    async def create_many(self, submissions: list[AnswerSubmission]) -> list[AnswerSubmissionResult]:
+        question_types = {
+            question_uid: QuestionTypes(question_type)
+            for question_uid, question_type in await self.session.execute(
+                select(DBQuestion.uid, DBRootQuestion.question_type)
+                .join(DBQuestion.root_question)
+                .where(DBQuestion.uid.in_({submission.question_uid for submission in submissions}))
+            )
+        }
+        rows: dict[tuple[UUID, tuple[str, ...], tuple[str, ...], bool], dict[str, Any]] = {}
+        keys = []
+        for submission in submissions:
+            if (question_type := question_types.get(submission.question_uid)) is None:
+                raise QuestionDoesNotExistError
+            answer = canonical_answer(question_type, submission.answer)
+            extra_answer = canonical_answer(question_type, submission.extra_answer)
+            key = (submission.question_uid, tuple(answer), tuple(extra_answer), submission.is_correct)
+            keys.append(key)
+            rows.setdefault(
+                key,
+                {
+                    "uid": new_uid(),
+                    "creator_id": submission.creator,
+                    "question_uid": submission.question_uid,
+                    "answer": answer,
+                    "extra_answer": extra_answer,
+                    "is_correct": submission.is_correct,
+                },
+            )
+        if not rows:
+            return []
+        created = (
+            await self.session.scalars(
+                insert(self.session, DBAnswer)
+                .values(list(rows.values()))
+                .on_conflict_do_nothing(
+                    index_elements=[DBAnswer.question_uid, DBAnswer.answer, DBAnswer.extra_answer, DBAnswer.is_correct]
+                )
+                .returning(DBAnswer)
+            )
+        ).all()
+        answers = {
+            (_answer.question_uid, tuple(_answer.answer), tuple(_answer.extra_answer), _answer.is_correct): _answer
+            for _answer in created
+        }
+        if existing := [key for key in rows if key not in answers]:
+            for _answer in await self.session.scalars(
+                select(DBAnswer).where(
+                    or_(
+                        *(
+                            and_(
+                                DBAnswer.question_uid == question_uid,
+                                DBAnswer.answer == list(answer),
+                                DBAnswer.extra_answer == list(extra_answer),
+                                DBAnswer.is_correct == is_correct,
+                            )
+                            for question_uid, answer, extra_answer, is_correct in existing
+                        )
+                    )
+                )
+            ):
+                answers[
+                    _answer.question_uid, tuple(_answer.answer), tuple(_answer.extra_answer), _answer.is_correct
+                ] = _answer
+        if created:
+            await self._count(list(created))
+            self.changes.extend(Change(kind=ChangeKinds.ANSWER, uid=_answer.uid) for _answer in created)
+        results = []
+        seen = set()
+        for key in keys:
+            _answer = answers[key]
+            results.append(
+                AnswerSubmissionResult(
+                    answer=Answer(
+                        uid=_answer.uid,
+                        creator=_answer.creator_id,
+                        question_uid=_answer.question_uid,
+                        answer=_answer.answer,
+                        extra_answer=_answer.extra_answer,
+                        is_correct=_answer.is_correct,
+                    ),
+                    created=_answer.uid == rows[key]["uid"] and key not in seen,
+                )
+            )
+            seen.add(key)
+        return results
+
+    async def list_for_question(
+        self,
+        question_uid: UUID,
+        *,
+        is_correct: bool | None = None,
+        after: UUID | None = None,
+        limit: int = DEFAULT_PAGE_LIMIT,
+    ) -> list[Answer]:
+        query = lambda_stmt(lambda: select(DBAnswer).where(DBAnswer.question_uid == question_uid))
+        if is_correct is not None:
+            query += lambda statement: statement.where(DBAnswer.is_correct == is_correct)
+        if after is not None:
+            query += lambda statement: statement.where(DBAnswer.uid > after)
+        query += lambda statement: statement.order_by(DBAnswer.uid).limit(limit)
+        answers = await self.session.scalars(query)
+        return [
+            Answer(
+                uid=_answer.uid,
+                creator=_answer.creator_id,
+                question_uid=_answer.question_uid,
+                answer=_answer.answer,
+                extra_answer=_answer.extra_answer,
+                is_correct=_answer.is_correct,
+            )
+            for _answer in answers
+        ]
+
+    async def list_by_creator(
+        self, creator_id: UUID, after: UUID | None = None, *, limit: int = DEFAULT_PAGE_LIMIT
+    ) -> list[Answer]:
+        query = lambda_stmt(lambda: select(DBAnswer).where(DBAnswer.creator_id == creator_id))
+        if after is not None:
+            query += lambda statement: statement.where(DBAnswer.uid > after)
+        query += lambda statement: statement.order_by(DBAnswer.uid).limit(limit)
+        return [
+            Answer(
+                uid=_answer.uid,
+                creator=_answer.creator_id,
+                question_uid=_answer.question_uid,
+                answer=_answer.answer,
+                extra_answer=_answer.extra_answer,
+                is_correct=_answer.is_correct,
+            )
+            for _answer in await self.session.scalars(query)
+        ]
+
+    async def count_by_creator(self, creator_ids: list[UUID]) -> dict[UUID, int]:
+        counts = await self.session.execute(_COUNT_BY_CREATOR, {"creator_ids": creator_ids})
+        return dict(counts.all())
+
+    async def get_statistics(self, question_uid: UUID) -> list[AnswerStatistic]:
+        statistics = await self.session.scalars(_STATISTICS, {"question_uid": question_uid})
+        return [
+            AnswerStatistic(
+                question_uid=statistic.question_uid,
+                answer=list(statistic.answer),
+                extra_answer=list(statistic.extra_answer),
+                correct_count=statistic.correct_count,
+                incorrect_count=statistic.incorrect_count,
+            )
+            for statistic in statistics
+        ]
+
+    async def rebuild_statistics(self) -> None:
+        await self.session.execute(delete(DBAnswerStatistic))
+        await self.session.execute(
+            insert(self.session, DBAnswerStatistic).from_select(
+                ["question_uid", "answer", "extra_answer", "correct_count", "incorrect_count"],
+                select(
+                    DBAnswer.question_uid,
+                    DBAnswer.answer,
+                    DBAnswer.extra_answer,
+                    func.count().filter(DBAnswer.is_correct),
+                    func.count().filter(not_(DBAnswer.is_correct)),
+                ).group_by(DBAnswer.question_uid, DBAnswer.answer, DBAnswer.extra_answer),
+            )
+        )
+
+    async def list_since(self, watermark: int = 0, *, limit: int = DEFAULT_PAGE_LIMIT) -> tuple[list[Answer], int]:
+        parameters = {"watermark": watermark, "limit": limit}
+        if dialect_name(self.session) == "postgresql":
+            rows = await self.session.execute(_SINCE_SETTLED, parameters)
+            answers = [_answer for _answer, _ in takewhile(lambda row: row.settled, rows)]
+        else:
+            answers = list((await self.session.scalars(_SINCE, parameters)).all())
+        if answers:
+            watermark = answers[-1].seq
+        return [
+            Answer(
+                uid=_answer.uid,
+                creator=_answer.creator_id,
+                question_uid=_answer.question_uid,
+                answer=_answer.answer,
+                extra_answer=_answer.extra_answer,
+                is_correct=_answer.is_correct,
+            )
+            for _answer in answers
+        ], watermark
+
+    async def get_consensus(self, question_uid: UUID) -> QuestionConsensus:
+        consensus = await self.session.scalar(_CONSENSUS, {"question_uid": question_uid})
+        if consensus is None:
+            raise AnswerDoesNotExistError
+        return QuestionConsensus(
+            question_uid=consensus.question_uid,
+            answer=consensus.answer,
+            extra_answer=consensus.extra_answer,
+            score=consensus.score,
+        )
+
+    async def save_consensus(self, consensus: list[QuestionConsensus]) -> None:
+        if not consensus:
+            return
+        statement = insert(self.session, DBQuestionConsensus).values(
+            [
+                {
+                    "question_uid": question_consensus.question_uid,
+                    "answer": question_consensus.answer,
+                    "extra_answer": question_consensus.extra_answer,
+                    "score": question_consensus.score,
+                }
+                for question_consensus in consensus
+            ]
+        )
+        await self.session.execute(
+            statement.on_conflict_do_update(
+                index_elements=[DBQuestionConsensus.question_uid],
+                set_={
+                    "answer": statement.excluded.answer,
+                    "extra_answer": statement.excluded.extra_answer,
+                    "score": statement.excluded.score,
+                },
+            )
+        )
+
+    async def merge_duplicates(self) -> int:
+        answers = await self.session.stream(
+            select(
+                DBAnswer.uid,
+                DBAnswer.question_uid,
+                DBRootQuestion.question_type,
+                DBAnswer.answer,
+                DBAnswer.extra_answer,
+                DBAnswer.is_correct,
+            )
+            .join(DBAnswer.question)
+            .join(DBQuestion.root_question)
+            .where(DBRootQuestion.question_type.in_([str(QuestionTypes.ONE), str(QuestionTypes.MANY)]))
+            .execution_options(yield_per=DEFAULT_PAGE_LIMIT)
+        )
+        kept: dict[tuple[UUID, tuple[str, ...], tuple[str, ...], bool], tuple[UUID, bool]] = {}
+        duplicates: list[UUID] = []
+        async for uid, question_uid, question_type, answer, extra_answer, is_correct in answers:
+            canonical = (
+                question_uid,
+                tuple(canonical_answer(QuestionTypes(question_type), answer)),
+                tuple(canonical_answer(QuestionTypes(question_type), extra_answer)),
+                is_correct,
+            )
+            is_canonical = canonical[1] == tuple(answer) and canonical[2] == tuple(extra_answer)
+            if (previous := kept.get(canonical)) is None:
+                kept[canonical] = (uid, is_canonical)
+            elif is_canonical:
+                duplicates.append(previous[0])
+                kept[canonical] = (uid, is_canonical)
+            else:
+                duplicates.append(uid)
+        for offset in range(0, len(duplicates), DEFAULT_PAGE_LIMIT):
+            await self.session.execute(
+                delete(DBAnswer).where(DBAnswer.uid.in_(duplicates[offset : offset + DEFAULT_PAGE_LIMIT]))
+            )
+        updates = [
+            {"uid": uid, "question_uid": question_uid, "answer": list(answer), "extra_answer": list(extra_answer)}
+            for (question_uid, answer, extra_answer, _), (uid, is_canonical) in kept.items()
+            if not is_canonical
+        ]
+        if updates:
+            await self.session.execute(update(DBAnswer), updates)
+        await self.rebuild_statistics()
+        return len(duplicates)
+
+    async def delete_superseded(self, before: UUID, *, limit: int) -> Reclaimed:
+        candidate = aliased(DBAnswer)
+        later = aliased(DBAnswer)
+        superseded = (
+            select(candidate.uid)
+            .where(
+                # only uuid7 uids carry their creation time, "later" is the insertion order
+                is_uuid7(self.session, candidate.uid),
+                candidate.uid < before,
+                not_(candidate.is_correct),
+                exists().where(
+                    later.question_uid == candidate.question_uid, later.is_correct, later.seq > candidate.seq
+                ),
+            )
+            .order_by(candidate.uid)
+            .limit(limit)
+        )
+        deleted = (
+            await self.session.execute(
+                delete(DBAnswer)
+                .where(DBAnswer.uid.in_(superseded.scalar_subquery()))
+                .returning(
+                    DBAnswer.question_uid,
+                    DBAnswer.answer,
+                    DBAnswer.extra_answer,
+                    row_size(self.session, _answers),
+                )
+                .execution_options(synchronize_session=False)
+            )
+        ).all()
+        if not deleted:
+            return Reclaimed()
+        counts = Counter(
+            (question_uid, tuple(answer), tuple(extra_answer)) for question_uid, answer, extra_answer, _ in deleted
+        )
+        await self.session.execute(
+            _UNCOUNT,
+            [
+                {"b_question_uid": question_uid, "b_answer": answer, "b_extra_answer": extra_answer, "b_count": count}
+                for (question_uid, answer, extra_answer), count in counts.items()
+            ],
+        )
+        await self.session.execute(
+            delete(DBAnswerStatistic).where(
+                DBAnswerStatistic.question_uid.in_({question_uid for question_uid, _, _ in counts}),
+                DBAnswerStatistic.correct_count == 0,
+                DBAnswerStatistic.incorrect_count == 0,
+            )
+        )
+        return Reclaimed(rows=len(deleted), bytes=sum(size for *_, size in deleted))
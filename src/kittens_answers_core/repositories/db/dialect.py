@@ -0,0 +1,50 @@
+from typing import Any, Final, TypeAlias
+from uuid import UUID
+
+from sqlalchemy import ColumnElement, Integer, LargeBinary, Table, Text, cast, func
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import QueryableAttribute
+
+from kittens_answers_core.identifiers import UUID7_VERSION
+
+Upsert: TypeAlias = postgresql.Insert | sqlite.Insert
+
+UNIQUE_VIOLATION: Final[str] = "23505"
+SQLITE_UNIQUE_VIOLATIONS: Final[frozenset[str]] = frozenset(
+    {"SQLITE_CONSTRAINT_UNIQUE", "SQLITE_CONSTRAINT_PRIMARYKEY"}
+)
+
+
+def dialect_name(session: AsyncSession) -> str:
+    return session.get_bind().dialect.name
+
+
+def insert(session: AsyncSession, table: Any) -> Upsert:
+    if dialect_name(session) == "sqlite":
+        return sqlite.insert(table)
+    return postgresql.insert(table)
+
+
+def row_size(session: AsyncSession, table: Table) -> ColumnElement[int]:
+    if dialect_name(session) == "postgresql":
+        return func.pg_column_size(table.table_valued(), type_=Integer)
+    return sum(
+        (func.coalesce(func.length(cast(column, LargeBinary)), 0) for column in table.columns),
+        start=cast(0, Integer),
+    )
+
+
+def is_uuid7(session: AsyncSession, column: QueryableAttribute[UUID]) -> ColumnElement[bool]:
+    # the version nibble, postgres renders uuids with dashes and sqlite stores them as 32 hex digits
+    if dialect_name(session) == "postgresql":
+        return func.substr(cast(column, Text), 15, 1) == str(UUID7_VERSION)
+    return func.substr(column, 13, 1) == str(UUID7_VERSION)
+
+
+def is_unique_violation(error: IntegrityError) -> bool:
+    # only a duplicate proves the row exists, foreign key and not null violations are caller errors
+    if getattr(error.orig, "sqlstate", None) == UNIQUE_VIOLATION:
+        return True
+    return getattr(error.orig, "sqlite_errorname", None) in SQLITE_UNIQUE_VIOLATIONS
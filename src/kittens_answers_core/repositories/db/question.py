@@ -1,29 +1,83 @@
-from uuid import UUID, uuid4
+from typing import Final
+from uuid import UUID
 
-from sqlalchemy import select
+from sqlalchemy import bindparam, delete, exists, func, lambda_stmt, select
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.orm import selectinload
+from sqlalchemy.orm import aliased, selectinload
 
 from kittens_answers_core.errors import (
     QuestionAlreadyExistError,
     QuestionDoesNotExistError,
 )
-from kittens_answers_core.models import Question, QuestionTypes
-from kittens_answers_core.models.db_models import DBQuestion, DBRootQuestion
+from kittens_answers_core.filters.bloom import key_digest
+from kittens_answers_core.filters.lookup import LookupFilters
+from kittens_answers_core.identifiers import new_uid
+from kittens_answers_core.models import (
+    DEFAULT_PAGE_LIMIT,
+    DEFAULT_SEARCH_LIMIT,
+    Change,
+    ChangeKinds,
+    Question,
+    QuestionMatch,
+    QuestionTypes,
+    Reclaimed,
+)
+from kittens_answers_core.models.db_models import (
+    Base,
+    DBAnswer,
+    DBAnswerStatistic,
+    DBQuestion,
+    DBQuestionConsensus,
+    DBRootQuestion,
+)
+from kittens_answers_core.normalization import SIMILARITY_THRESHOLD, TextNormalizer
 from kittens_answers_core.repositories.base.question import (
     BaseQuestionRepository,
 )
+from kittens_answers_core.repositories.db.dialect import dialect_name, is_unique_violation, is_uuid7, row_size
+
+_BY_UID: Final = (
+    select(DBQuestion).where(DBQuestion.uid == bindparam("uid")).options(selectinload(DBQuestion.root_question))
+)
+_MANY_BY_UID: Final = (
+    select(DBQuestion)
+    .where(DBQuestion.uid.in_(bindparam("uids", expanding=True)))
+    .options(selectinload(DBQuestion.root_question))
+)
+_ROOT_BY_TEXT: Final = select(DBRootQuestion).where(
+    DBRootQuestion.question_type == bindparam("question_type"),
+    DBRootQuestion.normalized_text == bindparam("normalized_text"),
+)
+_BY_OPTIONS: Final = (
+    select(DBQuestion)
+    .options(selectinload(DBQuestion.root_question))
+    .where(
+        DBQuestion.root_question_uid == bindparam("root_uid"),
+        DBQuestion.options == bindparam("options"),
+        DBQuestion.extra_options == bindparam("extra_options"),
+    )
+)
+
+_COUNT_BY_CREATOR: Final = (
+    select(DBQuestion.creator_id, func.count())
+    .where(DBQuestion.creator_id.in_(bindparam("creator_ids", expanding=True)))
+    .group_by(DBQuestion.creator_id)
+)
 
 
 class SQLAlchemyQuestionRepository(BaseQuestionRepository):
     session: AsyncSession
 
+    def __init__(self, normalizer: TextNormalizer | None = None, lookup_filters: LookupFilters | None = None) -> None:
+        self.normalizer = normalizer or TextNormalizer()
+        self.lookup_filters = lookup_filters
+
     async def get_by_uid(self, uid: UUID) -> Question:
-        question = await self.session.scalar(
-            select(DBQuestion).where(DBQuestion.uid == uid).options(selectinload(DBQuestion.root_question))
-        )
+        question = await self.session.scalar(_BY_UID, {"uid": uid})
         if question is None:
             raise QuestionDoesNotExistError
+        self.record_hit(question.uid)
         return Question(
             uid=question.uid,
             creator=question.creator_id,
@@ -33,27 +87,39 @@ class SQLAlchemyQuestionRepository(BaseQuestionRepository):
             extra_options=set(question.extra_options),
         )
 
+    async def get_many_by_uid(self, uids: list[UUID]) -> list[Question]:
+        questions = await self.session.scalars(_MANY_BY_UID, {"uids": uids})
+        return [
+            Question(
+                uid=question.uid,
+                creator=question.creator_id,
+                question_type=QuestionTypes(question.root_question.question_type),
+                text=question.root_question.text,
+                options=set(question.options),
+                extra_options=set(question.extra_options),
+            )
+            for question in questions
+        ]
+
     async def get(
         self, question_type: QuestionTypes, question_text: str, options: set[str], extra_options: set[str]
     ) -> Question:
+        if self.lookup_filters is not None and not self.lookup_filters.may_have_question(
+            self.fingerprint(question_type, question_text, options, extra_options)
+        ):
+            raise QuestionDoesNotExistError
         root_question = await self.session.scalar(
-            select(DBRootQuestion).where(
-                DBRootQuestion.question_type == str(question_type), DBRootQuestion.text == question_text
-            )
+            _ROOT_BY_TEXT, {"question_type": str(question_type), "normalized_text": self.normalizer(question_text)}
         )
         if root_question is None:
             raise QuestionDoesNotExistError
         question = await self.session.scalar(
-            select(DBQuestion)
-            .options(selectinload(DBQuestion.root_question))
-            .where(
-                DBQuestion.root_question_uid == root_question.root_uid,
-                DBQuestion.options == sorted(options),
-                DBQuestion.extra_options == sorted(extra_options),
-            )
+            _BY_OPTIONS,
+            {"root_uid": root_question.root_uid, "options": sorted(options), "extra_options": sorted(extra_options)},
         )
         if question is None:
             raise QuestionDoesNotExistError
+        self.record_hit(question.uid)
         return Question(
             uid=question.uid,
             creator=question.creator_id,
@@ -71,35 +137,49 @@ class SQLAlchemyQuestionRepository(BaseQuestionRepository):
         extra_options: set[str],
         creator_id: UUID,
     ) -> Question:
-        root_question = await self.session.scalar(
-            select(DBRootQuestion).where(
-                DBRootQuestion.question_type == str(question_type), DBRootQuestion.text == question_text
-            )
-        )
+        root_parameters = {"question_type": str(question_type), "normalized_text": self.normalizer(question_text)}
+        root_question = await self.session.scalar(_ROOT_BY_TEXT, root_parameters)
         if root_question is None:
-            root_question = DBRootQuestion(root_uid=uuid4(), question_type=str(question_type), text=question_text)
-            self.session.add(root_question)
-            await self.session.flush()
-        question = await self.session.scalar(
-            select(DBQuestion)
-            .options(selectinload(DBQuestion.root_question))
-            .where(
-                DBQuestion.root_question_uid == root_question.root_uid,
-                DBQuestion.options == sorted(options),
-                DBQuestion.extra_options == sorted(extra_options),
+            root_question = DBRootQuestion(
+                root_uid=new_uid(),
+                question_type=str(question_type),
+                text=question_text,
+                normalized_text=self.normalizer(question_text),
             )
+            try:
+                async with self.session.begin_nested():
+                    self.session.add(root_question)
+            except IntegrityError:
+                # a concurrent transaction created the same root first
+                root_question = await self.session.scalar(_ROOT_BY_TEXT, root_parameters)
+                if root_question is None:
+                    raise
+        question = await self.session.scalar(
+            _BY_OPTIONS,
+            {"root_uid": root_question.root_uid, "options": sorted(options), "extra_options": sorted(extra_options)},
         )
+        digest = key_digest(self.fingerprint(question_type, question_text, options, extra_options))
         if question is not None:
+            self._remember(digest)
             raise QuestionAlreadyExistError
         question = DBQuestion(
-            uid=uuid4(),
+            uid=new_uid(),
             creator_id=creator_id,
             options=sorted(options),
             extra_options=sorted(extra_options),
             root_question_uid=root_question.root_uid,
         )
-        self.session.add(question)
-        await self.session.flush()
+        try:
+            async with self.session.begin_nested():
+                self.session.add(question)
+        except IntegrityError as error:
+            if not is_unique_violation(error):
+                raise
+            # the conflict proves the question exists, so the filter lets the following re-read reach the database
+            self._remember(digest)
+            raise QuestionAlreadyExistError from error
+        self._remember(digest)
+        self.changes.append(Change(kind=ChangeKinds.QUESTION, uid=question.uid, key=digest.hex()))
         return Question(
             uid=question.uid,
             creator=question.creator_id,
@@ -108,3 +188,130 @@ class SQLAlchemyQuestionRepository(BaseQuestionRepository):
             options=set(question.options),
             extra_options=set(question.extra_options),
         )
+
+    def _remember(self, digest: bytes) -> None:
+        if self.lookup_filters is not None:
+            self.lookup_filters.questions.add_digest(digest)
+
+    async def scan(self, after: UUID | None = None, *, limit: int = DEFAULT_PAGE_LIMIT) -> list[Question]:
+        statement = (
+            select(DBQuestion).options(selectinload(DBQuestion.root_question)).order_by(DBQuestion.uid).limit(limit)
+        )
+        if after is not None:
+            statement = statement.where(DBQuestion.uid > after)
+        return [
+            Question(
+                uid=question.uid,
+                creator=question.creator_id,
+                question_type=QuestionTypes(question.root_question.question_type),
+                text=question.root_question.text,
+                options=set(question.options),
+                extra_options=set(question.extra_options),
+            )
+            for question in await self.session.scalars(statement)
+        ]
+
+    async def list_by_creator(
+        self, creator_id: UUID, after: UUID | None = None, *, limit: int = DEFAULT_PAGE_LIMIT
+    ) -> list[Question]:
+        query = lambda_stmt(
+            lambda: select(DBQuestion)
+            .where(DBQuestion.creator_id == creator_id)
+            .options(selectinload(DBQuestion.root_question))
+        )
+        if after is not None:
+            query += lambda statement: statement.where(DBQuestion.uid > after)
+        query += lambda statement: statement.order_by(DBQuestion.uid).limit(limit)
+        return [
+            Question(
+                uid=question.uid,
+                creator=question.creator_id,
+                question_type=QuestionTypes(question.root_question.question_type),
+                text=question.root_question.text,
+                options=set(question.options),
+                extra_options=set(question.extra_options),
+            )
+            for question in await self.session.scalars(query)
+        ]
+
+    async def count_by_creator(self, creator_ids: list[UUID]) -> dict[UUID, int]:
+        counts = await self.session.execute(_COUNT_BY_CREATOR, {"creator_ids": creator_ids})
+        return dict(counts.all())
+
+    async def search(
+        self, text: str, question_type: QuestionTypes | None = None, *, limit: int = DEFAULT_SEARCH_LIMIT
+    ) -> list[QuestionMatch]:
+        normalized_text = self.normalizer(text)
+        score = func.similarity(DBRootQuestion.normalized_text, normalized_text).label("score")
+        if dialect_name(self.session) == "sqlite":
+            roots = select(DBRootQuestion.root_uid, score).where(score >= SIMILARITY_THRESHOLD)
+        else:
+            roots = select(DBRootQuestion.root_uid, score).where(
+                DBRootQuestion.normalized_text.op("%")(normalized_text)
+            )
+        if question_type is not None:
+            roots = roots.where(DBRootQuestion.question_type == str(question_type))
+        matches = roots.order_by(score.desc()).limit(limit).subquery()
+        questions = await self.session.execute(
+            select(DBQuestion, matches.c.score)
+            .join(matches, DBQuestion.root_question_uid == matches.c.root_uid)
+            .options(selectinload(DBQuestion.root_question))
+            .order_by(matches.c.score.desc(), DBQuestion.uid)
+            .limit(limit)
+        )
+        return [
+            QuestionMatch(
+                question=Question(
+                    uid=question.uid,
+                    creator=question.creator_id,
+                    question_type=QuestionTypes(question.root_question.question_type),
+                    text=question.root_question.text,
+                    options=set(question.options),
+                    extra_options=set(question.extra_options),
+                ),
+                score=question_score,
+            )
+            for question, question_score in questions
+        ]
+
+    async def delete_unanswered(self, before: UUID, *, limit: int) -> Reclaimed:
+        unanswered = ~exists().where(DBAnswer.question_uid == DBQuestion.uid)
+        uids = (
+            await self.session.scalars(
+                select(DBQuestion.uid)
+                .where(is_uuid7(self.session, DBQuestion.uid), DBQuestion.uid < before, unanswered)
+                .order_by(DBQuestion.uid)
+                .limit(limit)
+            )
+        ).all()
+        if not uids:
+            return Reclaimed()
+        await self.session.execute(delete(DBQuestionConsensus).where(DBQuestionConsensus.question_uid.in_(uids)))
+        await self.session.execute(delete(DBAnswerStatistic).where(DBAnswerStatistic.question_uid.in_(uids)))
+        sizes = (
+            await self.session.scalars(
+                delete(DBQuestion)
+                .where(DBQuestion.uid.in_(uids), unanswered)
+                .returning(row_size(self.session, Base.metadata.tables[DBQuestion.__tablename__]))
+                .execution_options(synchronize_session=False)
+            )
+        ).all()
+        return Reclaimed(rows=len(sizes), bytes=sum(sizes))
+
+    async def delete_orphaned_roots(self, *, limit: int) -> Reclaimed:
+        root = aliased(DBRootQuestion)
+        orphaned = (
+            select(root.root_uid)
+            .where(~exists().where(DBQuestion.root_question_uid == root.root_uid))
+            .order_by(root.root_uid)
+            .limit(limit)
+        )
+        sizes = (
+            await self.session.scalars(
+                delete(DBRootQuestion)
+                .where(DBRootQuestion.root_uid.in_(orphaned.scalar_subquery()))
+                .returning(row_size(self.session, Base.metadata.tables[DBRootQuestion.__tablename__]))
+                .execution_options(synchronize_session=False)
+            )
+        ).all()
+        return Reclaimed(rows=len(sizes), bytes=sum(sizes))
@@ -0,0 +1,248 @@
+from typing import Final
+
+from sqlalchemy import Boolean, Integer, String, Uuid, bindparam, exists, false, func, select, true, union_all
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from kittens_answers_core.filters.bloom import key_digest
+from kittens_answers_core.identifiers import new_uid
+from kittens_answers_core.models import (
+    Answer,
+    Change,
+    ChangeKinds,
+    Question,
+    Submission,
+    SubmissionResult,
+    User,
+    canonical_answer,
+)
+from kittens_answers_core.models.db_models import (
+    Base,
+    DBAnswer,
+    DBAnswerStatistic,
+    DBQuestion,
+    DBRootQuestion,
+    DBUser,
+    StringList,
+)
+from kittens_answers_core.repositories.db.question import SQLAlchemyQuestionRepository
+from kittens_answers_core.repositories.db.user import SQLAlchemyUserRepository
+
+_users = Base.metadata.tables[DBUser.__tablename__]
+_roots = Base.metadata.tables[DBRootQuestion.__tablename__]
+_questions = Base.metadata.tables[DBQuestion.__tablename__]
+_answers = Base.metadata.tables[DBAnswer.__tablename__]
+_statistics = Base.metadata.tables[DBAnswerStatistic.__tablename__]
+
+_foreign_id = bindparam("foreign_id", type_=String)
+_question_type = bindparam("question_type", type_=String)
+_normalized_text = bindparam("normalized_text", type_=String)
+_options = bindparam("options", type_=StringList())
+_extra_options = bindparam("extra_options", type_=StringList())
+_answer = bindparam("answer", type_=StringList())
+_extra_answer = bindparam("extra_answer", type_=StringList())
+_is_correct = bindparam("is_correct", type_=Boolean)
+
+# every step selects the existing row and only inserts when there is none, so a resubmission writes nothing
+_existing_user = select(_users.c.uid).where(_users.c.foreign_id == _foreign_id).cte("existing_user")
+_new_user = (
+    postgresql.insert(_users)
+    .from_select(
+        ["uid", "foreign_id"],
+        select(bindparam("user_uid", type_=Uuid), _foreign_id).where(~exists(_existing_user.select())),
+    )
+    .on_conflict_do_nothing()
+    .returning(_users.c.uid)
+    .cte("new_user")
+)
+_user = union_all(select(_existing_user.c.uid, false().label("created")), select(_new_user.c.uid, true())).cte(
+    "submitting_user"
+)
+
+_existing_root = (
+    select(_roots.c.root_uid, _roots.c.text)
+    .where(_roots.c.question_type == _question_type, _roots.c.normalized_text == _normalized_text)
+    .cte("existing_root")
+)
+_new_root = (
+    postgresql.insert(_roots)
+    .from_select(
+        ["root_uid", "question_type", "text", "normalized_text"],
+        select(
+            bindparam("root_uid", type_=Uuid), _question_type, bindparam("text", type_=String), _normalized_text
+        ).where(~exists(_existing_root.select())),
+    )
+    .on_conflict_do_nothing()
+    .returning(_roots.c.root_uid, _roots.c.text)
+    .cte("new_root")
+)
+_root = union_all(_existing_root.select(), _new_root.select()).cte("root")
+
+_existing_question = (
+    select(_questions.c.uid, _questions.c.creator_id)
+    .join(_root, _questions.c.root_question_uid == _root.c.root_uid)
+    .where(_questions.c.options == _options, _questions.c.extra_options == _extra_options)
+    .cte("existing_question")
+)
+_new_question = (
+    postgresql.insert(_questions)
+    .from_select(
+        ["uid", "creator_id", "options", "extra_options", "root_question_uid"],
+        select(bindparam("question_uid", type_=Uuid), _user.c.uid, _options, _extra_options, _root.c.root_uid)
+        .join(_root, true())
+        .where(~exists(_existing_question.select())),
+    )
+    .on_conflict_do_nothing()
+    .returning(_questions.c.uid, _questions.c.creator_id)
+    .cte("new_question")
+)
+_question = union_all(
+    select(_existing_question.c.uid, _existing_question.c.creator_id, false().label("created")),
+    select(_new_question.c.uid, _new_question.c.creator_id, true()),
+).cte("question")
+
+_existing_answer = (
+    select(_answers.c.uid, _answers.c.creator_id)
+    .join(_question, _answers.c.question_uid == _question.c.uid)
+    .where(_answers.c.answer == _answer, _answers.c.extra_answer == _extra_answer, _answers.c.is_correct == _is_correct)
+    .cte("existing_answer")
+)
+_new_answer = (
+    postgresql.insert(_answers)
+    .from_select(
+        ["uid", "creator_id", "question_uid", "answer", "extra_answer", "is_correct"],
+        select(bindparam("answer_uid", type_=Uuid), _user.c.uid, _question.c.uid, _answer, _extra_answer, _is_correct)
+        .join(_question, true())
+        .where(~exists(_existing_answer.select())),
+    )
+    .on_conflict_do_nothing()
+    .returning(_answers.c.uid, _answers.c.creator_id, _answers.c.question_uid)
+    .cte("new_answer")
+)
+_submitted_answer = union_all(
+    select(_existing_answer.c.uid, _existing_answer.c.creator_id, false().label("created")),
+    select(_new_answer.c.uid, _new_answer.c.creator_id, true()),
+).cte("submitted_answer")
+
+_count = postgresql.insert(_statistics).from_select(
+    ["question_uid", "answer", "extra_answer", "correct_count", "incorrect_count"],
+    select(
+        _new_answer.c.question_uid,
+        _answer,
+        _extra_answer,
+        bindparam("correct_count", type_=Integer),
+        bindparam("incorrect_count", type_=Integer),
+    ),
+)
+_counted = (
+    _count.on_conflict_do_update(
+        index_elements=[_statistics.c.question_uid, _statistics.c.answer, _statistics.c.extra_answer],
+        set_={
+            "correct_count": _statistics.c.correct_count + _count.excluded.correct_count,
+            "incorrect_count": _statistics.c.incorrect_count + _count.excluded.incorrect_count,
+        },
+    )
+    .returning(_statistics.c.question_uid)
+    .cte("counted")
+)
+
+_SUBMIT: Final = (
+    select(
+        _user.c.uid.label("user_uid"),
+        _user.c.created.label("user_created"),
+        _root.c.text.label("question_text"),
+        _question.c.uid.label("question_uid"),
+        _question.c.creator_id.label("question_creator"),
+        _question.c.created.label("question_created"),
+        _submitted_answer.c.uid.label("answer_uid"),
+        _submitted_answer.c.creator_id.label("answer_creator"),
+        _submitted_answer.c.created.label("answer_created"),
+        # data-modifying CTEs are only rendered when referenced
+        select(func.count()).select_from(_counted).scalar_subquery().label("counted"),
+    )
+    .select_from(_user)
+    .join(_root, true())
+    .join(_question, true())
+    .join(_submitted_answer, true())
+)
+
+
+async def submit(
+    session: AsyncSession,
+    submission: Submission,
+    user_services: SQLAlchemyUserRepository,
+    question_services: SQLAlchemyQuestionRepository,
+) -> SubmissionResult | None:
+    options, extra_options = sorted(submission.options), sorted(submission.extra_options)
+    answer = canonical_answer(submission.question_type, submission.answer)
+    extra_answer = canonical_answer(submission.question_type, submission.extra_answer)
+    async with session.begin_nested() as savepoint:
+        row = (
+            await session.execute(
+                _SUBMIT,
+                {
+                    "foreign_id": submission.foreign_id,
+                    "user_uid": new_uid(),
+                    "question_type": str(submission.question_type),
+                    "text": submission.question_text,
+                    "normalized_text": question_services.normalizer(submission.question_text),
+                    "root_uid": new_uid(),
+                    "options": options,
+                    "extra_options": extra_options,
+                    "question_uid": new_uid(),
+                    "answer": answer,
+                    "extra_answer": extra_answer,
+                    "is_correct": submission.is_correct,
+                    "answer_uid": new_uid(),
+                    "correct_count": int(submission.is_correct),
+                    "incorrect_count": int(not submission.is_correct),
+                },
+            )
+        ).first()
+        # a row committed concurrently after the statement snapshot is neither inserted nor selected; earlier steps
+        # may have inserted rows already, they are rolled back so the fallback starts from a clean state
+        if row is None:
+            await savepoint.rollback()
+            return None
+    result = SubmissionResult(
+        user=User(uid=row.user_uid, foreign_id=submission.foreign_id),
+        question=Question(
+            uid=row.question_uid,
+            creator=row.question_creator,
+            question_type=submission.question_type,
+            text=row.question_text,
+            options=set(options),
+            extra_options=set(extra_options),
+        ),
+        answer=Answer(
+            uid=row.answer_uid,
+            creator=row.answer_creator,
+            question_uid=row.question_uid,
+            answer=answer,
+            extra_answer=extra_answer,
+            is_correct=submission.is_correct,
+        ),
+        user_created=row.user_created,
+        question_created=row.question_created,
+        answer_created=row.answer_created,
+    )
+    # existing rows are added to the filters too, they may have been written by a process the filters never saw
+    user_digest = key_digest(submission.foreign_id)
+    if user_services.lookup_filters is not None:
+        user_services.lookup_filters.users.add_digest(user_digest)
+    if result.user_created:
+        user_services.changes.append(Change(kind=ChangeKinds.USER, uid=result.user.uid, key=user_digest.hex()))
+    question_digest = key_digest(
+        question_services.fingerprint(
+            submission.question_type, submission.question_text, submission.options, submission.extra_options
+        )
+    )
+    if question_services.lookup_filters is not None:
+        question_services.lookup_filters.questions.add_digest(question_digest)
+    if result.question_created:
+        question_services.changes.append(
+            Change(kind=ChangeKinds.QUESTION, uid=result.question.uid, key=question_digest.hex())
+        )
+    if result.answer_created:
+        question_services.changes.append(Change(kind=ChangeKinds.ANSWER, uid=result.answer.uid))
+    return result
@@ -1,6 +1,7 @@
-from uuid import UUID, uuid4
+from typing import Final
+from uuid import UUID
 
-from sqlalchemy import select
+from sqlalchemy import bindparam, select
 from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
 
@@ -8,31 +9,102 @@ from kittens_answers_core.errors import (
     UserAlreadyExistError,
     UserDoesNotExistError,
 )
-from kittens_answers_core.models import User
-from kittens_answers_core.models.db_models import DBUser
+from kittens_answers_core.filters.bloom import key_digest
+from kittens_answers_core.filters.lookup import LookupFilters
+from kittens_answers_core.identifiers import new_uid
+from kittens_answers_core.models import DEFAULT_PAGE_LIMIT, Change, ChangeKinds, User, UserReputation
+from kittens_answers_core.models.db_models import DBUser, DBUserReputation
 from kittens_answers_core.repositories.base.user import BaseUserRepository
+from kittens_answers_core.repositories.db.dialect import insert
+
+_BY_FOREIGN_ID: Final = select(DBUser).where(DBUser.foreign_id == bindparam("foreign_id"))
+_BY_UID: Final = select(DBUser).where(DBUser.uid == bindparam("uid"))
+_MANY_BY_UID: Final = select(DBUser).where(DBUser.uid.in_(bindparam("uids", expanding=True)))
+_REPUTATIONS: Final = (
+    select(DBUserReputation)
+    .where(DBUserReputation.user_uid.in_(bindparam("user_uids", expanding=True)))
+    .execution_options(populate_existing=True)
+)
 
 
 class SQLAlchemyUserRepository(BaseUserRepository):
     session: AsyncSession
 
+    def __init__(self, lookup_filters: LookupFilters | None = None) -> None:
+        self.lookup_filters = lookup_filters
+
     async def get_by_foreign_id(self, foreign_id: str) -> User:
-        user = await self.session.scalar(select(DBUser).where(DBUser.foreign_id == foreign_id))
+        if self.lookup_filters is not None and not self.lookup_filters.may_have_user(foreign_id):
+            raise UserDoesNotExistError
+        user = await self.session.scalar(_BY_FOREIGN_ID, {"foreign_id": foreign_id})
         if user is None:
             raise UserDoesNotExistError
         return User(uid=user.uid, foreign_id=user.foreign_id)
 
     async def get_by_uid(self, uid: UUID) -> User:
-        user = await self.session.scalar(select(DBUser).where(DBUser.uid == uid))
+        user = await self.session.scalar(_BY_UID, {"uid": uid})
         if user is None:
             raise UserDoesNotExistError
         return User(uid=user.uid, foreign_id=user.foreign_id)
 
+    async def get_many_by_uid(self, uids: list[UUID]) -> list[User]:
+        users = await self.session.scalars(_MANY_BY_UID, {"uids": uids})
+        return [User(uid=user.uid, foreign_id=user.foreign_id) for user in users]
+
+    async def save_references(self, users: list[User]) -> None:
+        if not users:
+            return
+        await self.session.execute(
+            insert(self.session, DBUser)
+            .values([{"uid": user.uid, "foreign_id": user.foreign_id} for user in users])
+            .on_conflict_do_nothing()
+        )
+        for user in users:
+            self._remember(key_digest(user.foreign_id))
+
     async def create(self, foreign_id: str) -> User:
-        user = DBUser(foreign_id=foreign_id, uid=uuid4())
-        self.session.add(user)
+        user = DBUser(foreign_id=foreign_id, uid=new_uid())
+        digest = key_digest(foreign_id)
         try:
-            await self.session.flush()
+            async with self.session.begin_nested():
+                self.session.add(user)
         except IntegrityError as error:
+            # the conflict proves the user exists, so the filter lets the following re-read reach the database
+            self._remember(digest)
             raise UserAlreadyExistError from error
+        self._remember(digest)
+        self.changes.append(Change(kind=ChangeKinds.USER, uid=user.uid, key=digest.hex()))
         return User(uid=user.uid, foreign_id=user.foreign_id)
+
+    def _remember(self, digest: bytes) -> None:
+        if self.lookup_filters is not None:
+            self.lookup_filters.users.add_digest(digest)
+
+    async def scan(self, after: UUID | None = None, *, limit: int = DEFAULT_PAGE_LIMIT) -> list[User]:
+        statement = select(DBUser).order_by(DBUser.uid).limit(limit)
+        if after is not None:
+            statement = statement.where(DBUser.uid > after)
+        return [User(uid=user.uid, foreign_id=user.foreign_id) for user in await self.session.scalars(statement)]
+
+    async def get_reputations(self, user_uids: list[UUID]) -> list[UserReputation]:
+        reputations = await self.session.scalars(_REPUTATIONS, {"user_uids": user_uids})
+        return [
+            UserReputation(user_uid=reputation.user_uid, agreed=reputation.agreed, total=reputation.total)
+            for reputation in reputations
+        ]
+
+    async def save_reputations(self, reputations: list[UserReputation]) -> None:
+        if not reputations:
+            return
+        statement = insert(self.session, DBUserReputation).values(
+            [
+                {"user_uid": reputation.user_uid, "agreed": reputation.agreed, "total": reputation.total}
+                for reputation in reputations
+            ]
+        )
+        await self.session.execute(
+            statement.on_conflict_do_update(
+                index_elements=[DBUserReputation.user_uid],
+                set_={"agreed": statement.excluded.agreed, "total": statement.excluded.total},
+            )
+        )
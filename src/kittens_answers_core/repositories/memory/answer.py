@@ -1,28 +1,96 @@
+from bisect import bisect_right, insort
+from collections import defaultdict
+from itertools import islice
+from operator import attrgetter, itemgetter
 from uuid import UUID
 
 from kittens_answers_core.errors import (
     AnswerAlreadyExistError,
     AnswerDoesNotExistError,
+    QuestionDoesNotExistError,
+)
+from kittens_answers_core.identifiers import UUID7_VERSION
+from kittens_answers_core.models import (
+    DEFAULT_PAGE_LIMIT,
+    Answer,
+    AnswerStatistic,
+    AnswerSubmission,
+    AnswerSubmissionResult,
+    Change,
+    ChangeKinds,
+    QuestionConsensus,
+    Reclaimed,
+    canonical_answer,
 )
-from kittens_answers_core.models import Answer
 from kittens_answers_core.repositories.base.answer import BaseAnswerRepository
 from kittens_answers_core.repositories.memory.backup_mixin import MemoryBackUpMixin
+from kittens_answers_core.repositories.memory.question import MemoryQuestionServices
+
+_uid_key = attrgetter("uid")
+Variant = tuple[tuple[str, ...], tuple[str, ...]]
 
 
 class MemoryAnswerServices(BaseAnswerRepository, MemoryBackUpMixin[Answer]):
-    def __init__(self, data: list[Answer]) -> None:
+    def __init__(self, data: list[Answer], question_services: MemoryQuestionServices) -> None:
+        self.question_services = question_services
+        self._consensus: dict[UUID, QuestionConsensus] = {}
+        self._consensus_backup: dict[UUID, QuestionConsensus] = {}
+        # list_since positions, kept parallel to data so they survive compaction
+        self._seqs: list[int] = []
+        self._last_seq = 0
+        self._seqs_backup: tuple[list[int], int] = ([], 0)
         super().__init__(Answer, "answer", data)
 
+    def make_backup(self) -> None:
+        super().make_backup()
+        self._consensus_backup = dict(self._consensus)
+        self._seqs_backup = (list(self._seqs), self._last_seq)
+
+    def rollback_backup(self) -> None:
+        seqs, self._last_seq = self._seqs_backup
+        self._seqs = list(seqs)
+        super().rollback_backup()
+        self._consensus = dict(self._consensus_backup)
+
+    def _replace(self, entries: list[tuple[int, Answer]]) -> None:
+        self._seqs = [seq for seq, _ in entries]
+        self.data = [_answer for _, _answer in entries]
+        self.rebuild_indexes()
+
+    def rebuild_indexes(self) -> None:
+        while len(self._seqs) < len(self.data):
+            self._last_seq += 1
+            self._seqs.append(self._last_seq)
+        self._by_question: defaultdict[UUID, list[Answer]] = defaultdict(list)
+        self._by_creator: defaultdict[UUID, list[Answer]] = defaultdict(list)
+        for _answer in sorted(self.data, key=_uid_key):
+            self._by_question[_answer.question_uid].append(_answer)
+            self._by_creator[_answer.creator].append(_answer)
+        self._statistics: defaultdict[UUID, dict[Variant, AnswerStatistic]] = defaultdict(dict)
+        for _answer in self.data:
+            self._count(_answer)
+
+    def _count(self, answer: Answer) -> None:
+        variants = self._statistics[answer.question_uid]
+        variant = (tuple(answer.answer), tuple(answer.extra_answer))
+        if (statistic := variants.get(variant)) is None:
+            statistic = variants[variant] = AnswerStatistic(
+                question_uid=answer.question_uid, answer=answer.answer, extra_answer=answer.extra_answer
+            )
+        if answer.is_correct:
+            statistic.correct_count += 1
+        else:
+            statistic.incorrect_count += 1
+
     async def create(
         self, answer: list[str], extra_answer: list[str], question_uid: UUID, creator_id: UUID, *, is_correct: bool
     ) -> Answer:
-        for _answer in self.data:
-            if (
-                _answer.answer == answer
-                and _answer.extra_answer == extra_answer
-                and _answer.question_uid == question_uid
-                and _answer.is_correct == is_correct
-            ):
+        self.ensure_writable()
+        question = self.question_services.lookup(question_uid)
+        answer = canonical_answer(question.question_type, answer)
+        extra_answer = canonical_answer(question.question_type, extra_answer)
+        for _answer in self._by_question.get(question_uid, []):
+            if _answer.answer == answer and _answer.extra_answer == extra_answer and _answer.is_correct == is_correct:
                 raise AnswerAlreadyExistError
         _answer = Answer(
             creator=creator_id,
@@ -32,21 +100,168 @@ class MemoryAnswerServices(BaseAnswerRepository, MemoryBackUpMixin[Answer]):
             is_correct=is_correct,
         )
         self.data.append(_answer)
+        self._last_seq += 1
+        self._seqs.append(self._last_seq)
+        self.changes.append(Change(kind=ChangeKinds.ANSWER, uid=_answer.uid))
+        insort(self._by_question[question_uid], _answer, key=_uid_key)
+        insort(self._by_creator[creator_id], _answer, key=_uid_key)
+        self._count(_answer)
         return _answer
 
-    async def get(self, answer: list[str], extra_answer: list[str], question_uid: UUID, *, is_correct: bool) -> Answer:
-        for _answer in self.data:
-            if (
-                _answer.answer == answer
-                and _answer.extra_answer == extra_answer
-                and _answer.question_uid == question_uid
-                and _answer.is_correct == is_correct
-            ):
+    async def create_many(self, submissions: list[AnswerSubmission]) -> list[AnswerSubmissionResult]:
+        self.ensure_writable()
+        for submission in submissions:
+            self.question_services.lookup(submission.question_uid)
+        results = []
+        for submission in submissions:
+            try:
+                answer = await self.create(
+                    answer=submission.answer,
+                    extra_answer=submission.extra_answer,
+                    question_uid=submission.question_uid,
+                    creator_id=submission.creator,
+                    is_correct=submission.is_correct,
+                )
+            except AnswerAlreadyExistError:
+                answer = self._find(
+                    answer=submission.answer,
+                    extra_answer=submission.extra_answer,
+                    question_uid=submission.question_uid,
+                    is_correct=submission.is_correct,
+                )
+                results.append(AnswerSubmissionResult(answer=answer, created=False))
+            else:
+                results.append(AnswerSubmissionResult(answer=answer, created=True))
+        return results
+
+    def _find(self, answer: list[str], extra_answer: list[str], question_uid: UUID, *, is_correct: bool) -> Answer:
+        try:
+            question = self.question_services.lookup(question_uid)
+        except QuestionDoesNotExistError as error:
+            raise AnswerDoesNotExistError from error
+        answer = canonical_answer(question.question_type, answer)
+        extra_answer = canonical_answer(question.question_type, extra_answer)
+        for _answer in self._by_question.get(question_uid, []):
+            if _answer.answer == answer and _answer.extra_answer == extra_answer and _answer.is_correct == is_correct:
                 return _answer
         raise AnswerDoesNotExistError
 
+    async def get(self, answer: list[str], extra_answer: list[str], question_uid: UUID, *, is_correct: bool) -> Answer:
+        _answer = self._find(answer, extra_answer, question_uid, is_correct=is_correct)
+        self.record_hit(_answer.uid)
+        return _answer
+
     async def get_by_uid(self, answer_uid: UUID) -> Answer:
         for _answer in self.data:
             if _answer.uid == answer_uid:
+                self.record_hit(answer_uid)
                 return _answer
         raise AnswerDoesNotExistError
+
+    async def get_many_by_uid(self, answer_uids: list[UUID]) -> list[Answer]:
+        wanted = set(answer_uids)
+        return [_answer for _answer in self.data if _answer.uid in wanted]
+
+    async def list_for_question(
+        self,
+        question_uid: UUID,
+        *,
+        is_correct: bool | None = None,
+        after: UUID | None = None,
+        limit: int = DEFAULT_PAGE_LIMIT,
+    ) -> list[Answer]:
+        answers = self._by_question.get(question_uid, [])
+        start = 0 if after is None else bisect_right(answers, after, key=_uid_key)
+        page = (answers[index] for index in range(start, len(answers)))
+        if is_correct is not None:
+            page = (_answer for _answer in page if _answer.is_correct == is_correct)
+        return list(islice(page, limit))
+
+    async def list_by_creator(
+        self, creator_id: UUID, after: UUID | None = None, *, limit: int = DEFAULT_PAGE_LIMIT
+    ) -> list[Answer]:
+        answers = self._by_creator.get(creator_id, [])
+        start = 0 if after is None else bisect_right(answers, after, key=_uid_key)
+        return answers[start : start + limit]
+
+    async def count_by_creator(self, creator_ids: list[UUID]) -> dict[UUID, int]:
+        return {
+            creator_id: len(self._by_creator[creator_id])
+            for creator_id in creator_ids
+            if creator_id in self._by_creator
+        }
+
+    async def get_statistics(self, question_uid: UUID) -> list[AnswerStatistic]:
+        statistics = sorted(
+            self._statistics.get(question_uid, {}).values(),
+            key=lambda statistic: (
+                statistic.incorrect_count - statistic.correct_count,
+                -statistic.correct_count,
+            ),
+        )
+        return [statistic.model_copy() for statistic in statistics]
+
+    async def rebuild_statistics(self) -> None:
+        self.ensure_writable()
+        self.rebuild_indexes()
+
+    async def list_since(self, watermark: int = 0, *, limit: int = DEFAULT_PAGE_LIMIT) -> tuple[list[Answer], int]:
+        start = bisect_right(self._seqs, watermark)
+        answers = self.data[start : start + limit]
+        return answers, self._seqs[start + len(answers) - 1] if answers else watermark
+
+    async def get_consensus(self, question_uid: UUID) -> QuestionConsensus:
+        if (consensus := self._consensus.get(question_uid)) is None:
+            raise AnswerDoesNotExistError
+        return consensus.model_copy()
+
+    async def save_consensus(self, consensus: list[QuestionConsensus]) -> None:
+        self.ensure_writable()
+        for question_consensus in consensus:
+            self._consensus[question_consensus.question_uid] = question_consensus.model_copy()
+
+    async def merge_duplicates(self) -> int:
+        self.ensure_writable()
+        kept: dict[tuple[UUID, tuple[str, ...], tuple[str, ...], bool], tuple[int, Answer]] = {}
+        for seq, _answer in zip(self._seqs, self.data, strict=True):
+            question = self.question_services.lookup(_answer.question_uid)
+            answer = canonical_answer(question.question_type, _answer.answer)
+            extra_answer = canonical_answer(question.question_type, _answer.extra_answer)
+            canonical = (_answer.question_uid, tuple(answer), tuple(extra_answer), _answer.is_correct)
+            if canonical not in kept or (answer, extra_answer) == (_answer.answer, _answer.extra_answer):
+                kept[canonical] = (seq, _answer.model_copy(update={"answer": answer, "extra_answer": extra_answer}))
+        duplicates = len(self.data) - len(kept)
+        self._replace(sorted(kept.values(), key=itemgetter(0)))
+        return duplicates
+
+    async def delete_superseded(self, before: UUID, *, limit: int) -> Reclaimed:
+        self.ensure_writable()
+        seqs = {_answer.uid: seq for seq, _answer in zip(self._seqs, self.data, strict=True)}
+        superseded: set[UUID] = set()
+        for answers in self._by_question.values():
+            # only uuid7 uids carry their creation time, "later" is the insertion order
+            latest_correct = max((seqs[_answer.uid] for _answer in answers if _answer.is_correct), default=None)
+            if latest_correct is not None:
+                superseded.update(
+                    _answer.uid
+                    for _answer in answers
+                    if not _answer.is_correct
+                    and _answer.uid.version == UUID7_VERSION
+                    and _answer.uid < before
+                    and seqs[_answer.uid] < latest_correct
+                )
+        superseded = set(sorted(superseded)[:limit])
+        reclaimed = Reclaimed()
+        entries = []
+        for seq, _answer in zip(self._seqs, self.data, strict=True):
+            if _answer.uid in superseded:
+                reclaimed.rows += 1
+                reclaimed.bytes += len(_answer.model_dump_json())
+            else:
+                entries.append((seq, _answer))
+        if reclaimed.rows:
+            self._replace(entries)
+        return reclaimed
+
+    def is_answered(self, question_uid: UUID) -> bool:
+        return bool(self._by_question.get(question_uid))
@@ -1,5 +1,9 @@
-from typing import Generic, TypeVar
+from collections import deque
+from copy import copy
+from typing import Generic, Self, TypeVar
 
+from kittens_answers_core.errors import ReadOnlyError
+from kittens_answers_core.metrics.profiling import RepositoryFootprint, footprint
 from kittens_answers_core.models import Answer, Question, User
 
 TModel = TypeVar("TModel", User, Question, Answer)
@@ -11,6 +15,9 @@ class MemoryBackUpMixin(Generic[TModel]):
         self.data: list[TModel] = data
         self._backup: list[str] = []
         self._name = name
+        self.read_only = False
+        self._view: Self | None = None
+        self.rebuild_indexes()
 
     @property
     def backup(self) -> list[TModel]:
@@ -22,6 +29,38 @@ class MemoryBackUpMixin(Generic[TModel]):
 
     def make_backup(self) -> None:
         self.backup = self.data
+        self._view = None
 
     def rollback_backup(self) -> None:
         self.data = self.backup
+        self.rebuild_indexes()
+
+    def rebuild_indexes(self) -> None:
+        ...
+
+    def footprint(self) -> RepositoryFootprint:
+        containers = {
+            name: value
+            for name, value in vars(self).items()
+            if isinstance(value, dict | list | set | tuple | deque) and name not in ("data", "changes")
+        }
+        # everything that is not data or a backup is an index or a side table like reputations
+        return footprint(
+            self._name,
+            self.data,
+            [value for name, value in containers.items() if name.endswith("_backup")],
+            [value for name, value in containers.items() if not name.endswith("_backup")],
+        )
+
+    def read_view(self) -> Self:
+        # readers get their own containers rebuilt from the last backup, so they only see committed rows
+        if self._view is None:
+            view = copy(self)
+            view.read_only = True
+            view.rollback_backup()
+            self._view = view
+        return self._view
+
+    def ensure_writable(self) -> None:
+        if self.read_only:
+            raise ReadOnlyError
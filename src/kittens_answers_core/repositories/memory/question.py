@@ -1,20 +1,82 @@
+from bisect import bisect_right, insort
+from collections import Counter, defaultdict
+from collections.abc import Callable
+from operator import attrgetter
 from uuid import UUID
 
 from kittens_answers_core.errors import (
     QuestionAlreadyExistError,
     QuestionDoesNotExistError,
 )
-from kittens_answers_core.models import Question, QuestionTypes
+from kittens_answers_core.filters.bloom import key_digest
+from kittens_answers_core.identifiers import UUID7_VERSION
+from kittens_answers_core.models import (
+    DEFAULT_PAGE_LIMIT,
+    DEFAULT_SEARCH_LIMIT,
+    Change,
+    ChangeKinds,
+    Question,
+    QuestionMatch,
+    QuestionTypes,
+    Reclaimed,
+)
+from kittens_answers_core.normalization import SIMILARITY_THRESHOLD, TextNormalizer, trigrams
 from kittens_answers_core.repositories.base.question import (
     BaseQuestionRepository,
 )
 from kittens_answers_core.repositories.memory.backup_mixin import MemoryBackUpMixin
 
+_uid_key = attrgetter("uid")
+RootKey = tuple[QuestionTypes, str]
+QuestionKey = tuple[QuestionTypes, str, frozenset[str], frozenset[str]]
+
 
 class MemoryQuestionServices(BaseQuestionRepository, MemoryBackUpMixin[Question]):
-    def __init__(self, data: list[Question]) -> None:
+    def __init__(self, data: list[Question], normalizer: TextNormalizer | None = None) -> None:
+        self.normalizer = normalizer or TextNormalizer()
+        self.is_answered: Callable[[UUID], bool] = lambda _: False
+        # roots outlive their last variant until they are compacted, like root_questions rows
+        self._roots: dict[RootKey, str] = {}
+        self._roots_backup: dict[RootKey, str] = {}
         super().__init__(Question, "question", data)
 
+    def make_backup(self) -> None:
+        super().make_backup()
+        self._roots_backup = dict(self._roots)
+
+    def rollback_backup(self) -> None:
+        self._roots = dict(self._roots_backup)
+        super().rollback_backup()
+
+    def rebuild_indexes(self) -> None:
+        self._by_uid: dict[UUID, Question] = {}
+        self._by_key: dict[QuestionKey, Question] = {}
+        self._root_questions: defaultdict[RootKey, list[Question]] = defaultdict(list)
+        self._root_trigrams: dict[RootKey, frozenset[str]] = {}
+        self._trigram_index: defaultdict[str, set[RootKey]] = defaultdict(set)
+        self._by_creator: defaultdict[UUID, list[Question]] = defaultdict(list)
+        for question in self.data:
+            self._index(question)
+
+    def _index(self, question: Question) -> None:
+        root_key = (question.question_type, self.normalizer(question.text))
+        self._by_uid[question.uid] = question
+        self._by_key[
+            self._key(question.question_type, question.text, question.options, question.extra_options)
+        ] = question
+        self._roots.setdefault(root_key, question.text)
+        self._root_questions[root_key].append(question)
+        insort(self._by_creator[question.creator], question, key=_uid_key)
+        if root_key not in self._root_trigrams:
+            self._root_trigrams[root_key] = trigrams(root_key[1])
+            for trigram in self._root_trigrams[root_key]:
+                self._trigram_index[trigram].add(root_key)
+
+    def _key(
+        self, question_type: QuestionTypes, question_text: str, options: set[str], extra_options: set[str]
+    ) -> QuestionKey:
+        return (question_type, self.normalizer(question_text), frozenset(options), frozenset(extra_options))
+
     async def create(
         self,
         question_type: QuestionTypes,
@@ -23,39 +85,111 @@ class MemoryQuestionServices(BaseQuestionRepository, MemoryBackUpMixin[Question]
         extra_options: set[str],
         creator_id: UUID,
     ) -> Question:
-        for question in self.data:
-            if (
-                question.question_type == question_type
-                and question.text == question_text
-                and question.options == options
-                and question.extra_options == extra_options
-            ):
-                raise QuestionAlreadyExistError
+        self.ensure_writable()
+        if self._key(question_type, question_text, options, extra_options) in self._by_key:
+            raise QuestionAlreadyExistError
         question = Question(
             creator=creator_id,
             question_type=question_type,
-            text=question_text,
+            text=self._roots.get((question_type, self.normalizer(question_text)), question_text),
             options=options,
             extra_options=extra_options,
         )
         self.data.append(question)
+        self._index(question)
+        self.changes.append(
+            Change(
+                kind=ChangeKinds.QUESTION,
+                uid=question.uid,
+                key=key_digest(self.fingerprint(question_type, question_text, options, extra_options)).hex(),
+            )
+        )
+        return question
+
+    def lookup(self, uid: UUID) -> Question:
+        if (question := self._by_uid.get(uid)) is None:
+            raise QuestionDoesNotExistError
         return question
 
     async def get_by_uid(self, uid: UUID) -> Question:
-        for question in self.data:
-            if question.uid == uid:
-                return question
-        raise QuestionDoesNotExistError
+        question = self.lookup(uid)
+        self.record_hit(uid)
+        return question
+
+    async def get_many_by_uid(self, uids: list[UUID]) -> list[Question]:
+        return [self._by_uid[uid] for uid in dict.fromkeys(uids) if uid in self._by_uid]
 
     async def get(
         self, question_type: QuestionTypes, question_text: str, options: set[str], extra_options: set[str]
     ) -> Question:
+        if (question := self._by_key.get(self._key(question_type, question_text, options, extra_options))) is None:
+            raise QuestionDoesNotExistError
+        self.record_hit(question.uid)
+        return question
+
+    async def scan(self, after: UUID | None = None, *, limit: int = DEFAULT_PAGE_LIMIT) -> list[Question]:
+        questions = sorted(self.data, key=lambda question: question.uid)
+        if after is not None:
+            questions = [question for question in questions if question.uid > after]
+        return questions[:limit]
+
+    async def list_by_creator(
+        self, creator_id: UUID, after: UUID | None = None, *, limit: int = DEFAULT_PAGE_LIMIT
+    ) -> list[Question]:
+        questions = self._by_creator.get(creator_id, [])
+        start = 0 if after is None else bisect_right(questions, after, key=_uid_key)
+        return questions[start : start + limit]
+
+    async def count_by_creator(self, creator_ids: list[UUID]) -> dict[UUID, int]:
+        return {
+            creator_id: len(self._by_creator[creator_id])
+            for creator_id in creator_ids
+            if creator_id in self._by_creator
+        }
+
+    async def delete_unanswered(self, before: UUID, *, limit: int) -> Reclaimed:
+        self.ensure_writable()
+        unanswered = sorted(
+            question.uid
+            for question in self.data
+            if question.uid.version == UUID7_VERSION and question.uid < before and not self.is_answered(question.uid)
+        )
+        deleted = set(unanswered[:limit])
+        reclaimed = Reclaimed()
         for question in self.data:
-            if (
-                question.question_type == question_type
-                and question.text == question_text
-                and question.options == options
-                and question.extra_options == extra_options
-            ):
-                return question
-        raise QuestionDoesNotExistError
+            if question.uid in deleted:
+                reclaimed.rows += 1
+                reclaimed.bytes += len(question.model_dump_json())
+        if reclaimed.rows:
+            self.data = [question for question in self.data if question.uid not in deleted]
+            self.rebuild_indexes()
+        return reclaimed
+
+    async def delete_orphaned_roots(self, *, limit: int) -> Reclaimed:
+        self.ensure_writable()
+        reclaimed = Reclaimed()
+        for root_key in [root_key for root_key in self._roots if not self._root_questions.get(root_key)][:limit]:
+            text = self._roots.pop(root_key)
+            reclaimed.rows += 1
+            reclaimed.bytes += len(root_key[0]) + len(root_key[1].encode()) + len(text.encode())
+        return reclaimed
+
+    async def search(
+        self, text: str, question_type: QuestionTypes | None = None, *, limit: int = DEFAULT_SEARCH_LIMIT
+    ) -> list[QuestionMatch]:
+        text_trigrams = trigrams(self.normalizer(text))
+        shared: Counter[RootKey] = Counter()
+        for trigram in text_trigrams:
+            shared.update(self._trigram_index.get(trigram, ()))
+        scores = []
+        for root_key, count in shared.items():
+            score = count / (len(text_trigrams) + len(self._root_trigrams[root_key]) - count)
+            if score >= SIMILARITY_THRESHOLD and question_type in (None, root_key[0]):
+                scores.append((score, root_key))
+        scores.sort(key=lambda match: match[0], reverse=True)
+        matches = [
+            QuestionMatch(question=question, score=score)
+            for score, root_key in scores[:limit]
+            for question in sorted(self._root_questions[root_key], key=lambda question: question.uid)
+        ]
+        return matches[:limit]
@@ -1,34 +1,69 @@
-from uuid import UUID, uuid4
+from uuid import UUID
 
 from kittens_answers_core.errors import (
     UserAlreadyExistError,
     UserDoesNotExistError,
 )
-from kittens_answers_core.models import User
+from kittens_answers_core.filters.bloom import key_digest
+from kittens_answers_core.identifiers import new_uid
+from kittens_answers_core.models import DEFAULT_PAGE_LIMIT, Change, ChangeKinds, User, UserReputation
 from kittens_answers_core.repositories.base.user import BaseUserRepository
 from kittens_answers_core.repositories.memory.backup_mixin import MemoryBackUpMixin
 
 
 class MemoryUserServices(BaseUserRepository, MemoryBackUpMixin[User]):
     def __init__(self, data: list[User]) -> None:
+        self._reputations: dict[UUID, UserReputation] = {}
+        self._reputations_backup: dict[UUID, UserReputation] = {}
         super().__init__(User, "user", data)
 
+    def make_backup(self) -> None:
+        super().make_backup()
+        self._reputations_backup = dict(self._reputations)
+
+    def rollback_backup(self) -> None:
+        super().rollback_backup()
+        self._reputations = dict(self._reputations_backup)
+
+    def rebuild_indexes(self) -> None:
+        self._by_uid = {user.uid: user for user in self.data}
+        self._by_foreign_id = {user.foreign_id: user for user in self.data}
+
     async def get_by_foreign_id(self, foreign_id: str) -> User:
-        for user in self.data:
-            if user.foreign_id == foreign_id:
-                return user
-        raise UserDoesNotExistError
+        if (user := self._by_foreign_id.get(foreign_id)) is None:
+            raise UserDoesNotExistError
+        return user
 
     async def get_by_uid(self, uid: UUID) -> User:
-        for user in self.data:
-            if user.uid == uid:
-                return user
-        raise UserDoesNotExistError
+        if (user := self._by_uid.get(uid)) is None:
+            raise UserDoesNotExistError
+        return user
+
+    async def get_many_by_uid(self, uids: list[UUID]) -> list[User]:
+        wanted = set(uids)
+        return [user for user in self.data if user.uid in wanted]
 
     async def create(self, foreign_id: str) -> User:
-        for user in self.data:
-            if user.foreign_id == foreign_id:
-                raise UserAlreadyExistError
-        user = User(uid=uuid4(), foreign_id=foreign_id)
+        self.ensure_writable()
+        if foreign_id in self._by_foreign_id:
+            raise UserAlreadyExistError
+        user = User(uid=new_uid(), foreign_id=foreign_id)
         self.data.append(user)
+        self._by_uid[user.uid] = user
+        self._by_foreign_id[foreign_id] = user
+        self.changes.append(Change(kind=ChangeKinds.USER, uid=user.uid, key=key_digest(foreign_id).hex()))
         return user
+
+    async def scan(self, after: UUID | None = None, *, limit: int = DEFAULT_PAGE_LIMIT) -> list[User]:
+        users = sorted(self.data, key=lambda user: user.uid)
+        if after is not None:
+            users = [user for user in users if user.uid > after]
+        return users[:limit]
+
+    async def get_reputations(self, user_uids: list[UUID]) -> list[UserReputation]:
+        return [self._reputations[user_uid].model_copy() for user_uid in user_uids if user_uid in self._reputations]
+
+    async def save_reputations(self, reputations: list[UserReputation]) -> None:
+        self.ensure_writable()
+        for reputation in reputations:
+            self._reputations[reputation.user_uid] = reputation.model_copy()
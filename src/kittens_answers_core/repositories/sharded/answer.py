@@ -0,0 +1,179 @@
+from collections import Counter, defaultdict
+from typing import Final
+from uuid import UUID
+
+from kittens_answers_core.errors import AnswerDoesNotExistError, QuestionDoesNotExistError
+from kittens_answers_core.models import (
+    DEFAULT_PAGE_LIMIT,
+    Answer,
+    AnswerStatistic,
+    AnswerSubmission,
+    AnswerSubmissionResult,
+    QuestionConsensus,
+    Reclaimed,
+)
+from kittens_answers_core.repositories.base.answer import BaseAnswerRepository
+from kittens_answers_core.repositories.sharded.router import ShardRouter
+
+WATERMARK_BITS: Final[int] = 64
+WATERMARK_MASK: Final[int] = (1 << WATERMARK_BITS) - 1
+
+
+class ShardedAnswerRepository(BaseAnswerRepository):
+    def __init__(self, router: ShardRouter) -> None:
+        self.router = router
+
+    async def _locate(self, question_uid: UUID) -> int | None:
+        return (await self.router.locate_questions([question_uid])).get(question_uid)
+
+    async def create(
+        self, answer: list[str], extra_answer: list[str], question_uid: UUID, creator_id: UUID, *, is_correct: bool
+    ) -> Answer:
+        if (index := await self._locate(question_uid)) is None:
+            raise QuestionDoesNotExistError
+        await self.router.reference_users({index: {creator_id}})
+        return await self.router.run(
+            index,
+            self.router.shards[index].answer_services.create(
+                answer, extra_answer, question_uid, creator_id, is_correct=is_correct
+            ),
+        )
+
+    async def create_many(self, submissions: list[AnswerSubmission]) -> list[AnswerSubmissionResult]:
+        routes = await self.router.locate_questions({submission.question_uid for submission in submissions})
+        groups: defaultdict[int, list[int]] = defaultdict(list)
+        for position, submission in enumerate(submissions):
+            if (index := routes.get(submission.question_uid)) is None:
+                raise QuestionDoesNotExistError
+            groups[index].append(position)
+        await self.router.reference_users(
+            {index: {submissions[position].creator for position in positions} for index, positions in groups.items()}
+        )
+        found = await self.router.each(
+            {
+                index: self.router.shards[index].answer_services.create_many(
+                    [submissions[position] for position in positions]
+                )
+                for index, positions in groups.items()
+            }
+        )
+        results: dict[int, AnswerSubmissionResult] = {}
+        for index, positions in groups.items():
+            results.update(zip(positions, found[index], strict=True))
+        return [results[position] for position in range(len(submissions))]
+
+    async def get(self, answer: list[str], extra_answer: list[str], question_uid: UUID, *, is_correct: bool) -> Answer:
+        if (index := await self._locate(question_uid)) is None:
+            raise AnswerDoesNotExistError
+        return await self.router.shards[index].answer_services.get(
+            answer, extra_answer, question_uid, is_correct=is_correct
+        )
+
+    async def get_by_uid(self, answer_uid: UUID) -> Answer:
+        _, answer = await self.router.first(
+            [shard.answer_services.get_by_uid(answer_uid) for shard in self.router.shards], AnswerDoesNotExistError
+        )
+        return answer
+
+    async def get_many_by_uid(self, answer_uids: list[UUID]) -> list[Answer]:
+        found = await self.router.each(
+            {
+                index: shard.answer_services.get_many_by_uid(answer_uids)
+                for index, shard in enumerate(self.router.shards)
+            }
+        )
+        return [answer for answers in found.values() for answer in answers]
+
+    async def list_for_question(
+        self,
+        question_uid: UUID,
+        *,
+        is_correct: bool | None = None,
+        after: UUID | None = None,
+        limit: int = DEFAULT_PAGE_LIMIT,
+    ) -> list[Answer]:
+        if (index := await self._locate(question_uid)) is None:
+            return []
+        return await self.router.shards[index].answer_services.list_for_question(
+            question_uid, is_correct=is_correct, after=after, limit=limit
+        )
+
+    async def list_by_creator(
+        self, creator_id: UUID, after: UUID | None = None, *, limit: int = DEFAULT_PAGE_LIMIT
+    ) -> list[Answer]:
+        found = await self.router.each(
+            {
+                index: shard.answer_services.list_by_creator(creator_id, after, limit=limit)
+                for index, shard in enumerate(self.router.shards)
+            }
+        )
+        answers = [answer for shard_answers in found.values() for answer in shard_answers]
+        return sorted(answers, key=lambda answer: answer.uid)[:limit]
+
+    async def count_by_creator(self, creator_ids: list[UUID]) -> dict[UUID, int]:
+        found = await self.router.each(
+            {
+                index: shard.answer_services.count_by_creator(creator_ids)
+                for index, shard in enumerate(self.router.shards)
+            }
+        )
+        return dict(sum((Counter(counts) for counts in found.values()), Counter()))
+
+    async def get_statistics(self, question_uid: UUID) -> list[AnswerStatistic]:
+        if (index := await self._locate(question_uid)) is None:
+            return []
+        return await self.router.shards[index].answer_services.get_statistics(question_uid)
+
+    async def rebuild_statistics(self) -> None:
+        await self.router.each(
+            {index: shard.answer_services.rebuild_statistics() for index, shard in enumerate(self.router.shards)}
+        )
+
+    async def list_since(self, watermark: int = 0, *, limit: int = DEFAULT_PAGE_LIMIT) -> tuple[list[Answer], int]:
+        share = max(limit // len(self.router.shards), 1)
+        found = await self.router.each(
+            {
+                index: shard.answer_services.list_since(
+                    (watermark >> (WATERMARK_BITS * index)) & WATERMARK_MASK, limit=share
+                )
+                for index, shard in enumerate(self.router.shards)
+            }
+        )
+        answers = [answer for index in sorted(found) for answer in found[index][0]]
+        return answers, sum(found[index][1] << (WATERMARK_BITS * index) for index in found)
+
+    async def get_consensus(self, question_uid: UUID) -> QuestionConsensus:
+        if (index := await self._locate(question_uid)) is None:
+            raise AnswerDoesNotExistError
+        return await self.router.shards[index].answer_services.get_consensus(question_uid)
+
+    async def save_consensus(self, consensus: list[QuestionConsensus]) -> None:
+        routes = await self.router.locate_questions(
+            {question_consensus.question_uid for question_consensus in consensus}
+        )
+        groups: defaultdict[int, list[QuestionConsensus]] = defaultdict(list)
+        for question_consensus in consensus:
+            if (index := routes.get(question_consensus.question_uid)) is None:
+                raise QuestionDoesNotExistError
+            groups[index].append(question_consensus)
+        await self.router.each(
+            {index: self.router.shards[index].answer_services.save_consensus(group) for index, group in groups.items()}
+        )
+
+    async def merge_duplicates(self) -> int:
+        found = await self.router.each(
+            {index: shard.answer_services.merge_duplicates() for index, shard in enumerate(self.router.shards)}
+        )
+        return sum(found.values())
+
+    async def delete_superseded(self, before: UUID, *, limit: int) -> Reclaimed:
+        found = await self.router.each(
+            {
+                index: shard.answer_services.delete_superseded(before, limit=limit)
+                for index, shard in enumerate(self.router.shards)
+            }
+        )
+        return Reclaimed(
+            rows=sum(reclaimed.rows for reclaimed in found.values()),
+            bytes=sum(reclaimed.bytes for reclaimed in found.values()),
+        )
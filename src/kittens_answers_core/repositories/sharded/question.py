@@ -0,0 +1,140 @@
+from collections import Counter
+from uuid import UUID
+
+from kittens_answers_core.errors import QuestionDoesNotExistError
+from kittens_answers_core.models import (
+    DEFAULT_PAGE_LIMIT,
+    DEFAULT_SEARCH_LIMIT,
+    Question,
+    QuestionMatch,
+    QuestionTypes,
+    Reclaimed,
+)
+from kittens_answers_core.normalization import TextNormalizer
+from kittens_answers_core.repositories.base.question import (
+    BaseQuestionRepository,
+)
+from kittens_answers_core.repositories.sharded.router import ShardRouter
+
+
+class ShardedQuestionRepository(BaseQuestionRepository):
+    def __init__(self, router: ShardRouter, normalizer: TextNormalizer | None = None) -> None:
+        self.router = router
+        self.normalizer = normalizer or TextNormalizer()
+
+    def _route(self, question_type: QuestionTypes, question_text: str) -> int:
+        return self.router.for_question(question_type, self.normalizer(question_text))
+
+    async def get_by_uid(self, uid: UUID) -> Question:
+        if (index := self.router.cached_question(uid)) is not None:
+            return await self.router.shards[index].question_services.get_by_uid(uid)
+        index, question = await self.router.first(
+            [shard.question_services.get_by_uid(uid) for shard in self.router.shards], QuestionDoesNotExistError
+        )
+        self.router.remember_question(uid, index)
+        return question
+
+    async def get_many_by_uid(self, uids: list[UUID]) -> list[Question]:
+        found = await self.router.each(
+            {index: shard.question_services.get_many_by_uid(uids) for index, shard in enumerate(self.router.shards)}
+        )
+        questions = []
+        for index, shard_questions in found.items():
+            for question in shard_questions:
+                self.router.remember_question(question.uid, index)
+                questions.append(question)
+        return questions
+
+    async def get(
+        self, question_type: QuestionTypes, question_text: str, options: set[str], extra_options: set[str]
+    ) -> Question:
+        index = self._route(question_type, question_text)
+        return await self.router.shards[index].question_services.get(
+            question_type, question_text, options, extra_options
+        )
+
+    async def create(
+        self,
+        question_type: QuestionTypes,
+        question_text: str,
+        options: set[str],
+        extra_options: set[str],
+        creator_id: UUID,
+    ) -> Question:
+        index = self._route(question_type, question_text)
+        await self.router.reference_users({index: {creator_id}})
+        question = await self.router.run(
+            index,
+            self.router.shards[index].question_services.create(
+                question_type, question_text, options, extra_options, creator_id
+            ),
+        )
+        self.router.remember_question(question.uid, index)
+        return question
+
+    async def scan(self, after: UUID | None = None, *, limit: int = DEFAULT_PAGE_LIMIT) -> list[Question]:
+        found = await self.router.each(
+            {index: shard.question_services.scan(after, limit=limit) for index, shard in enumerate(self.router.shards)}
+        )
+        questions = [question for shard_questions in found.values() for question in shard_questions]
+        return sorted(questions, key=lambda question: question.uid)[:limit]
+
+    async def list_by_creator(
+        self, creator_id: UUID, after: UUID | None = None, *, limit: int = DEFAULT_PAGE_LIMIT
+    ) -> list[Question]:
+        found = await self.router.each(
+            {
+                index: shard.question_services.list_by_creator(creator_id, after, limit=limit)
+                for index, shard in enumerate(self.router.shards)
+            }
+        )
+        for index, shard_questions in found.items():
+            for question in shard_questions:
+                self.router.remember_question(question.uid, index)
+        questions = [question for shard_questions in found.values() for question in shard_questions]
+        return sorted(questions, key=lambda question: question.uid)[:limit]
+
+    async def count_by_creator(self, creator_ids: list[UUID]) -> dict[UUID, int]:
+        found = await self.router.each(
+            {
+                index: shard.question_services.count_by_creator(creator_ids)
+                for index, shard in enumerate(self.router.shards)
+            }
+        )
+        return dict(sum((Counter(counts) for counts in found.values()), Counter()))
+
+    async def search(
+        self, text: str, question_type: QuestionTypes | None = None, *, limit: int = DEFAULT_SEARCH_LIMIT
+    ) -> list[QuestionMatch]:
+        found = await self.router.each(
+            {
+                index: shard.question_services.search(text, question_type, limit=limit)
+                for index, shard in enumerate(self.router.shards)
+            }
+        )
+        matches = [match for shard_matches in found.values() for match in shard_matches]
+        return sorted(matches, key=lambda match: (-match.score, match.question.uid))[:limit]
+
+    async def delete_unanswered(self, before: UUID, *, limit: int) -> Reclaimed:
+        found = await self.router.each(
+            {
+                index: shard.question_services.delete_unanswered(before, limit=limit)
+                for index, shard in enumerate(self.router.shards)
+            }
+        )
+        return Reclaimed(
+            rows=sum(reclaimed.rows for reclaimed in found.values()),
+            bytes=sum(reclaimed.bytes for reclaimed in found.values()),
+        )
+
+    async def delete_orphaned_roots(self, *, limit: int) -> Reclaimed:
+        found = await self.router.each(
+            {
+                index: shard.question_services.delete_orphaned_roots(limit=limit)
+                for index, shard in enumerate(self.router.shards)
+            }
+        )
+        return Reclaimed(
+            rows=sum(reclaimed.rows for reclaimed in found.values()),
+            bytes=sum(reclaimed.bytes for reclaimed in found.values()),
+        )
@@ -0,0 +1,119 @@
+import asyncio
+from collections import defaultdict
+from collections.abc import Awaitable, Collection
+from hashlib import blake2b
+from typing import Final, TypeVar, cast
+from uuid import UUID
+
+from kittens_answers_core.errors import ServiceError
+from kittens_answers_core.models import Change, QuestionTypes, User
+from kittens_answers_core.uow.db import SQLAlchemyUnitOfWork
+
+DEFAULT_ROUTE_CACHE_SIZE: Final[int] = 100_000
+
+TResult = TypeVar("TResult")
+
+
+def shard_index(key: str, shards: int) -> int:
+    return int.from_bytes(blake2b(key.encode(), digest_size=8).digest(), "big") % shards
+
+
+async def _settle(operations: Collection[Awaitable[TResult]]) -> list[TResult]:
+    results = await asyncio.gather(*operations, return_exceptions=True)
+    for result in results:
+        if isinstance(result, BaseException):
+            raise result
+    return cast(list[TResult], results)
+
+
+class ShardRouter:
+    def __init__(self, shards: list[SQLAlchemyUnitOfWork], route_cache_size: int = DEFAULT_ROUTE_CACHE_SIZE) -> None:
+        self.shards = shards
+        self.route_cache_size = route_cache_size
+        self.changes: list[Change] = []
+        self._questions: dict[UUID, int] = {}
+        self._references: set[tuple[int, UUID]] = set()
+        self._pending_references: set[tuple[int, UUID]] = set()
+
+    def for_user(self, foreign_id: str) -> int:
+        return shard_index(foreign_id, len(self.shards))
+
+    def for_reputation(self, user_uid: UUID) -> int:
+        return shard_index(str(user_uid), len(self.shards))
+
+    def for_question(self, question_type: QuestionTypes, normalized_text: str) -> int:
+        return shard_index(f"{question_type}\x1f{normalized_text}", len(self.shards))
+
+    def cached_question(self, uid: UUID) -> int | None:
+        return self._questions.get(uid)
+
+    def remember_question(self, uid: UUID, index: int) -> None:
+        if len(self._questions) >= self.route_cache_size:
+            self._questions.clear()
+        self._questions[uid] = index
+
+    async def run(self, index: int, operation: Awaitable[TResult]) -> TResult:
+        changes = self.shards[index].changes
+        start = len(changes)
+        result = await operation
+        self.changes.extend(changes[start:])
+        return result
+
+    async def each(self, operations: dict[int, Awaitable[TResult]]) -> dict[int, TResult]:
+        results = await _settle([self.run(index, operation) for index, operation in operations.items()])
+        return dict(zip(operations, results, strict=True))
+
+    async def first(self, operations: list[Awaitable[TResult]], missing: type[ServiceError]) -> tuple[int, TResult]:
+        results = await asyncio.gather(*operations, return_exceptions=True)
+        for index, result in enumerate(results):
+            if isinstance(result, missing):
+                continue
+            if isinstance(result, BaseException):
+                raise result
+            return index, result
+        raise missing
+
+    async def locate_questions(self, uids: Collection[UUID]) -> dict[UUID, int]:
+        routes = {uid: index for uid in uids if (index := self._questions.get(uid)) is not None}
+        if missing := [uid for uid in uids if uid not in routes]:
+            found = await self.each(
+                {index: shard.question_services.get_many_by_uid(missing) for index, shard in enumerate(self.shards)}
+            )
+            for index, questions in found.items():
+                for question in questions:
+                    routes[question.uid] = index
+                    self.remember_question(question.uid, index)
+        return routes
+
+    async def reference_users(self, users: dict[int, set[UUID]]) -> None:
+        wanted = {(index, uid) for index, uids in users.items() for uid in uids}
+        wanted -= self._references | self._pending_references
+        if not wanted:
+            return
+        uids = list({uid for _, uid in wanted})
+        found = await self.each(
+            {index: shard.user_services.get_many_by_uid(uids) for index, shard in enumerate(self.shards)}
+        )
+        by_uid = {user.uid: user for shard_users in found.values() for user in shard_users}
+        references: defaultdict[int, list[User]] = defaultdict(list)
+        for index, uid in wanted:
+            if (user := by_uid.get(uid)) is not None:
+                references[index].append(user)
+        await self.each(
+            {
+                index: self.shards[index].user_services.save_references(shard_users)
+                for index, shard_users in references.items()
+            }
+        )
+        self._pending_references.update(
+            (index, user.uid) for index, shard_users in references.items() for user in shard_users
+        )
+
+    def commit(self) -> None:
+        if len(self._references) >= self.route_cache_size:
+            self._references.clear()
+        self._references |= self._pending_references
+        self._pending_references.clear()
+
+    def rollback(self) -> None:
+        self._pending_references.clear()
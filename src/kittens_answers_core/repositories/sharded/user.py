@@ -0,0 +1,58 @@
+from collections import defaultdict
+from uuid import UUID
+
+from kittens_answers_core.errors import UserDoesNotExistError
+from kittens_answers_core.models import DEFAULT_PAGE_LIMIT, User, UserReputation
+from kittens_answers_core.repositories.base.user import BaseUserRepository
+from kittens_answers_core.repositories.sharded.router import ShardRouter
+
+
+class ShardedUserRepository(BaseUserRepository):
+    def __init__(self, router: ShardRouter) -> None:
+        self.router = router
+
+    async def get_by_foreign_id(self, foreign_id: str) -> User:
+        return await self.router.shards[self.router.for_user(foreign_id)].user_services.get_by_foreign_id(foreign_id)
+
+    async def get_by_uid(self, uid: UUID) -> User:
+        _, user = await self.router.first(
+            [shard.user_services.get_by_uid(uid) for shard in self.router.shards], UserDoesNotExistError
+        )
+        return user
+
+    async def get_many_by_uid(self, uids: list[UUID]) -> list[User]:
+        found = await self.router.each(
+            {index: shard.user_services.get_many_by_uid(uids) for index, shard in enumerate(self.router.shards)}
+        )
+        return list({user.uid: user for users in found.values() for user in users}.values())
+
+    async def create(self, foreign_id: str) -> User:
+        index = self.router.for_user(foreign_id)
+        return await self.router.run(index, self.router.shards[index].user_services.create(foreign_id))
+
+    async def scan(self, after: UUID | None = None, *, limit: int = DEFAULT_PAGE_LIMIT) -> list[User]:
+        found = await self.router.each(
+            {index: shard.user_services.scan(after, limit=limit) for index, shard in enumerate(self.router.shards)}
+        )
+        users = {user.uid: user for shard_users in found.values() for user in shard_users}
+        return sorted(users.values(), key=lambda user: user.uid)[:limit]
+
+    async def get_reputations(self, user_uids: list[UUID]) -> list[UserReputation]:
+        groups: defaultdict[int, list[UUID]] = defaultdict(list)
+        for user_uid in user_uids:
+            groups[self.router.for_reputation(user_uid)].append(user_uid)
+        found = await self.router.each(
+            {index: self.router.shards[index].user_services.get_reputations(uids) for index, uids in groups.items()}
+        )
+        return [reputation for reputations in found.values() for reputation in reputations]
+
+    async def save_reputations(self, reputations: list[UserReputation]) -> None:
+        groups: defaultdict[int, list[UserReputation]] = defaultdict(list)
+        for reputation in reputations:
+            groups[self.router.for_reputation(reputation.user_uid)].append(reputation)
+        await self.router.reference_users(
+            {index: {reputation.user_uid for reputation in group} for index, group in groups.items()}
+        )
+        await self.router.each(
+            {index: self.router.shards[index].user_services.save_reputations(group) for index, group in groups.items()}
+        )
@@ -0,0 +1,22 @@
+from typing import Any
+from uuid import UUID
+
+from pydantic import BaseModel
+
+from kittens_answers_core.uow.base import BaseUnitOfWork
+
+
+class UserContributions(BaseModel):
+    user_uid: UUID
+    questions: int = 0
+    answers: int = 0
+
+
+async def count_contributions(uow: BaseUnitOfWork[Any, Any, Any], user_uids: list[UUID]) -> list[UserContributions]:
+    async with uow.reader() as reader:
+        questions = await reader.question_services.count_by_creator(user_uids)
+        answers = await reader.answer_services.count_by_creator(user_uids)
+    return [
+        UserContributions(user_uid=user_uid, questions=questions.get(user_uid, 0), answers=answers.get(user_uid, 0))
+        for user_uid in dict.fromkeys(user_uids)
+    ]
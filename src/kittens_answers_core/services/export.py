@@ -0,0 +1,148 @@
+import time
+from collections.abc import AsyncIterator, Iterable, Sequence
+from enum import StrEnum
+from pathlib import Path
+from typing import Any, Final
+from uuid import UUID
+
+import pyarrow as pa
+import pyarrow.parquet as pq
+from pydantic import BaseModel
+
+from kittens_answers_core.uow.base import BaseUnitOfWork
+
+DEFAULT_BATCH_SIZE: Final[int] = 10_000
+DEFAULT_COMPRESSION: Final[str] = "zstd"
+
+UID: Final = pa.binary(16)
+CATEGORY: Final = pa.dictionary(pa.int32(), pa.string())
+CATEGORIES: Final = pa.list_(CATEGORY)
+
+
+class ExportEntities(StrEnum):
+    USERS = "users"
+    QUESTIONS = "questions"
+    ANSWERS = "answers"
+
+
+SCHEMAS: Final[dict[ExportEntities, pa.Schema]] = {
+    ExportEntities.USERS: pa.schema([("uid", UID), ("foreign_id", pa.string())]),
+    ExportEntities.QUESTIONS: pa.schema(
+        [
+            ("uid", UID),
+            ("creator", UID),
+            ("question_type", CATEGORY),
+            ("text", pa.string()),
+            ("options", CATEGORIES),
+            ("extra_options", CATEGORIES),
+        ]
+    ),
+    ExportEntities.ANSWERS: pa.schema(
+        [
+            ("uid", UID),
+            ("creator", UID),
+            ("question_uid", UID),
+            ("answer", CATEGORIES),
+            ("extra_answer", CATEGORIES),
+            ("is_correct", pa.bool_()),
+        ]
+    ),
+}
+
+
+class ExportRun(BaseModel):
+    entity: ExportEntities
+    rows: int = 0
+    batches: int = 0
+    seconds: float = 0.0
+    path: Path | None = None
+
+    @property
+    def rows_per_second(self) -> float:
+        return self.rows / self.seconds if self.seconds else 0.0
+
+
+def _uids(uids: Iterable[UUID]) -> pa.Array:
+    return pa.array([uid.bytes for uid in uids], type=UID)
+
+
+def _category(values: Iterable[str]) -> pa.Array:
+    return pa.array(values, type=pa.string()).dictionary_encode()
+
+
+def _categories(lists: Sequence[Sequence[str]]) -> pa.Array:
+    offsets = [0]
+    for values in lists:
+        offsets.append(offsets[-1] + len(values))
+    return pa.ListArray.from_arrays(
+        pa.array(offsets, type=pa.int32()), _category(value for values in lists for value in values)
+    )
+
+
+async def export_batches(
+    uow: BaseUnitOfWork[Any, Any, Any], entity: ExportEntities, *, batch_size: int = DEFAULT_BATCH_SIZE
+) -> AsyncIterator[pa.RecordBatch]:
+    schema = SCHEMAS[entity]
+    async with uow.reader() as reader:
+        if entity == ExportEntities.USERS:
+            after = None
+            while users := await reader.user_services.scan(after, limit=batch_size):
+                yield pa.record_batch(
+                    [_uids(user.uid for user in users), pa.array([user.foreign_id for user in users], pa.string())],
+                    schema=schema,
+                )
+                after = users[-1].uid
+        elif entity == ExportEntities.QUESTIONS:
+            after = None
+            while questions := await reader.question_services.scan(after, limit=batch_size):
+                yield pa.record_batch(
+                    [
+                        _uids(question.uid for question in questions),
+                        _uids(question.creator for question in questions),
+                        _category(question.question_type for question in questions),
+                        pa.array([question.text for question in questions], pa.string()),
+                        _categories([sorted(question.options) for question in questions]),
+                        _categories([sorted(question.extra_options) for question in questions]),
+                    ],
+                    schema=schema,
+                )
+                after = questions[-1].uid
+        else:
+            watermark = 0
+            while True:
+                answers, watermark = await reader.answer_services.list_since(watermark, limit=batch_size)
+                if not answers:
+                    break
+                yield pa.record_batch(
+                    [
+                        _uids(answer.uid for answer in answers),
+                        _uids(answer.creator for answer in answers),
+                        _uids(answer.question_uid for answer in answers),
+                        _categories([answer.answer for answer in answers]),
+                        _categories([answer.extra_answer for answer in answers]),
+                        pa.array([answer.is_correct for answer in answers], pa.bool_()),
+                    ],
+                    schema=schema,
+                )
+
+
+async def export_parquet(
+    uow: BaseUnitOfWork[Any, Any, Any],
+    directory: Path,
+    entities: Iterable[ExportEntities] = tuple(ExportEntities),
+    *,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+    compression: str = DEFAULT_COMPRESSION,
+) -> list[ExportRun]:
+    runs = []
+    for entity in entities:
+        run = ExportRun(entity=entity, path=directory / f"{entity}.parquet")
+        started = time.perf_counter()
+        with pq.ParquetWriter(run.path, SCHEMAS[entity], compression=compression) as writer:
+            async for batch in export_batches(uow, entity, batch_size=batch_size):
+                writer.write_batch(batch)
+                run.rows += batch.num_rows
+                run.batches += 1
+        run.seconds = time.perf_counter() - started
+        runs.append(run)
+    return runs
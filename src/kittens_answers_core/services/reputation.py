@@ -0,0 +1,162 @@
+import asyncio
+from collections import Counter, defaultdict
+from collections.abc import Callable, Hashable
+from concurrent.futures import Executor
+from operator import itemgetter
+from typing import Any, Final, Generic, TypeVar
+from uuid import UUID
+
+from pydantic import BaseModel
+
+from kittens_answers_core.models import Answer, QuestionConsensus, UserReputation
+from kittens_answers_core.uow.base import BaseUnitOfWork
+
+DEFAULT_BATCH_SIZE: Final[int] = 1000
+
+THashable = TypeVar("THashable", bound=Hashable)
+TResult = TypeVar("TResult")
+
+# (user code, variant code, is_correct, is_new)
+Vote = tuple[int, int, bool, bool]
+Partition = list[tuple[int, list[Vote]]]
+
+
+class ReputationRun(BaseModel):
+    watermark: int
+    users: int
+    questions: int
+
+
+class _Codes(Generic[THashable]):
+    def __init__(self) -> None:
+        self.codes: dict[THashable, int] = {}
+        self.values: list[THashable] = []
+
+    def __call__(self, value: THashable) -> int:
+        if (code := self.codes.get(value)) is None:
+            code = self.codes[value] = len(self.values)
+            self.values.append(value)
+        return code
+
+
+def _agreement(partition: Partition) -> Counter[tuple[int, bool]]:
+    agreement: Counter[tuple[int, bool]] = Counter()
+    for _, votes in partition:
+        verdicts: Counter[int] = Counter()
+        for _, variant, is_correct, _ in votes:
+            verdicts[variant] += 1 if is_correct else -1
+        for user, variant, is_correct, is_new in votes:
+            if is_new and verdicts[variant]:
+                agreement[user, is_correct == (verdicts[variant] > 0)] += 1
+    return agreement
+
+
+def _consensus(partition: Partition, weights: dict[int, float]) -> list[tuple[int, int, float]]:
+    consensus = []
+    for question, votes in partition:
+        scores: defaultdict[int, float] = defaultdict(float)
+        for user, variant, is_correct, _ in votes:
+            scores[variant] += weights[user] if is_correct else -weights[user]
+        variant, score = max(scores.items(), key=itemgetter(1))
+        consensus.append((question, variant, score))
+    return consensus
+
+
+async def _map(
+    executor: Executor | None, function: Callable[..., TResult], partitions: list[Partition], *args: Any
+) -> list[TResult]:
+    if executor is None:
+        return [function(partition, *args) for partition in partitions]
+    loop = asyncio.get_running_loop()
+    return await asyncio.gather(
+        *(loop.run_in_executor(executor, function, partition, *args) for partition in partitions)
+    )
+
+
+async def compute_reputation(
+    uow: BaseUnitOfWork[Any, Any, Any],
+    *,
+    watermark: int = 0,
+    partitions: int = 1,
+    executor: Executor | None = None,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+) -> ReputationRun:
+    users: _Codes[UUID] = _Codes()
+    questions: _Codes[UUID] = _Codes()
+    variants: _Codes[tuple[UUID, tuple[str, ...], tuple[str, ...]]] = _Codes()
+    votes: defaultdict[int, list[Vote]] = defaultdict(list)
+
+    def vote(answer: Answer, *, is_new: bool) -> None:
+        variant = variants((answer.question_uid, tuple(answer.answer), tuple(answer.extra_answer)))
+        votes[questions(answer.question_uid)].append((users(answer.creator), variant, answer.is_correct, is_new))
+
+    async with uow:
+        new_answers: set[UUID] = set()
+        last_watermark = watermark
+        while True:
+            answers, last_watermark = await uow.answer_services.list_since(last_watermark, limit=batch_size)
+            if not answers:
+                break
+            for answer in answers:
+                vote(answer, is_new=True)
+                if watermark:
+                    new_answers.add(answer.uid)
+
+        prior: dict[UUID, UserReputation] = {}
+        if watermark:
+            for question_uid in list(questions.values):
+                after = None
+                while answers := await uow.answer_services.list_for_question(
+                    question_uid, after=after, limit=batch_size
+                ):
+                    for answer in answers:
+                        if answer.uid not in new_answers:
+                            vote(answer, is_new=False)
+                    after = answers[-1].uid
+            for offset in range(0, len(users.values), batch_size):
+                for reputation in await uow.user_services.get_reputations(users.values[offset : offset + batch_size]):
+                    prior[reputation.user_uid] = reputation
+
+        buckets: list[Partition] = [[] for _ in range(max(partitions, 1))]
+        for question, question_votes in votes.items():
+            buckets[question % len(buckets)].append((question, question_votes))
+
+        agreement: Counter[tuple[int, bool]] = Counter()
+        for partial in await _map(executor, _agreement, buckets):
+            agreement.update(partial)
+        reputations: dict[int, UserReputation] = {}
+        if not watermark:
+            reputations = {user: UserReputation(user_uid=user_uid) for user, user_uid in enumerate(users.values)}
+        for (user, agreed), count in agreement.items():
+            user_uid = users.values[user]
+            if (reputation := reputations.get(user)) is None:
+                reputation = reputations[user] = prior.get(user_uid, UserReputation(user_uid=user_uid)).model_copy()
+            reputation.total += count
+            if agreed:
+                reputation.agreed += count
+        weights = {
+            user: (reputations.get(user) or prior.get(user_uid) or UserReputation(user_uid=user_uid)).reputation
+            for user, user_uid in enumerate(users.values)
+        }
+
+        consensus = []
+        for partial_consensus in await _map(executor, _consensus, buckets, weights):
+            for question, variant, score in partial_consensus:
+                _, answer, extra_answer = variants.values[variant]
+                consensus.append(
+                    QuestionConsensus(
+                        question_uid=questions.values[question],
+                        answer=list(answer),
+                        extra_answer=list(extra_answer),
+                        score=score,
+                    )
+                )
+
+        updated = list(reputations.values())
+        for offset in range(0, len(updated), batch_size):
+            await uow.user_services.save_reputations(updated[offset : offset + batch_size])
+        for offset in range(0, len(consensus), batch_size):
+            await uow.answer_services.save_consensus(consensus[offset : offset + batch_size])
+        await uow.commit()
+
+    return ReputationRun(watermark=last_watermark, users=len(updated), questions=len(consensus))
@@ -0,0 +1,84 @@
+import asyncio
+import time
+from collections.abc import Awaitable, Callable
+from datetime import timedelta
+from typing import Any, Final
+
+from pydantic import BaseModel
+
+from kittens_answers_core.identifiers import uuid7_floor
+from kittens_answers_core.models import Reclaimed
+from kittens_answers_core.uow.base import BaseUnitOfWork
+
+DEFAULT_BATCH_SIZE: Final[int] = 500
+DEFAULT_PAUSE: Final[float] = 0.05
+
+
+class RetentionPolicy(BaseModel):
+    # ages are measured from the uuid7 timestamp, rows with other uids are never aged out; None switches the rule off
+    superseded_answers_after: timedelta | None = timedelta(days=7)
+    unanswered_questions_after: timedelta | None = timedelta(days=30)
+    orphaned_roots: bool = True
+    batch_size: int = DEFAULT_BATCH_SIZE
+    pause: float = DEFAULT_PAUSE
+
+
+class RetentionReport(BaseModel):
+    superseded_answers: Reclaimed = Reclaimed()
+    unanswered_questions: Reclaimed = Reclaimed()
+    orphaned_roots: Reclaimed = Reclaimed()
+    batches: int = 0
+
+    @property
+    def total(self) -> Reclaimed:
+        parts = (self.superseded_answers, self.unanswered_questions, self.orphaned_roots)
+        return Reclaimed(rows=sum(part.rows for part in parts), bytes=sum(part.bytes for part in parts))
+
+
+async def _drain(
+    uow: BaseUnitOfWork[Any, Any, Any],
+    policy: RetentionPolicy,
+    report: RetentionReport,
+    batch: Callable[[BaseUnitOfWork[Any, Any, Any]], Awaitable[Reclaimed]],
+) -> Reclaimed:
+    total = Reclaimed()
+    while True:
+        async with uow:
+            reclaimed = await batch(uow)
+            await uow.commit()
+        report.batches += 1
+        total.rows += reclaimed.rows
+        total.bytes += reclaimed.bytes
+        if reclaimed.rows < policy.batch_size:
+            return total
+        await asyncio.sleep(policy.pause)
+
+
+async def apply_retention(uow: BaseUnitOfWork[Any, Any, Any], policy: RetentionPolicy | None = None) -> RetentionReport:
+    policy = policy or RetentionPolicy()
+    report = RetentionReport()
+    now = time.time()
+    if policy.superseded_answers_after is not None:
+        answers_before = uuid7_floor(now - policy.superseded_answers_after.total_seconds())
+        report.superseded_answers = await _drain(
+            uow,
+            policy,
+            report,
+            lambda batch_uow: batch_uow.answer_services.delete_superseded(answers_before, limit=policy.batch_size),
+        )
+    if policy.unanswered_questions_after is not None:
+        questions_before = uuid7_floor(now - policy.unanswered_questions_after.total_seconds())
+        report.unanswered_questions = await _drain(
+            uow,
+            policy,
+            report,
+            lambda batch_uow: batch_uow.question_services.delete_unanswered(questions_before, limit=policy.batch_size),
+        )
+    if policy.orphaned_roots:
+        report.orphaned_roots = await _drain(
+            uow,
+            policy,
+            report,
+            lambda batch_uow: batch_uow.question_services.delete_orphaned_roots(limit=policy.batch_size),
+        )
+    return report
@@ -0,0 +1,83 @@
+import asyncio
+from collections.abc import Awaitable, Callable, Hashable
+from typing import Any, Generic, TypeVar
+from uuid import UUID
+
+from kittens_answers_core.models import Question, QuestionTypes, User
+from kittens_answers_core.uow.base import BaseUnitOfWork
+
+TResult = TypeVar("TResult")
+
+
+class SingleFlight(Generic[TResult]):
+    def __init__(self) -> None:
+        self._flights: dict[Hashable, asyncio.Future[TResult]] = {}
+        self.calls = 0
+        self.collapsed = 0
+
+    async def do(self, key: Hashable, function: Callable[[], Awaitable[TResult]]) -> TResult:
+        if (flight := self._flights.get(key)) is None:
+            flight = self._flights[key] = asyncio.ensure_future(function())
+            flight.add_done_callback(lambda _: self._forget(key, flight))
+            self.calls += 1
+        else:
+            self.collapsed += 1
+        return await asyncio.shield(flight)
+
+    def _forget(self, key: Hashable, flight: asyncio.Future[TResult]) -> None:
+        if self._flights.get(key) is flight:
+            del self._flights[key]
+
+
+class CoalescingReader:
+    def __init__(self, uow_factory: Callable[[], BaseUnitOfWork[Any, Any, Any]]) -> None:
+        self.uow_factory = uow_factory
+        self.users: SingleFlight[User] = SingleFlight()
+        self.questions: SingleFlight[Question] = SingleFlight()
+
+    async def get_user_by_foreign_id(self, foreign_id: str) -> User:
+        async def _get() -> User:
+            async with self.uow_factory() as uow:
+                return await uow.user_services.get_by_foreign_id(foreign_id=foreign_id)
+
+        return await self.users.do(("foreign_id", foreign_id), _get)
+
+    async def get_user_by_uid(self, uid: UUID) -> User:
+        async def _get() -> User:
+            async with self.uow_factory() as uow:
+                return await uow.user_services.get_by_uid(uid=uid)
+
+        return await self.users.do(("uid", uid), _get)
+
+    async def get_question(
+        self, question_type: QuestionTypes, question_text: str, options: set[str], extra_options: set[str]
+    ) -> Question:
+        uow = self.uow_factory()
+
+        async def _get() -> Question:
+            async with uow:
+                return await uow.question_services.get(
+                    question_type=question_type,
+                    question_text=question_text,
+                    options=options,
+                    extra_options=extra_options,
+                )
+
+        # texts that normalize to the same question share one flight
+        key = ("content", uow.question_services.fingerprint(question_type, question_text, options, extra_options))
+        return await self.questions.do(key, _get)
+
+    async def get_question_by_uid(self, uid: UUID) -> Question:
+        async def _get() -> Question:
+            async with self.uow_factory() as uow:
+                return await uow.question_services.get_by_uid(uid=uid)
+
+        return await self.questions.do(("uid", uid), _get)
+
+    @property
+    def calls(self) -> int:
+        return self.users.calls + self.questions.calls
+
+    @property
+    def collapsed(self) -> int:
+        return self.users.collapsed + self.questions.collapsed
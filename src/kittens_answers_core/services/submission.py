@@ -0,0 +1,13 @@
+from typing import Any
+
+from kittens_answers_core.models import Submission, SubmissionResult
+from kittens_answers_core.uow.base import BaseUnitOfWork
+
+
+async def submit_answer(uow: BaseUnitOfWork[Any, Any, Any], submission: Submission) -> SubmissionResult:
+    async with uow:
+        result = await uow.submit(submission)
+        # a resubmission found every row, there is nothing to commit
+        if result.created:
+            await uow.commit()
+    return result
@@ -0,0 +1,28 @@
+from typing import Any
+from uuid import UUID
+
+from pydantic import BaseModel
+
+from kittens_answers_core.filters.sketch import HotSet
+from kittens_answers_core.models import Answer, Question
+from kittens_answers_core.uow.base import BaseUnitOfWork
+
+
+class WarmSet(BaseModel):
+    questions: list[Question] = []
+    answers: list[Answer] = []
+
+
+async def warm(uow: BaseUnitOfWork[Any, Any, Any], hot_set: HotSet) -> WarmSet:
+    if uow.hot_keys is not None:
+        uow.hot_keys.load(hot_set)
+    question_ranks = {UUID(hot_key.key): rank for rank, hot_key in enumerate(hot_set.questions)}
+    answer_ranks = {UUID(hot_key.key): rank for rank, hot_key in enumerate(hot_set.answers)}
+    # batch reads record no hits, so warming does not count towards the loaded frequencies
+    async with uow.reader() as reader:
+        questions = await reader.question_services.get_many_by_uid(list(question_ranks))
+        answers = await reader.answer_services.get_many_by_uid(list(answer_ranks))
+    return WarmSet(
+        questions=sorted(questions, key=lambda question: question_ranks[question.uid]),
+        answers=sorted(answers, key=lambda answer: answer_ranks[answer.uid]),
+    )
@@ -0,0 +1,117 @@
+import asyncio
+from contextlib import suppress
+from types import TracebackType
+from typing import Any, Final, Self
+from uuid import UUID
+
+from sqlalchemy.exc import DBAPIError
+
+from kittens_answers_core.errors import ServiceError
+from kittens_answers_core.models import AnswerSubmission, AnswerSubmissionResult
+from kittens_answers_core.uow.base import BaseUnitOfWork
+
+DEFAULT_MAX_BATCH_SIZE: Final[int] = 500
+DEFAULT_MAX_DELAY: Final[float] = 0.05
+DEFAULT_MAX_QUEUE_SIZE: Final[int] = 10_000
+
+PendingSubmission = tuple[AnswerSubmission, asyncio.Future[AnswerSubmissionResult]]
+
+
+class AnswerWriteBehind:
+    def __init__(
+        self,
+        uow: BaseUnitOfWork[Any, Any, Any],
+        *,
+        max_batch_size: int = DEFAULT_MAX_BATCH_SIZE,
+        max_delay: float = DEFAULT_MAX_DELAY,
+        max_queue_size: int = DEFAULT_MAX_QUEUE_SIZE,
+    ) -> None:
+        self.uow = uow
+        self.max_batch_size = max_batch_size
+        self.max_delay = max_delay
+        self._queue: asyncio.Queue[PendingSubmission] = asyncio.Queue(maxsize=max_queue_size)
+        self._worker: asyncio.Task[None] | None = None
+        self.batches = 0
+
+    async def submit(
+        self, answer: list[str], extra_answer: list[str], question_uid: UUID, creator_id: UUID, *, is_correct: bool
+    ) -> AnswerSubmissionResult:
+        if self._worker is None:
+            msg = "write-behind queue is not running"
+            raise RuntimeError(msg)
+        submission = AnswerSubmission(
+            creator=creator_id,
+            question_uid=question_uid,
+            answer=answer,
+            extra_answer=extra_answer,
+            is_correct=is_correct,
+        )
+        future: asyncio.Future[AnswerSubmissionResult] = asyncio.get_running_loop().create_future()
+        await self._queue.put((submission, future))
+        return await future
+
+    async def start(self) -> None:
+        if self._worker is None:
+            self._worker = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._worker is None:
+            return
+        await self._queue.join()
+        self._worker.cancel()
+        with suppress(asyncio.CancelledError):
+            await self._worker
+        self._worker = None
+
+    async def __aenter__(self) -> Self:
+        await self.start()
+        return self
+
+    async def __aexit__(
+        self, exc_type: type[BaseException] | None, exc_value: BaseException | None, traceback: TracebackType
+    ) -> None:
+        await self.stop()
+
+    async def _collect(self) -> list[PendingSubmission]:
+        batch = [await self._queue.get()]
+        with suppress(TimeoutError):
+            async with asyncio.timeout(self.max_delay):
+                while len(batch) < self.max_batch_size:
+                    batch.append(await self._queue.get())
+        return batch
+
+    async def _run(self) -> None:
+        while True:
+            batch = await self._collect()
+            try:
+                await self._flush(batch)
+            finally:
+                for _ in batch:
+                    self._queue.task_done()
+
+    async def _write(self, batch: list[PendingSubmission]) -> None:
+        async with self.uow:
+            results = await self.uow.answer_services.create_many([submission for submission, _ in batch])
+            await self.uow.commit()
+        self.batches += 1
+        for (_, future), result in zip(batch, results, strict=True):
+            if not future.done():
+                future.set_result(result)
+
+    async def _flush(self, batch: list[PendingSubmission]) -> None:
+        try:
+            await self._write(batch)
+        except (ServiceError, DBAPIError) as error:
+            # a single bad submission, like one referencing an unknown creator, fails the whole batch;
+            # bisect until it is isolated so only its own caller sees the error
+            if len(batch) == 1:
+                if not batch[0][1].done():
+                    batch[0][1].set_exception(error)
+                return
+            middle = len(batch) // 2
+            await self._flush(batch[:middle])
+            await self._flush(batch[middle:])
+        except Exception as error:
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(error)
@@ -0,0 +1,28 @@
+from importlib import import_module
+from typing import Any
+
+from kittens_answers_core.uow.base import BaseUnitOfWork
+
+_BACKENDS: dict[str, str] = {
+    "memory": "kittens_answers_core.uow.memory:MemoryUnitOfWork",
+    "postgresql": "kittens_answers_core.uow.db:SQLAlchemyUnitOfWork",
+    "postgresql+psycopg": "kittens_answers_core.uow.db:SQLAlchemyUnitOfWork",
+    "postgresql+asyncpg": "kittens_answers_core.uow.db:SQLAlchemyUnitOfWork",
+    "sqlite": "kittens_answers_core.uow.sqlite:SQLiteUnitOfWork",
+    "sqlite+aiosqlite": "kittens_answers_core.uow.sqlite:SQLiteUnitOfWork",
+    "sharded": "kittens_answers_core.uow.sharded:ShardedUnitOfWork",
+}
+
+
+def register_backend(scheme: str, target: str) -> None:
+    _BACKENDS[scheme] = target
+
+
+def create_unit_of_work(url: str, **options: Any) -> BaseUnitOfWork[Any, Any, Any]:
+    scheme, separator, _ = url.partition("://")
+    if not separator or scheme not in _BACKENDS:
+        msg = f"no unit of work backend registered for {url!r}"
+        raise ValueError(msg)
+    module, _, name = _BACKENDS[scheme].partition(":")
+    unit_of_work: type[BaseUnitOfWork[Any, Any, Any]] = getattr(import_module(module), name)
+    return unit_of_work.from_url(url, **options)
@@ -1,7 +1,21 @@
 import abc
+import asyncio
+import time
 from types import TracebackType
-from typing import Generic, Self, TypeVar
+from typing import Any, Generic, Self, TypeVar
 
+from kittens_answers_core.errors import (
+    AnswerAlreadyExistError,
+    AnswerDoesNotExistError,
+    QuestionAlreadyExistError,
+    QuestionDoesNotExistError,
+    ServiceTimeoutError,
+    UserAlreadyExistError,
+    UserDoesNotExistError,
+)
+from kittens_answers_core.filters.sketch import HotKeyTracker
+from kittens_answers_core.metrics.base import TRANSACTION_SECONDS, MetricsSink
+from kittens_answers_core.models import Answer, Change, Question, Submission, SubmissionResult, User
 from kittens_answers_core.repositories.base.answer import BaseAnswerRepository
 from kittens_answers_core.repositories.base.question import (
     BaseQuestionRepository,
@@ -17,15 +31,127 @@ class BaseUnitOfWork(abc.ABC, Generic[UT, QT, AT]):  # pragma: no cover
     user_services: UT
     question_services: QT
     answer_services: AT
+    changes: list[Change]
+    read_only: bool = False
+    timeout: float | None = None
+    hot_keys: HotKeyTracker | None = None
+    metrics: MetricsSink | None = None
+    _deadline: asyncio.Timeout | None = None
+    _started: float = 0.0
 
     @property
     def services(self) -> list[UT | QT | AT]:
         return [self.user_services, self.question_services, self.answer_services]
 
+    def track_hot_keys(self, hot_keys: HotKeyTracker | None) -> None:
+        self.hot_keys = hot_keys
+        self.question_services.hot_keys = None if hot_keys is None else hot_keys.questions
+        self.answer_services.hot_keys = None if hot_keys is None else hot_keys.answers
+
+    def _track_changes(self) -> None:
+        self.changes = []
+        for service in self.services:
+            service.changes = self.changes
+
+    @classmethod
+    @abc.abstractmethod
+    def from_url(cls, url: str, **options: Any) -> Self:
+        ...
+
     @abc.abstractmethod
     async def commit(self) -> None:
         ...
 
+    @abc.abstractmethod
+    def reader(self) -> Self:
+        ...
+
+    @abc.abstractmethod
+    def with_timeout(self, timeout: float | None) -> Self:
+        ...
+
+    async def submit(self, submission: Submission) -> SubmissionResult:
+        user, user_created = await self._submit_user(submission)
+        question, question_created = await self._submit_question(submission, user)
+        answer, answer_created = await self._submit_answer(submission, user, question, known=not question_created)
+        return SubmissionResult(
+            user=user,
+            question=question,
+            answer=answer,
+            user_created=user_created,
+            question_created=question_created,
+            answer_created=answer_created,
+        )
+
+    async def _submit_user(self, submission: Submission) -> tuple[User, bool]:
+        try:
+            return await self.user_services.get_by_foreign_id(submission.foreign_id), False
+        except UserDoesNotExistError:
+            pass
+        try:
+            return await self.user_services.create(submission.foreign_id), True
+        except UserAlreadyExistError:
+            return await self.user_services.get_by_foreign_id(submission.foreign_id), False
+
+    async def _submit_question(self, submission: Submission, user: User) -> tuple[Question, bool]:
+        key = (submission.question_type, submission.question_text, submission.options, submission.extra_options)
+        try:
+            return await self.question_services.get(*key), False
+        except QuestionDoesNotExistError:
+            pass
+        try:
+            return await self.question_services.create(*key, user.uid), True
+        except QuestionAlreadyExistError:
+            return await self.question_services.get(*key), False
+
+    async def _submit_answer(
+        self, submission: Submission, user: User, question: Question, *, known: bool
+    ) -> tuple[Answer, bool]:
+        key = (submission.answer, submission.extra_answer, question.uid)
+        # a question created by this submission cannot have answers yet
+        if known:
+            try:
+                return await self.answer_services.get(*key, is_correct=submission.is_correct), False
+            except AnswerDoesNotExistError:
+                pass
+        try:
+            return await self.answer_services.create(*key, user.uid, is_correct=submission.is_correct), True
+        except AnswerAlreadyExistError:
+            return await self.answer_services.get(*key, is_correct=submission.is_correct), False
+
+    def _start_metrics(self) -> None:
+        self._started = time.perf_counter()
+
+    def _record_metrics(self, exc_type: type[BaseException] | None) -> None:
+        if self.metrics is not None:
+            self.metrics.record(
+                TRANSACTION_SECONDS,
+                time.perf_counter() - self._started,
+                backend=type(self).__name__,
+                mode="read" if self.read_only else "write",
+                outcome="ok" if exc_type is None else "error",
+            )
+
+    async def _enter_deadline(self) -> None:
+        self._start_metrics()
+        if self.timeout is not None:
+            self._deadline = asyncio.timeout(self.timeout)
+            await self._deadline.__aenter__()
+
+    async def _exit_deadline(
+        self, exc_type: type[BaseException] | None, exc_value: BaseException | None, traceback: TracebackType | None
+    ) -> None:
+        deadline, self._deadline = self._deadline, None
+        try:
+            if deadline is not None:
+                await deadline.__aexit__(exc_type, exc_value, traceback)
+        except TimeoutError as error:
+            raise ServiceTimeoutError from error
+        finally:
+            self._record_metrics(exc_type)
+        if isinstance(exc_value, TimeoutError):
+            raise ServiceTimeoutError from exc_value
+
     async def __aenter__(self) -> Self:
         return self
 
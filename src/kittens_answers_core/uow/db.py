@@ -1,46 +1,203 @@
 from types import TracebackType
-from typing import Self, TypeAlias
+from typing import Any, Final, Self, TypeAlias
 
-from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy import event, func, make_url, select
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.orm import ORMExecuteState, Session
+from sqlalchemy.sql import Executable
 
+from kittens_answers_core.errors import ReadOnlyError, ServiceTimeoutError
+from kittens_answers_core.feeds.base import ChangeFeed
+from kittens_answers_core.feeds.db import PostgresChangeFeed
+from kittens_answers_core.filters.lookup import LookupFilters
+from kittens_answers_core.filters.sketch import HotKeyTracker
+from kittens_answers_core.metrics.base import MetricsSink
+from kittens_answers_core.models import Submission, SubmissionResult
+from kittens_answers_core.normalization import TextNormalizer
 from kittens_answers_core.repositories.db.answer import (
     SQLAlchemyAnswerRepository,
 )
+from kittens_answers_core.repositories.db.dialect import dialect_name
 from kittens_answers_core.repositories.db.question import (
     SQLAlchemyQuestionRepository,
 )
+from kittens_answers_core.repositories.db.submission import submit
 from kittens_answers_core.repositories.db.user import SQLAlchemyUserRepository
 from kittens_answers_core.uow.base import BaseUnitOfWork
 
 SQLAlchemyServices: TypeAlias = SQLAlchemyUserRepository | SQLAlchemyQuestionRepository
 
+# query_canceled, lock_not_available
+TIMEOUT_SQLSTATES: Final[frozenset[str]] = frozenset({"57014", "55P03"})
+DEFAULT_PREPARE_THRESHOLD: Final[int] = 5
+DEFAULT_PREPARED_CACHE_SIZE: Final[int] = 100
+
+
+def _refuse_flush(session: Session, *_: Any) -> None:
+    if session.new or session.dirty or session.deleted:
+        raise ReadOnlyError
+
+
+def _refuse_write_statement(execute_state: ORMExecuteState) -> None:
+    if execute_state.is_insert or execute_state.is_update or execute_state.is_delete:
+        raise ReadOnlyError
+
+
+def create_postgres_engine(
+    url: str, *, prepare_threshold: int | None = DEFAULT_PREPARE_THRESHOLD, **options: Any
+) -> AsyncEngine:
+    driver = make_url(url).get_driver_name()
+    if driver == "psycopg":
+        connect_args: dict[str, Any] = {"prepare_threshold": prepare_threshold}
+    elif driver == "asyncpg":
+        # asyncpg always uses the extended protocol, so only the reuse of prepared statements can be switched off
+        connect_args = {
+            "prepared_statement_cache_size": 0 if prepare_threshold is None else DEFAULT_PREPARED_CACHE_SIZE
+        }
+    else:
+        connect_args = {}
+    return create_async_engine(url, connect_args=connect_args, **options)
+
 
 class SQLAlchemyUnitOfWork(
     BaseUnitOfWork[SQLAlchemyUserRepository, SQLAlchemyQuestionRepository, SQLAlchemyAnswerRepository]
 ):
     session: AsyncSession
 
-    def __init__(self, db_url: str) -> None:
-        self._engine = create_async_engine(url=db_url)
-        self.session_factory = async_sessionmaker(bind=self._engine, expire_on_commit=False)
-        self.user_services = SQLAlchemyUserRepository()
-        self.question_services = SQLAlchemyQuestionRepository()
+    def __init__(
+        self,
+        db_url: str | AsyncEngine,
+        normalizer: TextNormalizer | None = None,
+        *,
+        replica_url: str | AsyncEngine | None = None,
+        read_only: bool = False,
+        timeout: float | None = None,
+        feed: ChangeFeed | None = None,
+        lookup_filters: LookupFilters | None = None,
+        hot_keys: HotKeyTracker | None = None,
+        metrics: MetricsSink | None = None,
+        prepare_threshold: int | None = DEFAULT_PREPARE_THRESHOLD,
+    ) -> None:
+        self._engine = (
+            db_url
+            if isinstance(db_url, AsyncEngine)
+            else create_postgres_engine(db_url, prepare_threshold=prepare_threshold)
+        )
+        if replica_url is None:
+            self._replica_engine = self._engine
+        elif isinstance(replica_url, AsyncEngine):
+            self._replica_engine = replica_url
+        else:
+            self._replica_engine = create_postgres_engine(replica_url, prepare_threshold=prepare_threshold)
+        self.read_only = read_only
+        self.timeout = timeout
+        self.feed = feed
+        self.metrics = metrics
+        self.lookup_filters = lookup_filters
+        self._bind = self._reader_bind() if read_only else self._engine
+        self.session_factory = async_sessionmaker(bind=self._bind, expire_on_commit=False)
+        self.normalizer = normalizer
+        self.user_services = SQLAlchemyUserRepository(lookup_filters)
+        self.question_services = SQLAlchemyQuestionRepository(normalizer, lookup_filters)
         self.answer_services = SQLAlchemyAnswerRepository()
+        self._track_changes()
+        self.track_hot_keys(hot_keys)
+
+    @classmethod
+    def from_url(cls, url: str, **options: Any) -> Self:
+        scheme, _, rest = url.partition("://")
+        return cls(f"postgresql+psycopg://{rest}" if scheme == "postgresql" else url, **options)
+
+    def reader(self) -> Self:
+        return type(self)(
+            self._engine,
+            self.normalizer,
+            replica_url=self._replica_engine,
+            read_only=True,
+            timeout=self.timeout,
+            feed=self.feed,
+            lookup_filters=self.lookup_filters,
+            hot_keys=self.hot_keys,
+            metrics=self.metrics,
+        )
+
+    def with_timeout(self, timeout: float | None) -> Self:
+        return type(self)(
+            self._engine,
+            self.normalizer,
+            replica_url=self._replica_engine,
+            read_only=self.read_only,
+            timeout=timeout,
+            feed=self.feed,
+            lookup_filters=self.lookup_filters,
+            hot_keys=self.hot_keys,
+            metrics=self.metrics,
+        )
 
     async def commit(self) -> None:
+        if self.read_only:
+            raise ReadOnlyError
+        if isinstance(self.feed, PostgresChangeFeed):
+            await self.feed.notify(self.session, self.changes)
         await self.session.commit()
+        if self.feed is not None and not isinstance(self.feed, PostgresChangeFeed) and self.changes:
+            await self.feed.publish(list(self.changes))
+        self.changes.clear()
+
+    async def submit(self, submission: Submission) -> SubmissionResult:
+        if dialect_name(self.session) == "postgresql" and not self.read_only:
+            result = await submit(self.session, submission, self.user_services, self.question_services)
+            if result is not None:
+                return result
+        return await super().submit(submission)
 
     async def __aenter__(self) -> Self:
-        self.session = AsyncSession(bind=self._engine)
+        await self._enter_deadline()
+        self.changes.clear()
+        self.session = AsyncSession(bind=self._bind)
+        if self.read_only:
+            event.listen(self.session.sync_session, "before_flush", _refuse_flush)
+            event.listen(self.session.sync_session, "do_orm_execute", _refuse_write_statement)
         for service in self.services:
             service.session = self.session
+        if self.timeout is not None:
+            try:
+                await self.session.execute(self._timeout_statement(max(int(self.timeout * 1000), 1)))
+            except BaseException as error:
+                await self._close()
+                await self._exit_deadline(type(error), error, error.__traceback__)
+                raise
         return self
 
+    def _reader_bind(self) -> AsyncEngine:
+        # a real read only transaction, so the transaction-local timeouts bound reads as well
+        return self._replica_engine.execution_options(postgresql_readonly=True)
+
+    def _timeout_statement(self, milliseconds: int) -> Executable:
+        return select(
+            func.set_config("statement_timeout", str(milliseconds), True),
+            func.set_config("lock_timeout", str(milliseconds), True),
+        )
+
+    def _timed_out(self, error: DBAPIError) -> bool:
+        return getattr(error.orig, "sqlstate", None) in TIMEOUT_SQLSTATES
+
     async def __aexit__(
         self, exc_type: type[BaseException] | None, exc_value: BaseException | None, traceback: TracebackType
     ) -> bool | None:
-        await self.session.rollback()
+        try:
+            await self._exit_deadline(exc_type, exc_value, traceback)
+            if isinstance(exc_value, DBAPIError) and self._timed_out(exc_value):
+                raise ServiceTimeoutError from exc_value
+        finally:
+            await self._close()
+        return None
+
+    async def _close(self) -> None:
+        self.changes.clear()
+        if not self.read_only:
+            await self.session.rollback()
         await self.session.close()
         for service in self.services:
             delattr(service, "session")
-        return None
@@ -1,6 +1,13 @@
+from copy import copy
 from types import TracebackType
-from typing import Self, TypeAlias
+from typing import Any, Self, TypeAlias
 
+from kittens_answers_core.errors import ReadOnlyError
+from kittens_answers_core.feeds.base import ChangeFeed
+from kittens_answers_core.filters.sketch import HotKeyTracker
+from kittens_answers_core.metrics.base import MetricsSink
+from kittens_answers_core.metrics.profiling import AllocationProfile, AllocationTracer, RepositoryFootprint
+from kittens_answers_core.normalization import TextNormalizer
 from kittens_answers_core.repositories.memory.answer import MemoryAnswerServices
 from kittens_answers_core.repositories.memory.question import MemoryQuestionServices
 from kittens_answers_core.repositories.memory.user import MemoryUserServices
@@ -10,23 +17,98 @@ MemoryServices: TypeAlias = MemoryUserServices | MemoryQuestionServices | Memory
 
 
 class MemoryUnitOfWork(BaseUnitOfWork[MemoryUserServices, MemoryQuestionServices, MemoryAnswerServices]):
-    def __init__(self) -> None:
+    _writer: "MemoryUnitOfWork | None" = None
+
+    def __init__(
+        self,
+        normalizer: TextNormalizer | None = None,
+        *,
+        timeout: float | None = None,
+        feed: ChangeFeed | None = None,
+        hot_keys: HotKeyTracker | None = None,
+        metrics: MetricsSink | None = None,
+        trace_allocations: bool = False,
+    ) -> None:
+        self.timeout = timeout
+        self.feed = feed
+        self.metrics = metrics
+        self.trace_allocations = trace_allocations
+        self.last_allocations: AllocationProfile | None = None
+        self._tracer: AllocationTracer | None = None
         self.user_services = MemoryUserServices([])
-        self.question_services = MemoryQuestionServices([])
-        self.answer_services = MemoryAnswerServices([])
+        self.question_services = MemoryQuestionServices([], normalizer)
+        self.answer_services = MemoryAnswerServices([], self.question_services)
+        self.question_services.is_answered = self.answer_services.is_answered
+        self._track_changes()
+        self.track_hot_keys(hot_keys)
+
+    @classmethod
+    def from_url(cls, url: str, **options: Any) -> Self:  # noqa: ARG003
+        return cls(**options)
+
+    def reader(self) -> Self:
+        reader = copy(self)
+        reader.read_only = True
+        reader._writer = self._writer or self
+        return reader
+
+    def with_timeout(self, timeout: float | None) -> Self:
+        uow = copy(self)
+        uow.timeout = timeout
+        return uow
+
+    def profile_memory(self) -> list[RepositoryFootprint]:
+        footprints = [service.footprint() for service in self.services]
+        if self.metrics is not None:
+            for footprint in footprints:
+                footprint.record(self.metrics)
+        return footprints
+
+    def _start_metrics(self) -> None:
+        super()._start_metrics()
+        if self.trace_allocations:
+            self._tracer = AllocationTracer()
+            self._tracer.start()
+
+    def _record_metrics(self, exc_type: type[BaseException] | None) -> None:
+        super()._record_metrics(exc_type)
+        tracer, self._tracer = self._tracer, None
+        if tracer is not None:
+            self.last_allocations = tracer.stop()
+            if self.metrics is not None:
+                self.last_allocations.record(self.metrics, mode="read" if self.read_only else "write")
 
     async def commit(self) -> None:
+        if self.read_only:
+            raise ReadOnlyError
         for service in self.services:
             service.make_backup()
+        if self.feed is not None and self.changes:
+            await self.feed.publish(list(self.changes))
+        self.changes.clear()
 
     async def __aenter__(self) -> Self:
-        for service in self.services:
-            service.make_backup()
+        await self._enter_deadline()
+        if self._writer is not None:
+            # readers work on their own read-only views, the shared services stay writable for everyone else
+            self.user_services = self._writer.user_services.read_view()
+            self.question_services = self._writer.question_services.read_view()
+            self.answer_services = self._writer.answer_services.read_view()
+            self.answer_services.question_services = self.question_services
+            self.question_services.is_answered = self.answer_services.is_answered
+            self._track_changes()
+        self.changes.clear()
+        if not self.read_only:
+            for service in self.services:
+                service.make_backup()
         return await super().__aenter__()
 
     async def __aexit__(
         self, exc_type: type[BaseException] | None, exc_value: BaseException | None, traceback: TracebackType
     ) -> bool | None:
-        for service in self.services:
-            service.rollback_backup()
+        if not self.read_only:
+            for service in self.services:
+                service.rollback_backup()
+        self.changes.clear()
+        await self._exit_deadline(exc_type, exc_value, traceback)
         return None
@@ -0,0 +1,145 @@
+from collections.abc import Sequence
+from types import TracebackType
+from typing import Any, Self, cast
+
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from kittens_answers_core.errors import ReadOnlyError
+from kittens_answers_core.feeds.base import ChangeFeed
+from kittens_answers_core.filters.sketch import HotKeyTracker
+from kittens_answers_core.metrics.base import MetricsSink
+from kittens_answers_core.normalization import TextNormalizer
+from kittens_answers_core.repositories.sharded.answer import ShardedAnswerRepository
+from kittens_answers_core.repositories.sharded.question import ShardedQuestionRepository
+from kittens_answers_core.repositories.sharded.router import DEFAULT_ROUTE_CACHE_SIZE, ShardRouter
+from kittens_answers_core.repositories.sharded.user import ShardedUserRepository
+from kittens_answers_core.uow.base import BaseUnitOfWork
+from kittens_answers_core.uow.db import SQLAlchemyUnitOfWork
+
+
+def _connect(
+    shard: str | AsyncEngine | SQLAlchemyUnitOfWork,
+    normalizer: TextNormalizer | None,
+    *,
+    read_only: bool,
+    timeout: float | None,
+) -> SQLAlchemyUnitOfWork:
+    if isinstance(shard, SQLAlchemyUnitOfWork):
+        return shard
+    if isinstance(shard, str):
+        return SQLAlchemyUnitOfWork.from_url(shard, normalizer=normalizer, read_only=read_only, timeout=timeout)
+    return SQLAlchemyUnitOfWork(shard, normalizer, read_only=read_only, timeout=timeout)
+
+
+class ShardedUnitOfWork(BaseUnitOfWork[ShardedUserRepository, ShardedQuestionRepository, ShardedAnswerRepository]):
+    def __init__(
+        self,
+        shards: Sequence[str | AsyncEngine | SQLAlchemyUnitOfWork],
+        normalizer: TextNormalizer | None = None,
+        *,
+        read_only: bool = False,
+        timeout: float | None = None,
+        feed: ChangeFeed | None = None,
+        hot_keys: HotKeyTracker | None = None,
+        metrics: MetricsSink | None = None,
+        route_cache_size: int = DEFAULT_ROUTE_CACHE_SIZE,
+    ) -> None:
+        if not shards:
+            msg = "a sharded unit of work needs at least one shard"
+            raise ValueError(msg)
+        self.shards = [_connect(shard, normalizer, read_only=read_only, timeout=timeout) for shard in shards]
+        self.read_only = read_only
+        self.timeout = timeout
+        self.feed = feed
+        self.metrics = metrics
+        self.normalizer = normalizer
+        self.route_cache_size = route_cache_size
+        self.router = ShardRouter(self.shards, route_cache_size)
+        self.user_services = ShardedUserRepository(self.router)
+        self.question_services = ShardedQuestionRepository(self.router, normalizer)
+        self.answer_services = ShardedAnswerRepository(self.router)
+        self._track_changes()
+        self.router.changes = self.changes
+        self.track_hot_keys(hot_keys)
+
+    def track_hot_keys(self, hot_keys: HotKeyTracker | None) -> None:
+        super().track_hot_keys(hot_keys)
+        for shard in self.shards:
+            shard.track_hot_keys(hot_keys)
+
+    @classmethod
+    def from_url(cls, url: str, **options: Any) -> Self:
+        _, _, rest = url.partition("://")
+        return cls(rest.split(","), **options)
+
+    def reader(self) -> Self:
+        return type(self)(
+            [shard.reader() for shard in self.shards],
+            self.normalizer,
+            read_only=True,
+            timeout=self.timeout,
+            feed=self.feed,
+            hot_keys=self.hot_keys,
+            metrics=self.metrics,
+            route_cache_size=self.route_cache_size,
+        )
+
+    def with_timeout(self, timeout: float | None) -> Self:
+        return type(self)(
+            [shard.with_timeout(timeout) for shard in self.shards],
+            self.normalizer,
+            read_only=self.read_only,
+            timeout=timeout,
+            feed=self.feed,
+            hot_keys=self.hot_keys,
+            metrics=self.metrics,
+            route_cache_size=self.route_cache_size,
+        )
+
+    async def commit(self) -> None:
+        if self.read_only:
+            raise ReadOnlyError
+        for shard in self.shards:
+            await shard.commit()
+        self.router.commit()
+        if self.feed is not None and self.changes:
+            await self.feed.publish(list(self.changes))
+        self.changes.clear()
+
+    async def __aenter__(self) -> Self:
+        self._start_metrics()
+        self.changes.clear()
+        entered: list[SQLAlchemyUnitOfWork] = []
+        try:
+            for shard in self.shards:
+                await shard.__aenter__()
+                entered.append(shard)
+        except BaseException as error:
+            await self._exit(entered, type(error), error, error.__traceback__)
+            raise
+        return self
+
+    async def __aexit__(
+        self, exc_type: type[BaseException] | None, exc_value: BaseException | None, traceback: TracebackType
+    ) -> bool | None:
+        await self._exit(self.shards, exc_type, exc_value, traceback)
+        return None
+
+    async def _exit(
+        self,
+        shards: list[SQLAlchemyUnitOfWork],
+        exc_type: type[BaseException] | None,
+        exc_value: BaseException | None,
+        traceback: TracebackType | None,
+    ) -> None:
+        error: BaseException | None = None
+        for shard in reversed(shards):
+            try:
+                await shard.__aexit__(exc_type, exc_value, cast(TracebackType, traceback))
+            except BaseException as shard_error:
+                error = shard_error
+        self.router.rollback()
+        self.changes.clear()
+        self._record_metrics(exc_type if error is None else type(error))
+        if error is not None:
+            raise error
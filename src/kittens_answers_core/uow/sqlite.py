@@ -0,0 +1,109 @@
+from collections.abc import Mapping
+from functools import lru_cache, partial
+from typing import Any, Final, Self
+
+from sqlalchemy import Connection, event, text
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.ext.asyncio import AsyncEngine, create_async_engine
+from sqlalchemy.pool import ConnectionPoolEntry
+from sqlalchemy.sql import Executable
+
+from kittens_answers_core.feeds.base import ChangeFeed
+from kittens_answers_core.filters.lookup import LookupFilters
+from kittens_answers_core.filters.sketch import HotKeyTracker
+from kittens_answers_core.metrics.base import MetricsSink
+from kittens_answers_core.normalization import DEFAULT_CACHE_SIZE, TextNormalizer, similarity, trigrams
+from kittens_answers_core.uow.db import SQLAlchemyUnitOfWork
+
+DEFAULT_PRAGMAS: Final[Mapping[str, str | int]] = {
+    "journal_mode": "WAL",
+    "synchronous": "NORMAL",
+    "foreign_keys": "ON",
+    "busy_timeout": 5000,
+    "temp_store": "MEMORY",
+    "cache_size": -64_000,
+    "mmap_size": 256 * 1024 * 1024,
+}
+BUSY_ERRORS: Final[frozenset[str]] = frozenset({"SQLITE_BUSY", "SQLITE_LOCKED", "SQLITE_INTERRUPT"})
+
+_trigrams = lru_cache(maxsize=DEFAULT_CACHE_SIZE)(trigrams)
+
+
+def _similarity(left: str, right: str) -> float:
+    return similarity(_trigrams(left), _trigrams(right))
+
+
+def _configure_connection(
+    pragmas: Mapping[str, str | int], dbapi_connection: Any, _connection_record: ConnectionPoolEntry
+) -> None:
+    dbapi_connection.isolation_level = None
+    dbapi_connection.create_function("similarity", 2, _similarity, deterministic=True)
+    cursor = dbapi_connection.cursor()
+    for name, value in pragmas.items():
+        cursor.execute(f"PRAGMA {name} = {value}")
+    cursor.close()
+
+
+def _reset_busy_timeout(
+    pragmas: Mapping[str, str | int], dbapi_connection: Any, _connection_record: ConnectionPoolEntry, _: Any
+) -> None:
+    # the pragma is per connection, a unit of work timeout must not outlive its checkout
+    cursor = dbapi_connection.cursor()
+    cursor.execute(f"PRAGMA busy_timeout = {pragmas.get('busy_timeout', 0)}")
+    cursor.close()
+
+
+def _begin(connection: Connection) -> None:
+    if connection.get_execution_options().get("isolation_level") != "AUTOCOMMIT":
+        connection.exec_driver_sql("BEGIN")
+
+
+def create_sqlite_engine(url: str, pragmas: Mapping[str, str | int] = DEFAULT_PRAGMAS) -> AsyncEngine:
+    engine = create_async_engine(url)
+    event.listen(engine.sync_engine, "connect", partial(_configure_connection, pragmas))
+    event.listen(engine.sync_engine, "begin", _begin)
+    event.listen(engine.sync_engine.pool, "reset", partial(_reset_busy_timeout, pragmas))
+    return engine
+
+
+class SQLiteUnitOfWork(SQLAlchemyUnitOfWork):
+    def __init__(
+        self,
+        db_url: str | AsyncEngine,
+        normalizer: TextNormalizer | None = None,
+        *,
+        replica_url: str | AsyncEngine | None = None,
+        read_only: bool = False,
+        timeout: float | None = None,
+        feed: ChangeFeed | None = None,
+        lookup_filters: LookupFilters | None = None,
+        hot_keys: HotKeyTracker | None = None,
+        metrics: MetricsSink | None = None,
+        pragmas: Mapping[str, str | int] = DEFAULT_PRAGMAS,
+    ) -> None:
+        super().__init__(
+            create_sqlite_engine(db_url, pragmas) if isinstance(db_url, str) else db_url,
+            normalizer,
+            replica_url=create_sqlite_engine(replica_url, pragmas) if isinstance(replica_url, str) else replica_url,
+            read_only=read_only,
+            timeout=timeout,
+            feed=feed,
+            lookup_filters=lookup_filters,
+            hot_keys=hot_keys,
+            metrics=metrics,
+        )
+
+    @classmethod
+    def from_url(cls, url: str, **options: Any) -> Self:
+        scheme, _, rest = url.partition("://")
+        return cls(f"sqlite+aiosqlite://{rest}" if scheme == "sqlite" else url, **options)
+
+    def _reader_bind(self) -> AsyncEngine:
+        return self._replica_engine.execution_options(isolation_level="AUTOCOMMIT")
+
+    def _timeout_statement(self, milliseconds: int) -> Executable:
+        # only bounds lock waits, sqlite has no statement timeout and the pool reset restores the pragma
+        return text(f"PRAGMA busy_timeout = {milliseconds}")
+
+    def _timed_out(self, error: DBAPIError) -> bool:
+        return getattr(error.orig, "sqlite_errorname", None) in BUSY_ERRORS
@@ -1,9 +1,12 @@
 from collections.abc import Generator
-from typing import cast
+from contextlib import ExitStack
+from typing import Final, cast
 
 import pytest
 from testcontainers.postgres import PostgresContainer  # pyright: ignore [reportMissingTypeStubs]
 
+SHARDS: Final[int] = 3
+
 
 @pytest.fixture
 def anyio_backend() -> str:
@@ -14,3 +17,10 @@ def anyio_backend() -> str:
 def db_container_url() -> Generator[str, None, None]:
     with PostgresContainer(driver="psycopg") as container:
         yield cast(str, container.get_connection_url())  # pyright: ignore [reportUnknownMemberType]
+
+
+@pytest.fixture(scope="session")
+def db_shard_urls() -> Generator[list[str], None, None]:
+    with ExitStack() as stack:
+        containers = [stack.enter_context(PostgresContainer(driver="psycopg")) for _ in range(SHARDS)]
+        yield [container.get_connection_url() for container in containers]  # pyright: ignore [reportUnknownMemberType]
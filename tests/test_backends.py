@@ -0,0 +1,52 @@
+import json
+import subprocess
+import sys
+
+import pytest
+
+from kittens_answers_core.uow import (  # pyright: ignore [reportPrivateUsage]
+    _BACKENDS,
+    create_unit_of_work,
+    register_backend,
+)
+from kittens_answers_core.uow.memory import MemoryUnitOfWork
+
+HEAVY_MODULES = ("sqlalchemy", "psycopg")
+
+PROBE = """
+import json, sys
+from kittens_answers_core.uow import create_unit_of_work
+create_unit_of_work({url!r})
+print(json.dumps(sorted(sys.modules)))
+"""
+
+
+def _probe(url: str) -> set[str]:
+    result = subprocess.run(  # noqa: S603
+        [sys.executable, "-c", PROBE.format(url=url)], capture_output=True, check=True, text=True
+    )
+    return {module.partition(".")[0] for module in json.loads(result.stdout)}
+
+
+def test_memory_backend() -> None:
+    assert isinstance(create_unit_of_work("memory://"), MemoryUnitOfWork)
+
+
+def test_unknown_backend() -> None:
+    with pytest.raises(ValueError, match="no unit of work backend"):
+        create_unit_of_work("mongodb://localhost")
+
+
+def test_register_backend(monkeypatch: pytest.MonkeyPatch) -> None:
+    # registered through monkeypatch first, so the entry is removed again after the test
+    monkeypatch.setitem(_BACKENDS, "test", "")
+    register_backend("test", "kittens_answers_core.uow.memory:MemoryUnitOfWork")
+    assert isinstance(create_unit_of_work("test://"), MemoryUnitOfWork)
+
+
+def test_lazy_imports() -> None:
+    memory_modules = _probe("memory://")
+    postgres_modules = _probe("postgresql://user@localhost/db")
+
+    assert not memory_modules.intersection(HEAVY_MODULES)
+    assert postgres_modules.issuperset(HEAVY_MODULES)
@@ -0,0 +1,29 @@
+from uuid import uuid4
+
+from kittens_answers_core.filters.bloom import BloomFilter
+
+
+def test_no_false_negatives() -> None:
+    bloom = BloomFilter(capacity=1000, false_positive_rate=0.01)
+    keys = [str(uuid4()) for _ in range(1000)]
+    for key in keys:
+        bloom.add(key)
+    assert all(key in bloom for key in keys)
+    assert bloom.count == len(keys)
+
+
+def test_false_positive_rate() -> None:
+    bloom = BloomFilter(capacity=1000, false_positive_rate=0.01)
+    for _ in range(1000):
+        bloom.add(str(uuid4()))
+    false_positives = sum(str(uuid4()) in bloom for _ in range(10_000))
+    assert false_positives / 10_000 < 2 * bloom.false_positive_rate
+    assert bloom.estimated_false_positive_rate < 2 * bloom.false_positive_rate
+
+
+def test_stats() -> None:
+    bloom = BloomFilter(capacity=1000, false_positive_rate=0.01)
+    stats = bloom.stats()
+    assert stats.hash_count == 7
+    assert stats.memory_bytes == 1199
+    assert stats.estimated_false_positive_rate == 0
@@ -0,0 +1,47 @@
+from uuid import uuid4
+
+import pytest
+
+from kittens_answers_core.feeds.base import ChangeFeed
+from kittens_answers_core.feeds.db import PostgresChangeFeed
+from kittens_answers_core.models import Change, ChangeKinds
+
+pytestmark = pytest.mark.anyio
+
+
+def _changes(count: int) -> list[Change]:
+    return [Change(kind=ChangeKinds.USER, uid=uuid4()) for _ in range(count)]
+
+
+async def test_batches_are_merged() -> None:
+    feed = ChangeFeed()
+    first, second = _changes(2), _changes(3)
+    with feed.subscribe() as subscription:
+        feed.broadcast(first)
+        feed.broadcast(second)
+        assert await subscription.get() == first + second
+        assert subscription.dropped == 0
+
+
+async def test_slow_subscriber_is_bounded() -> None:
+    feed = ChangeFeed()
+    changes = _changes(5)
+    with feed.subscribe() as slow, feed.subscribe(max_buffer=3) as bounded:
+        feed.broadcast(changes)
+        assert await bounded.get() == changes[2:]
+        assert bounded.dropped == 2
+        assert await slow.get() == changes
+
+
+def test_unsubscribe() -> None:
+    feed = ChangeFeed()
+    with feed.subscribe() as subscription:
+        pass
+    feed.broadcast(_changes(1))
+    assert subscription.dropped == 0
+    assert not feed._subscriptions  # pyright: ignore [reportPrivateUsage]
+
+
+async def test_postgres_feed_rejects_other_drivers() -> None:
+    with pytest.raises(ValueError, match="aiosqlite"):
+        PostgresChangeFeed("sqlite+aiosqlite://")
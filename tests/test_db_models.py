@@ -0,0 +1,12 @@
+from kittens_answers_core.models.db_models import Base, DBAnswer, partition_answers
+
+
+def test_partitioning_leaves_the_mapped_schema_alone() -> None:
+    partitioned = partition_answers(4).tables[DBAnswer.__tablename__]
+    plain = Base.metadata.tables[DBAnswer.__tablename__]
+
+    assert [column.name for column in partitioned.primary_key] == ["uid", "question_uid"]
+    assert partitioned.dialect_options["postgresql"]["partition_by"] == "HASH (question_uid)"
+    assert [column.name for column in plain.primary_key] == ["uid"]
+    assert plain.dialect_options["postgresql"]["partition_by"] is None
+    assert partition_answers(0) is Base.metadata
@@ -0,0 +1,36 @@
+import time
+from uuid import RFC_4122, uuid4
+
+from kittens_answers_core.identifiers import new_uid, set_uid_factory, uuid7, uuid7_floor
+from kittens_answers_core.models import User
+
+
+def test_uuid7_layout() -> None:
+    before = time.time_ns() // 1_000_000
+    uid = uuid7()
+    after = time.time_ns() // 1_000_000
+    assert uid.version == 7
+    assert uid.variant == RFC_4122
+    assert before <= uid.int >> 80 <= after + 1
+
+
+def test_uuid7_is_monotonic() -> None:
+    uids = [uuid7() for _ in range(10_000)]
+    assert uids == sorted(uids)
+    assert len(set(uids)) == len(uids)
+
+
+def test_uid_factory() -> None:
+    try:
+        set_uid_factory(uuid4)
+        assert new_uid().version == 4
+        assert User(foreign_id="user").uid.version == 4
+    finally:
+        set_uid_factory(uuid7)
+    assert User(foreign_id="user").uid.version == 7
+
+
+def test_uuid7_floor() -> None:
+    before = time.time()
+    uid = uuid7()
+    assert uuid7_floor(before - 1) < uid < uuid7_floor(time.time() + 1)
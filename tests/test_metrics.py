@@ -0,0 +1,60 @@
+import sys
+import tracemalloc
+
+from kittens_answers_core.metrics.base import MetricsSink, Sample
+from kittens_answers_core.metrics.profiling import AllocationTracer, deep_sizeof, footprint
+from kittens_answers_core.models import User
+
+
+def test_sink_is_bounded() -> None:
+    metrics = MetricsSink(max_samples=2)
+    for value in range(3):
+        metrics.record("latency", value, backend="memory")
+    assert metrics.drain() == [
+        Sample(name="latency", value=1, labels={"backend": "memory"}),
+        Sample(name="latency", value=2, labels={"backend": "memory"}),
+    ]
+    assert metrics.drain() == []
+
+
+def test_shared_objects_are_counted_once() -> None:
+    users = [User(foreign_id=f"user {index}") for index in range(10)]
+    index = {user.foreign_id: user for user in users}
+
+    result = footprint("user", users, [[user.model_dump_json() for user in users]], [index])
+
+    assert result.entities == len(users)
+    assert result.data_bytes == deep_sizeof(users, set())
+    assert result.backup_bytes > 0
+    # the index only adds its own table, keys and entities are already counted with the data
+    assert result.index_bytes == sys.getsizeof(index)
+
+
+def test_tracer_reports_allocation_sites() -> None:
+    tracer = AllocationTracer(top_sites=3)
+    tracer.start()
+    try:
+        retained = [str(number) * 10 for number in range(10_000)]
+        profile = tracer.stop()
+    finally:
+        tracemalloc.stop()
+
+    assert profile.allocated_bytes >= sys.getsizeof(retained)
+    assert profile.peak_bytes >= profile.allocated_bytes
+    assert __file__ in profile.sites[0].site
+    assert profile.sites[0].count >= len(retained)
+
+
+def test_tracer_stops_only_its_own_tracing() -> None:
+    tracer = AllocationTracer(top_sites=0)
+    tracer.start()
+    tracer.stop()
+    assert not tracemalloc.is_tracing()
+
+    tracemalloc.start()
+    try:
+        tracer.start()
+        tracer.stop()
+        assert tracemalloc.is_tracing()
+    finally:
+        tracemalloc.stop()
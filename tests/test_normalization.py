@@ -0,0 +1,55 @@
+import unicodedata
+
+import pytest
+
+from kittens_answers_core.normalization import TextNormalizer, casefold, similarity, trigrams
+
+
+@pytest.mark.parametrize(
+    "variant",
+    [
+        "What is the capital of France?",
+        "What is the capital of France",
+        "  What  is the\tcapital of France ?  ",
+        "What is the capital of France...",
+        "What is the capital of France…",
+        "What is the capital of France\N{FULLWIDTH QUESTION MARK}",
+    ],
+)
+def test_variants_collapse(variant: str) -> None:
+    assert TextNormalizer()(variant) == "What is the capital of France"
+
+
+def test_unicode_forms() -> None:
+    normalizer = TextNormalizer()
+    text = "Что такое «ёж» и \N{LEFT SINGLE QUOTATION MARK}café\N{RIGHT SINGLE QUOTATION MARK}?"
+    assert normalizer(unicodedata.normalize("NFD", text)) == normalizer(unicodedata.normalize("NFC", text))
+    assert normalizer(text) == 'Что такое "ёж" и \'café\''
+
+
+def test_configurable_steps() -> None:
+    assert TextNormalizer(steps=[casefold])("Hello World?") == "hello world?"
+    assert TextNormalizer(steps=[])("Hello World?") == "Hello World?"
+
+
+def test_empty_result_keeps_original() -> None:
+    assert TextNormalizer()("?") == "?"
+
+
+def test_memoized() -> None:
+    normalizer = TextNormalizer()
+    for _ in range(3):
+        normalizer("Hello  World")
+    assert normalizer._normalize.cache_info().hits == 2  # pyright: ignore [reportPrivateUsage]
+
+
+def test_trigrams() -> None:
+    assert trigrams("Cat") == {"  c", " ca", "cat", "at "}
+    assert trigrams("a-b") == {"  a", " a ", "  b", " b "}
+    assert trigrams("") == frozenset()
+
+
+def test_similarity() -> None:
+    assert similarity(trigrams("word"), trigrams("word")) == 1
+    assert similarity(trigrams("word"), trigrams("")) == 0
+    assert similarity(trigrams("word"), trigrams("two words")) == pytest.approx(4 / 11)
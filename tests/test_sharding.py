@@ -0,0 +1,14 @@
+from kittens_answers_core.repositories.sharded.router import shard_index
+from kittens_answers_core.uow import create_unit_of_work
+from kittens_answers_core.uow.sharded import ShardedUnitOfWork
+
+
+def test_shard_index_is_stable() -> None:
+    assert [shard_index("kitten", 3) for _ in range(3)] == [shard_index("kitten", 3)] * 3
+    assert {shard_index(str(key), 3) for key in range(100)} == {0, 1, 2}
+
+
+def test_from_url(db_shard_urls: list[str]) -> None:
+    uow = create_unit_of_work("sharded://" + ",".join(db_shard_urls))
+    assert isinstance(uow, ShardedUnitOfWork)
+    assert len(uow.shards) == len(db_shard_urls)
@@ -0,0 +1,38 @@
+from kittens_answers_core.filters.sketch import FrequencySketch, HotKey
+
+
+def test_estimate_never_undercounts() -> None:
+    sketch = FrequencySketch(width=64, depth=4)
+    for key in range(200):
+        for _ in range(key % 5):
+            sketch.increment(str(key))
+    assert all(sketch.estimate(str(key)) >= key % 5 for key in range(200))
+
+
+def test_top_and_admission() -> None:
+    sketch = FrequencySketch(width=256, depth=4, top_k=3)
+    for key, count in {"a": 50, "b": 40, "c": 30, "d": 20, "e": 1}.items():
+        for _ in range(count):
+            sketch.increment(key)
+    assert [hot_key.key for hot_key in sketch.top()] == ["a", "b", "c"]
+    assert sketch.admit("d", "e")
+    assert not sketch.admit("e", "a")
+
+
+def test_aging() -> None:
+    sketch = FrequencySketch(width=8, depth=2)
+    for _ in range(sketch.sample_size):
+        sketch.increment("hot")
+    assert sketch.estimate("hot") == sketch.sample_size // 2
+    assert sketch.additions == sketch.sample_size // 2
+
+
+def test_dump_and_load() -> None:
+    sketch = FrequencySketch(top_k=2)
+    for key, count in {"a": 5, "b": 3, "c": 1}.items():
+        for _ in range(count):
+            sketch.increment(key)
+    fresh = FrequencySketch(top_k=2)
+    fresh.load(sketch.top())
+    assert fresh.top() == [HotKey(key="a", frequency=5), HotKey(key="b", frequency=3)]
+    assert fresh.admit("a", "c")
@@ -1,4 +1,6 @@
 from collections.abc import AsyncGenerator
+from pathlib import Path
+from typing import Final
 from uuid import UUID
 
 import pytest
@@ -9,6 +11,8 @@ from kittens_answers_core.models import Answer, Question, QuestionTypes, User
 from kittens_answers_core.models.db_models import Base
 from kittens_answers_core.uow.db import SQLAlchemyUnitOfWork
 from kittens_answers_core.uow.memory import MemoryUnitOfWork
+from kittens_answers_core.uow.sharded import ShardedUnitOfWork
+from kittens_answers_core.uow.sqlite import SQLiteUnitOfWork
 from tests.uow.fixture_types import (
     AnswerDataDict,
     AnswerDataFactory,
@@ -17,6 +21,7 @@ from tests.uow.fixture_types import (
     QuestionDataFactory,
     QuestionFactory,
     UIDFactory,
+    UOWFactory,
     UOWTypes,
     UserDataDict,
     UserDataFactory,
@@ -24,6 +29,8 @@ from tests.uow.fixture_types import (
 )
 from tests.uow.providers import AnswerProvider
 
+ASYNCPG: Final[str] = "asyncpg"
+
 
 @pytest.fixture
 def mimesis_field() -> Field:
@@ -34,27 +41,61 @@ def pytest_generate_tests(metafunc: pytest.Metafunc) -> None:
     uow_list = [
         MemoryUnitOfWork,
         SQLAlchemyUnitOfWork,
+        ASYNCPG,
+        SQLiteUnitOfWork,
+        ShardedUnitOfWork,
     ]
     if uow.__name__ in metafunc.fixturenames:
         metafunc.parametrize(uow.__name__, uow_list, indirect=True)
 
 
 @pytest.fixture
-async def uow(db_container_url: str, request: pytest.FixtureRequest) -> AsyncGenerator[UOWTypes, None]:
+async def uow(
+    db_container_url: str, db_shard_urls: list[str], tmp_path: Path, request: pytest.FixtureRequest
+) -> AsyncGenerator[UOWTypes, None]:
     if request.param == MemoryUnitOfWork:
         yield MemoryUnitOfWork()
-    elif request.param == SQLAlchemyUnitOfWork:
+    elif request.param in (SQLAlchemyUnitOfWork, ASYNCPG):
+        if request.param == ASYNCPG:
+            db_container_url = db_container_url.replace("+psycopg", "+asyncpg", 1)
         _uow = SQLAlchemyUnitOfWork(db_url=db_container_url)
         async with _uow._engine.begin() as connection:  # pyright: ignore [reportPrivateUsage]
             await connection.run_sync(Base.metadata.create_all)
         yield _uow
         async with _uow._engine.begin() as connection:  # pyright: ignore [reportPrivateUsage]
             await connection.run_sync(Base.metadata.drop_all)
+        await _uow._engine.dispose()  # pyright: ignore [reportPrivateUsage]
+    elif request.param == SQLiteUnitOfWork:
+        _sqlite_uow = SQLiteUnitOfWork(f"sqlite+aiosqlite:///{tmp_path / 'answers.db'}")
+        async with _sqlite_uow._engine.begin() as connection:  # pyright: ignore [reportPrivateUsage]
+            await connection.run_sync(Base.metadata.create_all)
+        yield _sqlite_uow
+        await _sqlite_uow._engine.dispose()  # pyright: ignore [reportPrivateUsage]
+    elif request.param == ShardedUnitOfWork:
+        _sharded_uow = ShardedUnitOfWork(db_shard_urls)
+        for shard in _sharded_uow.shards:
+            async with shard._engine.begin() as connection:  # pyright: ignore [reportPrivateUsage]
+                await connection.run_sync(Base.metadata.create_all)
+        yield _sharded_uow
+        for shard in _sharded_uow.shards:
+            async with shard._engine.begin() as connection:  # pyright: ignore [reportPrivateUsage]
+                await connection.run_sync(Base.metadata.drop_all)
     else:
         msg = "invalid uow type in test config"
         raise ValueError(msg)
 
 
+@pytest.fixture
+def uow_factory(uow: UOWTypes) -> UOWFactory:
+    if isinstance(uow, SQLAlchemyUnitOfWork):
+        return lambda: type(uow)(uow._engine)  # pyright: ignore [reportPrivateUsage]
+    if isinstance(uow, ShardedUnitOfWork):
+        return lambda: ShardedUnitOfWork(
+            [shard._engine for shard in uow.shards]  # pyright: ignore [reportPrivateUsage]
+        )
+    return lambda: uow
+
+
 @pytest.fixture
 def user_data_factory(mimesis_field: Field) -> UserDataFactory:
     return lambda: UserDataDict(foreign_id=mimesis_field("increment", key=str))
@@ -5,8 +5,11 @@ from uuid import UUID
 from kittens_answers_core.models import Answer, Question, QuestionTypes, User
 from kittens_answers_core.uow.db import SQLAlchemyUnitOfWork
 from kittens_answers_core.uow.memory import MemoryUnitOfWork
+from kittens_answers_core.uow.sharded import ShardedUnitOfWork
+from kittens_answers_core.uow.sqlite import SQLiteUnitOfWork
 
-UOWTypes: TypeAlias = MemoryUnitOfWork | SQLAlchemyUnitOfWork
+UOWTypes: TypeAlias = MemoryUnitOfWork | SQLAlchemyUnitOfWork | SQLiteUnitOfWork | ShardedUnitOfWork
+UOWFactory: TypeAlias = Callable[[], UOWTypes]
 
 
 class UserDataDict(TypedDict):
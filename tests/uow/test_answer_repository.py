@@ -1,10 +1,31 @@
+import re
+from collections.abc import AsyncGenerator
+from uuid import uuid4
+
 import pytest
+from sqlalchemy import text
 
 from kittens_answers_core.errors import (
     AnswerAlreadyExistError,
     AnswerDoesNotExistError,
+    QuestionDoesNotExistError,
+)
+from kittens_answers_core.models import Answer, AnswerSubmission, Question, QuestionTypes
+from kittens_answers_core.models.db_models import Base, DBAnswer, partition_answers
+from kittens_answers_core.uow.db import SQLAlchemyUnitOfWork
+from kittens_answers_core.uow.memory import MemoryUnitOfWork
+from kittens_answers_core.uow.sharded import ShardedUnitOfWork
+from kittens_answers_core.uow.sqlite import SQLiteUnitOfWork
+from tests.uow.fixture_types import (
+    AnswerDataDict,
+    AnswerDataFactory,
+    AnswerFactory,
+    QuestionDataFactory,
+    QuestionFactory,
+    UIDFactory,
+    UOWTypes,
+    UserFactory,
 )
-from tests.uow.fixture_types import AnswerDataFactory, AnswerFactory, QuestionFactory, UIDFactory, UOWTypes, UserFactory
 
 pytestmark = pytest.mark.anyio
 
@@ -43,6 +64,41 @@ class TestCreate:
                 )
                 await uow.commit()
 
+    async def test_duplicates_keep_transaction(
+        self,
+        uow: UOWTypes,
+        answer_factory: AnswerFactory,
+        answer_data_factory: AnswerDataFactory,
+        question_data_factory: QuestionDataFactory,
+        question_factory: QuestionFactory,
+    ) -> None:
+        answer_in_db = await answer_factory()
+        questions = [
+            await question_factory(
+                question_data={**question_data_factory(), "question_text": str(uuid4())}, user_uid=answer_in_db.creator
+            )
+            for _ in range(3)
+        ]
+        created = []
+        async with uow:
+            for question in questions:
+                with pytest.raises(AnswerAlreadyExistError):
+                    await uow.answer_services.create(
+                        answer=answer_in_db.answer,
+                        extra_answer=answer_in_db.extra_answer,
+                        question_uid=answer_in_db.question_uid,
+                        creator_id=answer_in_db.creator,
+                        is_correct=answer_in_db.is_correct,
+                    )
+                created.append(
+                    await uow.answer_services.create(creator_id=answer_in_db.creator, **answer_data_factory(question))
+                )
+            await uow.commit()
+
+        async with uow:
+            for answer in created:
+                assert await uow.answer_services.get_by_uid(answer_uid=answer.uid) == answer
+
 
 class TestGetByUID:
     async def test_if_not_in_db(self, uow: UOWTypes, uid_factory: UIDFactory) -> None:
@@ -61,6 +117,29 @@ class TestGetByUID:
         assert answer == answer_in_db
 
 
+class TestGetManyByUID:
+    async def test_skips_missing(
+        self,
+        uow: UOWTypes,
+        answer_factory: AnswerFactory,
+        question_factory: QuestionFactory,
+        question_data_factory: QuestionDataFactory,
+        uid_factory: UIDFactory,
+    ) -> None:
+        answers = [
+            await answer_factory(
+                question=await question_factory(
+                    question_data={**question_data_factory(), "question_text": str(uuid4())}
+                )
+            )
+            for _ in range(3)
+        ]
+        async with uow:
+            found = await uow.answer_services.get_many_by_uid([answer.uid for answer in answers] + [uid_factory()])
+
+        assert sorted(found, key=lambda answer: answer.uid) == sorted(answers, key=lambda answer: answer.uid)
+
+
 class TestGet:
     async def test_if_not_in_db(
         self,
@@ -93,3 +172,372 @@ class TestGet:
             answer = await uow.answer_services.get(**answer_data)
 
         assert answer == answer_in_db
+
+
+class TestListForQuestion:
+    async def test_if_not_in_db(self, uow: UOWTypes, uid_factory: UIDFactory) -> None:
+        async with uow:
+            answers = await uow.answer_services.list_for_question(question_uid=uid_factory())
+        assert answers == []
+
+    async def test_pagination(
+        self,
+        uow: UOWTypes,
+        user_factory: UserFactory,
+        question_factory: QuestionFactory,
+        answer_factory: AnswerFactory,
+    ) -> None:
+        user = await user_factory()
+        question = await question_factory(user_uid=user.uid)
+        answers_in_db = [
+            await answer_factory(
+                answer_data=AnswerDataDict(
+                    answer=[str(index)], extra_answer=[], is_correct=index % 2 == 0, question_uid=question.uid
+                ),
+                question=question,
+                user_uid=user.uid,
+            )
+            for index in range(5)
+        ]
+
+        pages = []
+        after = None
+        async with uow:
+            while page := await uow.answer_services.list_for_question(question_uid=question.uid, after=after, limit=2):
+                pages.append(page)
+                after = page[-1].uid
+
+        assert [len(page) for page in pages] == [2, 2, 1]
+        assert [answer for page in pages for answer in page] == sorted(answers_in_db, key=lambda answer: answer.uid)
+
+    async def test_is_correct(
+        self,
+        uow: UOWTypes,
+        user_factory: UserFactory,
+        question_factory: QuestionFactory,
+        answer_factory: AnswerFactory,
+    ) -> None:
+        user = await user_factory()
+        question = await question_factory(user_uid=user.uid)
+        for index in range(4):
+            await answer_factory(
+                answer_data=AnswerDataDict(
+                    answer=[str(index)], extra_answer=[], is_correct=index % 2 == 0, question_uid=question.uid
+                ),
+                question=question,
+                user_uid=user.uid,
+            )
+
+        async with uow:
+            answers = await uow.answer_services.list_for_question(question_uid=question.uid, is_correct=True)
+
+        assert len(answers) == 2
+        assert all(answer.is_correct for answer in answers)
+
+
+class TestStatistics:
+    @pytest.fixture
+    async def question(
+        self,
+        user_factory: UserFactory,
+        question_factory: QuestionFactory,
+        answer_factory: AnswerFactory,
+    ) -> Question:
+        user = await user_factory()
+        question = await question_factory(user_uid=user.uid)
+        for answer, is_correct in [("a", True), ("a", False), ("b", True), ("c", False)]:
+            await answer_factory(
+                answer_data=AnswerDataDict(
+                    answer=[answer], extra_answer=[], is_correct=is_correct, question_uid=question.uid
+                ),
+                question=question,
+                user_uid=user.uid,
+            )
+        return question
+
+    async def test_if_not_in_db(self, uow: UOWTypes, uid_factory: UIDFactory) -> None:
+        async with uow:
+            statistics = await uow.answer_services.get_statistics(question_uid=uid_factory())
+        assert statistics == []
+
+    async def test_ranking(self, uow: UOWTypes, question: Question) -> None:
+        async with uow:
+            statistics = await uow.answer_services.get_statistics(question_uid=question.uid)
+        assert [(statistic.answer, statistic.correct_count, statistic.incorrect_count) for statistic in statistics] == [
+            (["b"], 1, 0),
+            (["a"], 1, 1),
+            (["c"], 0, 1),
+        ]
+
+    async def test_rollback(self, uow: UOWTypes, user_factory: UserFactory, question: Question) -> None:
+        user = await user_factory()
+        async with uow:
+            statistics = await uow.answer_services.get_statistics(question_uid=question.uid)
+            await uow.answer_services.create(
+                answer=["c"], extra_answer=[], question_uid=question.uid, creator_id=user.uid, is_correct=True
+            )
+        async with uow:
+            assert await uow.answer_services.get_statistics(question_uid=question.uid) == statistics
+
+    async def test_rebuild(self, uow: UOWTypes, question: Question) -> None:
+        async with uow:
+            statistics = await uow.answer_services.get_statistics(question_uid=question.uid)
+            await uow.answer_services.rebuild_statistics()
+            await uow.commit()
+        async with uow:
+            assert await uow.answer_services.get_statistics(question_uid=question.uid) == statistics
+
+
+class TestCanonicalization:
+    @pytest.mark.parametrize("question_type", [QuestionTypes.ONE, QuestionTypes.MANY])
+    async def test_unordered(
+        self,
+        uow: UOWTypes,
+        question_type: QuestionTypes,
+        user_factory: UserFactory,
+        question_factory: QuestionFactory,
+        question_data_factory: QuestionDataFactory,
+    ) -> None:
+        user = await user_factory()
+        question = await question_factory(question_data_factory(question_type=question_type), user_uid=user.uid)
+        async with uow:
+            answer = await uow.answer_services.create(
+                answer=["b", "a"], extra_answer=[], question_uid=question.uid, creator_id=user.uid, is_correct=True
+            )
+            await uow.commit()
+
+        async with uow:
+            assert answer == await uow.answer_services.get(
+                answer=["a", "b"], extra_answer=[], question_uid=question.uid, is_correct=True
+            )
+        with pytest.raises(AnswerAlreadyExistError):
+            async with uow:
+                await uow.answer_services.create(
+                    answer=["a", "b"], extra_answer=[], question_uid=question.uid, creator_id=user.uid, is_correct=True
+                )
+
+    @pytest.mark.parametrize("question_type", [QuestionTypes.ORDER, QuestionTypes.MATCH])
+    async def test_ordered(
+        self,
+        uow: UOWTypes,
+        question_type: QuestionTypes,
+        user_factory: UserFactory,
+        question_factory: QuestionFactory,
+        question_data_factory: QuestionDataFactory,
+    ) -> None:
+        user = await user_factory()
+        question = await question_factory(question_data_factory(question_type=question_type), user_uid=user.uid)
+        async with uow:
+            for answer in (["b", "a"], ["a", "b"]):
+                await uow.answer_services.create(
+                    answer=answer, extra_answer=[], question_uid=question.uid, creator_id=user.uid, is_correct=True
+                )
+            await uow.commit()
+
+        async with uow:
+            answers = await uow.answer_services.list_for_question(question_uid=question.uid)
+        assert sorted(answer.answer for answer in answers) == [["a", "b"], ["b", "a"]]
+
+    async def test_merge_duplicates(
+        self,
+        uow: UOWTypes,
+        user_factory: UserFactory,
+        question_factory: QuestionFactory,
+        question_data_factory: QuestionDataFactory,
+    ) -> None:
+        user = await user_factory()
+        question = await question_factory(question_data_factory(question_type=QuestionTypes.MANY), user_uid=user.uid)
+        async with uow:
+            if isinstance(uow, ShardedUnitOfWork):
+                index = (await uow.router.locate_questions([question.uid]))[question.uid]
+                await uow.router.reference_users({index: {user.uid}})
+                shard = uow.shards[index]
+            for answer in (["b", "a"], ["a", "b"], ["c", "a"]):
+                if isinstance(uow, MemoryUnitOfWork):
+                    uow.answer_services.data.append(
+                        Answer(
+                            creator=user.uid, question_uid=question.uid, answer=answer, extra_answer=[], is_correct=True
+                        )
+                    )
+                else:
+                    session = shard.session if isinstance(uow, ShardedUnitOfWork) else uow.session
+                    session.add(
+                        DBAnswer(
+                            uid=uuid4(),
+                            creator_id=user.uid,
+                            question_uid=question.uid,
+                            answer=answer,
+                            extra_answer=[],
+                            is_correct=True,
+                        )
+                    )
+                    await session.flush()
+            await uow.commit()
+
+        async with uow:
+            merged = await uow.answer_services.merge_duplicates()
+            await uow.commit()
+
+        async with uow:
+            answers = await uow.answer_services.list_for_question(question_uid=question.uid)
+            statistics = await uow.answer_services.get_statistics(question_uid=question.uid)
+        assert merged == 1
+        assert sorted(answer.answer for answer in answers) == [["a", "b"], ["a", "c"]]
+        assert sorted(statistic.answer for statistic in statistics) == [["a", "b"], ["a", "c"]]
+
+
+class TestCreateMany:
+    async def test_created_and_duplicates(
+        self,
+        uow: UOWTypes,
+        user_factory: UserFactory,
+        question_factory: QuestionFactory,
+        question_data_factory: QuestionDataFactory,
+        answer_factory: AnswerFactory,
+    ) -> None:
+        user = await user_factory()
+        question = await question_factory(question_data_factory(question_type=QuestionTypes.MANY), user_uid=user.uid)
+        answer_in_db = await answer_factory(
+            answer_data=AnswerDataDict(answer=["a"], extra_answer=[], is_correct=True, question_uid=question.uid),
+            question=question,
+            user_uid=user.uid,
+        )
+        submissions = [
+            AnswerSubmission(
+                creator=user.uid, question_uid=question.uid, answer=answer, extra_answer=[], is_correct=True
+            )
+            for answer in (["b", "a"], ["a", "b"], ["a"], ["c"])
+        ]
+        async with uow:
+            results = await uow.answer_services.create_many(submissions)
+            await uow.commit()
+
+        assert [result.created for result in results] == [True, False, False, True]
+        assert results[0].answer == results[1].answer
+        assert results[0].answer.answer == ["a", "b"]
+        assert results[2].answer == answer_in_db
+        async with uow:
+            assert len(await uow.answer_services.list_for_question(question_uid=question.uid)) == 3
+            statistics = await uow.answer_services.get_statistics(question_uid=question.uid)
+        assert sorted((statistic.answer, statistic.correct_count) for statistic in statistics) == [
+            (["a"], 1),
+            (["a", "b"], 1),
+            (["c"], 1),
+        ]
+
+    async def test_unknown_question(self, uow: UOWTypes, user_factory: UserFactory, uid_factory: UIDFactory) -> None:
+        user = await user_factory()
+        with pytest.raises(QuestionDoesNotExistError):
+            async with uow:
+                await uow.answer_services.create_many(
+                    [
+                        AnswerSubmission(
+                            creator=user.uid, question_uid=uid_factory(), answer=["a"], extra_answer=[], is_correct=True
+                        )
+                    ]
+                )
+
+
+class TestPartitioning:
+    @pytest.fixture
+    async def partitioned(self, uow: UOWTypes) -> AsyncGenerator[None, None]:
+        if not isinstance(uow, SQLAlchemyUnitOfWork) or isinstance(uow, SQLiteUnitOfWork):
+            pytest.skip("only postgres partitions tables")
+        async with uow._engine.begin() as connection:  # pyright: ignore [reportPrivateUsage]
+            await connection.run_sync(Base.metadata.drop_all)
+            # a clean database, the partitioned schema installs pg_trgm itself
+            await connection.execute(text("DROP EXTENSION pg_trgm"))
+            await connection.run_sync(partition_answers(4).create_all)
+        yield
+        async with uow._engine.begin() as connection:  # pyright: ignore [reportPrivateUsage]
+            await connection.run_sync(Base.metadata.drop_all)
+            await connection.run_sync(Base.metadata.create_all)
+
+    @pytest.mark.usefixtures("partitioned")
+    async def test_repository_on_partitions(
+        self, uow: UOWTypes, user_factory: UserFactory, question_factory: QuestionFactory
+    ) -> None:
+        if not isinstance(uow, SQLAlchemyUnitOfWork) or isinstance(uow, SQLiteUnitOfWork):
+            pytest.skip("only postgres partitions tables")
+        user = await user_factory()
+        questions = [
+            await question_factory(
+                {
+                    "question_type": QuestionTypes.MANY,
+                    "question_text": str(uuid4()),
+                    "options": set(),
+                    "extra_options": set(),
+                },
+                user_uid=user.uid,
+            )
+            for _ in range(8)
+        ]
+        async with uow:
+            results = await uow.answer_services.create_many(
+                [
+                    AnswerSubmission(
+                        creator=user.uid, question_uid=question.uid, answer=["b", "a"], extra_answer=[], is_correct=True
+                    )
+                    for question in questions
+                ]
+            )
+            await uow.commit()
+
+        async with uow:
+            partitions = await uow.session.scalar(
+                text("SELECT count(*) FROM pg_inherits WHERE inhparent = 'answers'::regclass")
+            )
+            plan = (
+                await uow.session.scalars(
+                    text("EXPLAIN (COSTS OFF) SELECT uid FROM answers WHERE question_uid = :question_uid"),
+                    {"question_uid": questions[0].uid},
+                )
+            ).all()
+            answer = results[0].answer
+            assert await uow.answer_services.get_by_uid(answer.uid) == answer
+            assert await uow.answer_services.list_for_question(questions[0].uid) == [answer]
+            assert await uow.answer_services.merge_duplicates() == 0
+
+        assert partitions == 4
+        assert len({match for line in plan for match in re.findall(r"answers_p\d+", line)}) == 1
+
+
+class TestListByCreator:
+    async def test_pages(
+        self,
+        uow: UOWTypes,
+        user_factory: UserFactory,
+        question_factory: QuestionFactory,
+        answer_factory: AnswerFactory,
+    ) -> None:
+        user = await user_factory()
+        questions = [await question_factory() for _ in range(3)]
+        created = [
+            await answer_factory(
+                answer_data=AnswerDataDict(
+                    answer=[str(index)], extra_answer=[], is_correct=True, question_uid=question.uid
+                ),
+                question=question,
+                user_uid=user.uid,
+            )
+            for question in questions
+            for index in range(2)
+        ]
+        await answer_factory(
+            answer_data=AnswerDataDict(
+                answer=["other"], extra_answer=[], is_correct=True, question_uid=questions[0].uid
+            ),
+            question=questions[0],
+        )
+
+        listed: list[Answer] = []
+        async with uow:
+            while page := await uow.answer_services.list_by_creator(
+                user.uid, listed[-1].uid if listed else None, limit=4
+            ):
+                assert len(page) <= 4
+                listed.extend(page)
+            counts = await uow.answer_services.count_by_creator([user.uid])
+
+        assert listed == sorted(created, key=lambda answer: answer.uid)
+        assert counts == {user.uid: len(created)}
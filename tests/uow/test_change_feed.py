@@ -0,0 +1,66 @@
+import asyncio
+from collections.abc import AsyncGenerator
+
+import pytest
+
+from kittens_answers_core.feeds.base import ChangeFeed
+from kittens_answers_core.feeds.db import PostgresChangeFeed
+from kittens_answers_core.models import ChangeKinds
+from kittens_answers_core.uow.db import SQLAlchemyUnitOfWork
+from kittens_answers_core.uow.sqlite import SQLiteUnitOfWork
+from tests.uow.fixture_types import AnswerDataFactory, QuestionDataFactory, UOWTypes, UserDataFactory
+
+pytestmark = pytest.mark.anyio
+
+
+@pytest.fixture
+async def feed(uow: UOWTypes) -> AsyncGenerator[ChangeFeed, None]:
+    if isinstance(uow, SQLAlchemyUnitOfWork) and not isinstance(uow, SQLiteUnitOfWork):
+        url = uow._engine.url  # pyright: ignore [reportPrivateUsage]
+        async with PostgresChangeFeed(url.render_as_string(hide_password=False)) as postgres_feed:
+            uow.feed = postgres_feed
+            yield postgres_feed
+    else:
+        uow.feed = ChangeFeed()
+        yield uow.feed
+
+
+class TestChangeFeed:
+    async def test_published_after_commit(
+        self,
+        uow: UOWTypes,
+        feed: ChangeFeed,
+        user_data_factory: UserDataFactory,
+        question_data_factory: QuestionDataFactory,
+        answer_data_factory: AnswerDataFactory,
+    ) -> None:
+        with feed.subscribe() as subscription:
+            async with uow:
+                user = await uow.user_services.create(**user_data_factory())
+                question = await uow.question_services.create(creator_id=user.uid, **question_data_factory())
+                answer = await uow.answer_services.create(creator_id=user.uid, **answer_data_factory(question))
+                await uow.commit()
+
+            async with asyncio.timeout(5):
+                changes = await subscription.get()
+
+        assert [(change.kind, change.uid) for change in changes] == [
+            (ChangeKinds.USER, user.uid),
+            (ChangeKinds.QUESTION, question.uid),
+            (ChangeKinds.ANSWER, answer.uid),
+        ]
+
+    async def test_rollback_is_not_published(
+        self, uow: UOWTypes, feed: ChangeFeed, user_data_factory: UserDataFactory
+    ) -> None:
+        with feed.subscribe() as subscription:
+            async with uow:
+                await uow.user_services.create(**user_data_factory())
+            async with uow:
+                user = await uow.user_services.create(**user_data_factory())
+                await uow.commit()
+
+            async with asyncio.timeout(5):
+                changes = await subscription.get()
+
+        assert [(change.kind, change.uid) for change in changes] == [(ChangeKinds.USER, user.uid)]
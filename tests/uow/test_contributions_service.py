@@ -0,0 +1,28 @@
+import pytest
+
+from kittens_answers_core.services.contributions import UserContributions, count_contributions
+from tests.uow.fixture_types import AnswerDataDict, AnswerFactory, QuestionFactory, UOWTypes, UserFactory
+
+pytestmark = pytest.mark.anyio
+
+
+async def test_count_contributions(
+    uow: UOWTypes, user_factory: UserFactory, question_factory: QuestionFactory, answer_factory: AnswerFactory
+) -> None:
+    author, voter, idle = await user_factory(), await user_factory(), await user_factory()
+    question = await question_factory(user_uid=author.uid)
+    await question_factory(user_uid=author.uid)
+    for index, user in enumerate((author, voter, voter, voter)):
+        await answer_factory(
+            answer_data=AnswerDataDict(
+                answer=[str(index)], extra_answer=[], is_correct=True, question_uid=question.uid
+            ),
+            question=question,
+            user_uid=user.uid,
+        )
+
+    assert await count_contributions(uow, [author.uid, voter.uid, idle.uid, author.uid]) == [
+        UserContributions(user_uid=author.uid, questions=2, answers=1),
+        UserContributions(user_uid=voter.uid, questions=0, answers=3),
+        UserContributions(user_uid=idle.uid),
+    ]
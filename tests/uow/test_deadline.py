@@ -0,0 +1,71 @@
+import asyncio
+
+import pytest
+from sqlalchemy import text
+
+from kittens_answers_core.errors import ServiceTimeoutError, UserDoesNotExistError
+from kittens_answers_core.uow.db import SQLAlchemyUnitOfWork
+from kittens_answers_core.uow.sqlite import DEFAULT_PRAGMAS, SQLiteUnitOfWork
+from tests.uow.fixture_types import UOWTypes, UserDataFactory
+
+pytestmark = pytest.mark.anyio
+
+
+class TestDeadline:
+    async def test_within_deadline(self, uow: UOWTypes, user_data_factory: UserDataFactory) -> None:
+        user_data = user_data_factory()
+        async with uow.with_timeout(5) as bounded:
+            user = await bounded.user_services.create(**user_data)
+            await bounded.commit()
+
+        async with uow:
+            assert await uow.user_services.get_by_foreign_id(foreign_id=user_data["foreign_id"]) == user
+
+    async def test_expired(self, uow: UOWTypes, user_data_factory: UserDataFactory) -> None:
+        user_data = user_data_factory()
+        with pytest.raises(ServiceTimeoutError):
+            async with uow.with_timeout(0.01) as bounded:
+                await bounded.user_services.create(**user_data)
+                await asyncio.sleep(1)
+                await bounded.commit()
+
+        with pytest.raises(UserDoesNotExistError):
+            async with uow:
+                await uow.user_services.get_by_foreign_id(foreign_id=user_data["foreign_id"])
+
+    async def test_statement_timeout(self, uow: UOWTypes) -> None:
+        if not isinstance(uow, SQLAlchemyUnitOfWork) or isinstance(uow, SQLiteUnitOfWork):
+            pytest.skip("only postgres has statement timeouts")
+        with pytest.raises(ServiceTimeoutError):
+            async with uow:
+                await uow.session.execute(text("SET LOCAL statement_timeout = 10"))
+                await uow.session.execute(text("SELECT pg_sleep(1)"))
+
+    async def test_slow_query(self, uow: UOWTypes, user_data_factory: UserDataFactory) -> None:
+        if not isinstance(uow, SQLAlchemyUnitOfWork) or isinstance(uow, SQLiteUnitOfWork):
+            pytest.skip("only postgres has statement timeouts")
+        with pytest.raises(ServiceTimeoutError):
+            async with uow.with_timeout(0.1) as bounded:
+                await bounded.session.execute(text("SELECT pg_sleep(1)"))
+
+        async with uow:
+            assert await uow.user_services.create(**user_data_factory())
+
+    async def test_reader_timeout(self, uow: UOWTypes) -> None:
+        if not isinstance(uow, SQLAlchemyUnitOfWork) or isinstance(uow, SQLiteUnitOfWork):
+            pytest.skip("only postgres has statement timeouts")
+        async with uow.with_timeout(5).reader() as reader:
+            assert await reader.session.scalar(text("SHOW statement_timeout")) == "5s"
+            assert await reader.session.scalar(text("SHOW transaction_read_only")) == "on"
+
+        async with uow.reader() as reader:
+            assert await reader.session.scalar(text("SHOW statement_timeout")) == "0"
+
+    async def test_busy_timeout_is_restored(self, uow: UOWTypes) -> None:
+        if not isinstance(uow, SQLiteUnitOfWork):
+            pytest.skip("only sqlite bounds lock waits with a pragma")
+        async with uow.with_timeout(0.5) as bounded:
+            assert await bounded.session.scalar(text("PRAGMA busy_timeout")) == 500
+
+        async with uow:
+            assert await uow.session.scalar(text("PRAGMA busy_timeout")) == DEFAULT_PRAGMAS["busy_timeout"]
@@ -0,0 +1,97 @@
+from pathlib import Path
+from uuid import UUID
+
+import pyarrow as pa
+import pyarrow.parquet as pq
+import pytest
+
+from kittens_answers_core.models import QuestionTypes
+from kittens_answers_core.services.export import SCHEMAS, ExportEntities, export_batches, export_parquet
+from tests.uow.fixture_types import (
+    AnswerDataDict,
+    AnswerFactory,
+    QuestionDataDict,
+    QuestionFactory,
+    UOWTypes,
+    UserFactory,
+)
+
+pytestmark = pytest.mark.anyio
+
+
+class TestExport:
+    async def test_batches(self, uow: UOWTypes, user_factory: UserFactory) -> None:
+        for _ in range(5):
+            await user_factory()
+        async with uow:
+            users = await uow.user_services.scan(limit=1_000)
+
+        batches = [batch async for batch in export_batches(uow, ExportEntities.USERS, batch_size=2)]
+
+        assert [batch.num_rows for batch in batches] == [2] * (len(users) // 2) + [1] * (len(users) % 2)
+        table = pa.Table.from_batches(batches)
+        assert table.schema == SCHEMAS[ExportEntities.USERS]
+        assert [UUID(bytes=uid) for uid in table.column("uid").to_pylist()] == [user.uid for user in users]
+        assert table.column("foreign_id").to_pylist() == [user.foreign_id for user in users]
+
+    async def test_parquet(
+        self,
+        uow: UOWTypes,
+        question_factory: QuestionFactory,
+        answer_factory: AnswerFactory,
+        tmp_path: Path,
+    ) -> None:
+        questions = [
+            await question_factory(
+                QuestionDataDict(
+                    question_type=QuestionTypes.MANY,
+                    question_text=f"exported question {index}",
+                    options={"answer 0", "answer 1"},
+                    extra_options=set(),
+                )
+            )
+            for index in range(3)
+        ]
+        answers = [
+            await answer_factory(
+                answer_data=AnswerDataDict(
+                    answer=[f"answer {index}"], extra_answer=[], is_correct=index == 0, question_uid=question.uid
+                ),
+                question=question,
+            )
+            for question in questions
+            for index in range(2)
+        ]
+
+        async with uow:
+            users = await uow.user_services.scan(limit=1_000)
+            scanned = await uow.question_services.scan(limit=1_000)
+
+        runs = await export_parquet(uow, tmp_path, batch_size=4)
+
+        assert [(run.entity, run.path) for run in runs] == [
+            (entity, tmp_path / f"{entity}.parquet") for entity in ExportEntities
+        ]
+        assert runs[0].rows == len(users)
+        assert runs[1].rows == len(scanned)
+        assert runs[1].batches == -(-len(scanned) // 4)
+        assert all(run.rows_per_second > 0 for run in runs)
+        exported = pq.read_table(tmp_path / "questions.parquet")
+        assert exported.schema.field("options").type == SCHEMAS[ExportEntities.QUESTIONS].field("options").type
+        by_uid = {UUID(bytes=row["uid"]): row for row in exported.to_pylist()}
+        for question in questions:
+            row = by_uid[question.uid]
+            assert UUID(bytes=row["creator"]) == question.creator
+            assert row["question_type"] == question.question_type
+            assert set(row["options"]) == question.options
+            assert set(row["extra_options"]) == question.extra_options
+        by_uid = {UUID(bytes=row["uid"]): row for row in pq.read_table(tmp_path / "answers.parquet").to_pylist()}
+        assert len(by_uid) == runs[2].rows
+        for answer in answers:
+            row = by_uid[answer.uid]
+            assert UUID(bytes=row["question_uid"]) == answer.question_uid
+            assert (row["answer"], row["extra_answer"], row["is_correct"]) == (
+                answer.answer,
+                answer.extra_answer,
+                answer.is_correct,
+            )
@@ -0,0 +1,54 @@
+import pytest
+
+from kittens_answers_core.errors import QuestionDoesNotExistError
+from kittens_answers_core.filters.sketch import HotKeyTracker
+from kittens_answers_core.services.warming import warm
+from tests.uow.fixture_types import AnswerFactory, QuestionFactory, UIDFactory, UOWTypes
+
+pytestmark = pytest.mark.anyio
+
+
+class TestHotKeys:
+    async def test_hits_are_counted(
+        self, uow: UOWTypes, question_factory: QuestionFactory, answer_factory: AnswerFactory, uid_factory: UIDFactory
+    ) -> None:
+        hot, cold = await question_factory(), await question_factory()
+        answer = await answer_factory(question=hot)
+        tracker = HotKeyTracker(top_k=2)
+        uow.track_hot_keys(tracker)
+        async with uow:
+            for _ in range(3):
+                await uow.question_services.get_by_uid(hot.uid)
+            await uow.question_services.get(hot.question_type, hot.text, hot.options, hot.extra_options)
+            await uow.question_services.get_by_uid(cold.uid)
+            await uow.answer_services.get(
+                answer.answer, answer.extra_answer, answer.question_uid, is_correct=answer.is_correct
+            )
+            with pytest.raises(QuestionDoesNotExistError):
+                await uow.question_services.get_by_uid(uid_factory())
+
+        hot_set = tracker.dump()
+        assert [(hot_key.key, hot_key.frequency) for hot_key in hot_set.questions] == [
+            (str(hot.uid), 4),
+            (str(cold.uid), 1),
+        ]
+        assert [hot_key.key for hot_key in hot_set.answers] == [str(answer.uid)]
+
+    async def test_warm(self, uow: UOWTypes, question_factory: QuestionFactory, answer_factory: AnswerFactory) -> None:
+        question = await question_factory()
+        answer = await answer_factory(question=question)
+        tracker = HotKeyTracker()
+        uow.track_hot_keys(tracker)
+        async with uow:
+            await uow.question_services.get_by_uid(question.uid)
+            await uow.answer_services.get_by_uid(answer.uid)
+        hot_set = tracker.dump()
+
+        uow.track_hot_keys(HotKeyTracker())
+        warm_set = await warm(uow, hot_set)
+
+        assert warm_set.questions == [question]
+        assert warm_set.answers == [answer]
+        assert uow.hot_keys is not None
+        # warming loads the saved frequencies without counting its own reads
+        assert uow.hot_keys.dump() == hot_set
@@ -0,0 +1,121 @@
+import asyncio
+
+import pytest
+from sqlalchemy.exc import IntegrityError
+
+from kittens_answers_core.errors import QuestionDoesNotExistError, UserDoesNotExistError
+from kittens_answers_core.feeds.base import ChangeFeed
+from kittens_answers_core.filters.lookup import LookupFilters
+from kittens_answers_core.models import QuestionTypes, Submission
+from kittens_answers_core.uow.db import SQLAlchemyUnitOfWork
+from tests.uow.fixture_types import (
+    QuestionDataFactory,
+    QuestionFactory,
+    UIDFactory,
+    UOWTypes,
+    UserDataFactory,
+    UserFactory,
+)
+
+pytestmark = pytest.mark.anyio
+
+
+class TestLookupFilters:
+    async def test_populate(self, uow: UOWTypes, user_factory: UserFactory, question_factory: QuestionFactory) -> None:
+        user = await user_factory()
+        question = await question_factory(user_uid=user.uid)
+        lookup_filters = LookupFilters(capacity=1000)
+        await lookup_filters.populate(uow, batch_size=2)
+
+        assert lookup_filters.ready
+        assert lookup_filters.may_have_user(user.foreign_id)
+        async with uow:
+            assert lookup_filters.may_have_question(
+                uow.question_services.fingerprint(
+                    question.question_type, question.text, question.options, question.extra_options
+                )
+            )
+        assert lookup_filters.stats()["users"].count >= 1
+
+    async def test_definite_miss_skips_database(
+        self, uow: UOWTypes, user_data_factory: UserDataFactory, question_data_factory: QuestionDataFactory
+    ) -> None:
+        if not isinstance(uow, SQLAlchemyUnitOfWork):
+            pytest.skip("only database lookups are filtered")
+        lookup_filters = LookupFilters(capacity=1000)
+        await lookup_filters.populate(uow)
+        filtered = type(uow)(uow._engine, lookup_filters=lookup_filters)  # pyright: ignore [reportPrivateUsage]
+        user_data, question_data = user_data_factory(), question_data_factory()
+
+        async with filtered:
+            with pytest.raises(UserDoesNotExistError):
+                await filtered.user_services.get_by_foreign_id(user_data["foreign_id"])
+            user = await filtered.user_services.create(**user_data)
+            await filtered.question_services.create(creator_id=user.uid, **question_data)
+            await filtered.commit()
+
+        async with filtered:
+            assert await filtered.user_services.get_by_foreign_id(user_data["foreign_id"]) == user
+            assert await filtered.question_services.get(**question_data)
+            with pytest.raises(QuestionDoesNotExistError):
+                await filtered.question_services.get(**question_data_factory())
+
+    async def test_unseen_user_is_found(self, uow: UOWTypes, user_factory: UserFactory) -> None:
+        if not isinstance(uow, SQLAlchemyUnitOfWork):
+            pytest.skip("only database lookups are filtered")
+        lookup_filters = LookupFilters(capacity=1000)
+        await lookup_filters.populate(uow)
+        filtered = type(uow)(uow._engine, lookup_filters=lookup_filters)  # pyright: ignore [reportPrivateUsage]
+        # written by a unit of work the filters never saw
+        unseen = await user_factory()
+
+        async with filtered:
+            result = await filtered.submit(
+                Submission(
+                    foreign_id=unseen.foreign_id,
+                    question_type=QuestionTypes.ONE,
+                    question_text="asked by an unseen user",
+                    options={"a", "b"},
+                    extra_options=set(),
+                    answer=["a"],
+                    extra_answer=[],
+                    is_correct=True,
+                )
+            )
+            await filtered.commit()
+
+        assert (result.user, result.user_created) == (unseen, False)
+        async with filtered:
+            assert await filtered.user_services.get_by_foreign_id(unseen.foreign_id) == unseen
+
+    async def test_unknown_creator_is_not_remembered(
+        self, uow: UOWTypes, question_data_factory: QuestionDataFactory, uid_factory: UIDFactory
+    ) -> None:
+        if not isinstance(uow, SQLAlchemyUnitOfWork):
+            pytest.skip("only database lookups are filtered")
+        lookup_filters = LookupFilters(capacity=1000)
+        await lookup_filters.populate(uow)
+        filtered = type(uow)(uow._engine, lookup_filters=lookup_filters)  # pyright: ignore [reportPrivateUsage]
+        question_data = question_data_factory()
+
+        with pytest.raises(IntegrityError):
+            async with filtered:
+                await filtered.question_services.create(creator_id=uid_factory(), **question_data)
+        async with filtered:
+            assert not lookup_filters.may_have_question(filtered.question_services.fingerprint(**question_data))
+
+    async def test_sync_keeps_up_with_the_feed(self, uow: UOWTypes, user_data_factory: UserDataFactory) -> None:
+        feed = ChangeFeed()
+        uow.feed = feed
+        lookup_filters = LookupFilters(capacity=1000)
+        syncing = asyncio.create_task(lookup_filters.sync(uow, feed))
+        user_data = user_data_factory()
+        try:
+            async with uow:
+                await uow.user_services.create(**user_data)
+                await uow.commit()
+            async with asyncio.timeout(5):
+                while not (lookup_filters.ready and lookup_filters.may_have_user(user_data["foreign_id"])):
+                    await asyncio.sleep(0.01)
+        finally:
+            syncing.cancel()
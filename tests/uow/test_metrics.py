@@ -0,0 +1,74 @@
+import tracemalloc
+
+import pytest
+
+from kittens_answers_core.errors import UserDoesNotExistError
+from kittens_answers_core.metrics.base import (
+    REPOSITORY_ENTITIES,
+    TRANSACTION_ALLOCATED_BYTES,
+    TRANSACTION_SECONDS,
+    MetricsSink,
+)
+from kittens_answers_core.uow.memory import MemoryUnitOfWork
+from tests.uow.fixture_types import UOWTypes, UserFactory
+
+pytestmark = pytest.mark.anyio
+
+
+class TestMetrics:
+    async def test_transaction_latency(self, uow: UOWTypes, user_factory: UserFactory) -> None:
+        user = await user_factory()
+        metrics = uow.metrics = MetricsSink()
+
+        async with uow.reader() as reader:
+            await reader.user_services.get_by_uid(user.uid)
+        with pytest.raises(UserDoesNotExistError):
+            async with uow:
+                await uow.user_services.get_by_foreign_id("nobody")
+
+        samples = metrics.drain()
+        assert [sample.name for sample in samples] == [TRANSACTION_SECONDS, TRANSACTION_SECONDS]
+        assert [(sample.labels["mode"], sample.labels["outcome"]) for sample in samples] == [
+            ("read", "ok"),
+            ("write", "error"),
+        ]
+        assert all(sample.labels["backend"] == type(uow).__name__ and sample.value > 0 for sample in samples)
+
+    async def test_memory_footprint(self, uow: UOWTypes, user_factory: UserFactory) -> None:
+        if not isinstance(uow, MemoryUnitOfWork):
+            return
+        await user_factory()
+        metrics = uow.metrics = MetricsSink()
+
+        footprints = {footprint.repository: footprint for footprint in uow.profile_memory()}
+
+        assert footprints["user"].entities == len(uow.user_services.data)
+        assert footprints["question"].entities == len(uow.question_services.data)
+        assert footprints["answer"].entities == len(uow.answer_services.data)
+        assert all(footprint.data_bytes and footprint.backup_bytes for footprint in footprints.values())
+        assert footprints["answer"].index_bytes > 0
+        assert {
+            sample.labels["repository"]: sample.value
+            for sample in metrics.drain()
+            if sample.name == REPOSITORY_ENTITIES
+        } == {repository: footprint.entities for repository, footprint in footprints.items()}
+
+    async def test_memory_allocations(self, uow: UOWTypes) -> None:
+        if not isinstance(uow, MemoryUnitOfWork):
+            return
+        metrics = uow.metrics = MetricsSink()
+        uow.trace_allocations = True
+
+        try:
+            async with uow:
+                for index in range(100):
+                    await uow.user_services.create(f"traced user {index}")
+                await uow.commit()
+        finally:
+            tracemalloc.stop()
+
+        assert uow.last_allocations is not None
+        assert uow.last_allocations.allocated_bytes > 0
+        assert uow.last_allocations.sites
+        allocated = [sample for sample in metrics.drain() if sample.name == TRANSACTION_ALLOCATED_BYTES]
+        assert [sample.value for sample in allocated] == [uow.last_allocations.allocated_bytes]
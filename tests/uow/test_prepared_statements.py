@@ -0,0 +1,51 @@
+import pytest
+from sqlalchemy import func, select, text
+
+from kittens_answers_core.uow.db import SQLAlchemyUnitOfWork
+from kittens_answers_core.uow.sqlite import SQLiteUnitOfWork
+from tests.uow.fixture_types import UOWTypes, UserFactory
+
+pytestmark = pytest.mark.anyio
+
+
+async def _prepared(uow: SQLAlchemyUnitOfWork) -> int:
+    return await uow.session.scalar(select(func.count()).select_from(text("pg_prepared_statements"))) or 0
+
+
+class TestPreparedStatements:
+    @pytest.mark.parametrize(("prepare_threshold", "prepared"), [(None, False), (0, True)])
+    async def test_prepare_threshold(
+        self, uow: UOWTypes, user_factory: UserFactory, prepare_threshold: int | None, *, prepared: bool
+    ) -> None:
+        if not isinstance(uow, SQLAlchemyUnitOfWork) or isinstance(uow, SQLiteUnitOfWork):
+            return
+        user = await user_factory()
+        url = uow._engine.url  # pyright: ignore [reportPrivateUsage]
+        if url.get_driver_name() != "psycopg":
+            return
+        configured = SQLAlchemyUnitOfWork(
+            url.render_as_string(hide_password=False), prepare_threshold=prepare_threshold
+        )
+        try:
+            async with configured:
+                before = await _prepared(configured)
+                for _ in range(3):
+                    assert await configured.user_services.get_by_uid(user.uid) == user
+                assert (await _prepared(configured) > before) is prepared
+        finally:
+            await configured._engine.dispose()  # pyright: ignore [reportPrivateUsage]
+
+    async def test_hot_statements_reuse_compiled_cache(self, uow: UOWTypes, user_factory: UserFactory) -> None:
+        if not isinstance(uow, SQLAlchemyUnitOfWork):
+            return
+        users = [await user_factory() for _ in range(3)]
+        async with uow:
+            await uow.answer_services.list_for_question(users[0].uid, is_correct=True)
+            await uow.user_services.get_by_uid(users[0].uid)
+            compiled = uow._engine.sync_engine._compiled_cache  # pyright: ignore [reportPrivateUsage]
+            assert compiled is not None
+            cached = len(compiled)
+            for user in users:
+                assert await uow.user_services.get_by_uid(user.uid) == user
+                await uow.answer_services.list_for_question(user.uid, is_correct=True)
+            assert len(compiled) == cached
@@ -1,10 +1,19 @@
+import asyncio
+import unicodedata
+from uuid import uuid4
+
 import pytest
 
 from kittens_answers_core.errors import (
     QuestionAlreadyExistError,
     QuestionDoesNotExistError,
 )
+from kittens_answers_core.models import Question, QuestionTypes
+from kittens_answers_core.normalization import TextNormalizer, similarity, trigrams
+from kittens_answers_core.uow.db import SQLAlchemyUnitOfWork
+from kittens_answers_core.uow.sqlite import SQLiteUnitOfWork
 from tests.uow.fixture_types import (
+    QuestionDataDict,
     QuestionDataFactory,
     QuestionFactory,
     UIDFactory,
@@ -15,6 +24,16 @@ from tests.uow.fixture_types import (
 pytestmark = pytest.mark.anyio
 
 
+def _distinct_question_data() -> QuestionDataDict:
+    # random fixture data can repeat a question, a fresh text never does
+    return {
+        "question_type": QuestionTypes.MANY,
+        "question_text": str(uuid4()),
+        "options": {"a", "b"},
+        "extra_options": set(),
+    }
+
+
 class TestGetByUid:
     async def test_if_not_in_db(self, uow: UOWTypes, uid_factory: UIDFactory) -> None:
         with pytest.raises(QuestionDoesNotExistError):
@@ -28,6 +47,19 @@ class TestGetByUid:
         assert question == question_in_db
 
 
+class TestGetManyByUid:
+    async def test_skips_missing(
+        self, uow: UOWTypes, question_factory: QuestionFactory, uid_factory: UIDFactory
+    ) -> None:
+        questions = [await question_factory(_distinct_question_data()) for _ in range(5)]
+        async with uow:
+            found = await uow.question_services.get_many_by_uid(
+                [question.uid for question in questions] + [uid_factory()]
+            )
+
+        assert sorted(found, key=lambda question: question.uid) == sorted(questions, key=lambda question: question.uid)
+
+
 class TestGet:
     async def test_if_not_in_db(self, uow: UOWTypes, question_data_factory: QuestionDataFactory) -> None:
         with pytest.raises(QuestionDoesNotExistError):
@@ -81,3 +113,180 @@ class TestCreate:
                     creator_id=user_in_db.uid,
                 )
             assert question_in_db == question
+
+    async def test_concurrent_root(self, uow: UOWTypes, user_factory: UserFactory) -> None:
+        if not isinstance(uow, SQLAlchemyUnitOfWork) or isinstance(uow, SQLiteUnitOfWork):
+            pytest.skip("only postgres runs concurrent writers")
+        creator = await user_factory()
+
+        async def create(writer: UOWTypes, options: set[str]) -> Question:
+            return await writer.question_services.create(QuestionTypes.ONE, "shared root", options, set(), creator.uid)
+
+        first, second = uow.with_timeout(None), uow.with_timeout(None)
+        async with first:
+            await create(first, {"a", "b"})
+            async with second:
+                racing = asyncio.create_task(create(second, {"a", "c"}))
+                await asyncio.sleep(0.2)
+                await first.commit()
+                question = await racing
+                await second.commit()
+
+        async with uow:
+            assert await uow.question_services.get_by_uid(question.uid) == question
+        assert question.text == "shared root"
+
+
+class TestNormalization:
+    @staticmethod
+    def variants(text: str) -> list[str]:
+        return [
+            text,
+            f"  {text.replace(' ', '   ')}  ",
+            unicodedata.normalize("NFD", text),
+            text.replace("'", "\N{RIGHT SINGLE QUOTATION MARK}"),
+            f"{text}?",
+            f"{text} ...",
+        ]
+
+    async def test_variants_deduplicated(self, uow: UOWTypes, user_factory: UserFactory) -> None:
+        corpus = ["Which planet is the largest", "What's the café's name", "Выберите верный ответ"]
+        user = await user_factory()
+        created = []
+        for text in corpus:
+            for variant in self.variants(text):
+                try:
+                    async with uow:
+                        created.append(
+                            await uow.question_services.create(
+                                question_type=QuestionTypes.ONE,
+                                question_text=variant,
+                                options={"a", "b"},
+                                extra_options=set(),
+                                creator_id=user.uid,
+                            )
+                        )
+                        await uow.commit()
+                except QuestionAlreadyExistError:
+                    pass
+
+        assert [question.text for question in created] == corpus
+        async with uow:
+            for question, text in zip(created, corpus, strict=True):
+                for variant in self.variants(text):
+                    assert question == await uow.question_services.get(
+                        question_type=QuestionTypes.ONE, question_text=variant, options={"a", "b"}, extra_options=set()
+                    )
+
+    async def test_display_text_preserved(self, uow: UOWTypes, user_factory: UserFactory) -> None:
+        user = await user_factory()
+        async with uow:
+            question = await uow.question_services.create(
+                question_type=QuestionTypes.MANY,
+                question_text="  Pick   the \N{LEFT SINGLE QUOTATION MARK}odd\N{RIGHT SINGLE QUOTATION MARK} one?",
+                options={"a", "b"},
+                extra_options=set(),
+                creator_id=user.uid,
+            )
+            variant = await uow.question_services.create(
+                question_type=QuestionTypes.MANY,
+                question_text="Pick the 'odd' one",
+                options={"a", "b", "c"},
+                extra_options=set(),
+                creator_id=user.uid,
+            )
+            await uow.commit()
+
+        assert (
+            question.text
+            == variant.text
+            == "  Pick   the \N{LEFT SINGLE QUOTATION MARK}odd\N{RIGHT SINGLE QUOTATION MARK} one?"
+        )
+
+
+class TestSearch:
+    @pytest.fixture
+    async def questions(self, uow: UOWTypes, user_factory: UserFactory) -> list[Question]:
+        user = await user_factory()
+        questions = []
+        async with uow:
+            for question_type, text in [
+                (QuestionTypes.ONE, "Which planet is the largest in the solar system"),
+                (QuestionTypes.MANY, "Which planets of the solar system have rings"),
+                (QuestionTypes.ORDER, "Who wrote War and Peace"),
+            ]:
+                questions.append(
+                    await uow.question_services.create(
+                        question_type=question_type,
+                        question_text=text,
+                        options={"a", "b"},
+                        extra_options=set(),
+                        creator_id=user.uid,
+                    )
+                )
+            await uow.commit()
+        return questions
+
+    async def test_typo(self, uow: UOWTypes, questions: list[Question]) -> None:
+        text = "Wich planet is largest in the solar sytem?"
+        async with uow:
+            matches = await uow.question_services.search(text)
+        assert [match.question for match in matches] == questions[:2]
+        assert matches[0].score == pytest.approx(
+            similarity(trigrams(TextNormalizer()(text)), trigrams(questions[0].text)), rel=1e-6
+        )
+
+    async def test_question_type(self, uow: UOWTypes, questions: list[Question]) -> None:
+        async with uow:
+            matches = await uow.question_services.search("Which planets have rings", QuestionTypes.MANY)
+            assert [match.question for match in matches] == [questions[1]]
+            assert await uow.question_services.search("Which planets have rings", QuestionTypes.ORDER) == []
+
+    async def test_limit(self, uow: UOWTypes, questions: list[Question]) -> None:
+        async with uow:
+            matches = await uow.question_services.search("Which planet is the largest", limit=1)
+        assert [match.question for match in matches] == questions[:1]
+
+    @pytest.mark.usefixtures("questions")
+    async def test_no_match(self, uow: UOWTypes) -> None:
+        async with uow:
+            assert await uow.question_services.search("Completely unrelated text") == []
+
+
+class TestScan:
+    async def test_pages(self, uow: UOWTypes, question_factory: QuestionFactory) -> None:
+        created = [await question_factory() for _ in range(5)]
+        scanned: list[Question] = []
+        async with uow:
+            while page := await uow.question_services.scan(scanned[-1].uid if scanned else None, limit=2):
+                assert len(page) <= 2
+                scanned.extend(page)
+        assert [question.uid for question in scanned] == sorted({question.uid for question in scanned})
+        assert all(question in scanned for question in created)
+
+
+class TestListByCreator:
+    async def test_pages(self, uow: UOWTypes, user_factory: UserFactory, question_factory: QuestionFactory) -> None:
+        user = await user_factory()
+        created = [await question_factory(_distinct_question_data(), user_uid=user.uid) for _ in range(5)]
+        await question_factory(_distinct_question_data())
+        listed: list[Question] = []
+        async with uow:
+            while page := await uow.question_services.list_by_creator(
+                user.uid, listed[-1].uid if listed else None, limit=2
+            ):
+                assert len(page) <= 2
+                listed.extend(page)
+        assert listed == sorted(created, key=lambda question: question.uid)
+
+    async def test_count(
+        self, uow: UOWTypes, user_factory: UserFactory, question_factory: QuestionFactory, uid_factory: UIDFactory
+    ) -> None:
+        first, second = await user_factory(), await user_factory()
+        for user, questions in ((first, 3), (second, 1)):
+            for _ in range(questions):
+                await question_factory(_distinct_question_data(), user_uid=user.uid)
+        missing = uid_factory()
+        async with uow:
+            counts = await uow.question_services.count_by_creator([first.uid, second.uid, missing])
+        assert counts == {first.uid: 3, second.uid: 1}
@@ -0,0 +1,67 @@
+import pytest
+
+from kittens_answers_core.errors import ReadOnlyError, UserDoesNotExistError
+from kittens_answers_core.models import AnswerSubmission
+from tests.uow.fixture_types import AnswerFactory, UOWTypes, UserDataFactory, UserFactory
+
+pytestmark = pytest.mark.anyio
+
+
+class TestReadOnly:
+    async def test_reads(self, uow: UOWTypes, user_factory: UserFactory, answer_factory: AnswerFactory) -> None:
+        user_in_db = await user_factory()
+        answer_in_db = await answer_factory()
+        async with uow.reader() as reader:
+            assert await reader.user_services.get_by_uid(uid=user_in_db.uid) == user_in_db
+            assert await reader.answer_services.get_by_uid(answer_uid=answer_in_db.uid) == answer_in_db
+
+    async def test_refuses_create(self, uow: UOWTypes, user_data_factory: UserDataFactory) -> None:
+        user_data = user_data_factory()
+        with pytest.raises(ReadOnlyError):
+            async with uow.reader() as reader:
+                await reader.user_services.create(**user_data)
+
+        async with uow:
+            assert await uow.user_services.create(**user_data)
+
+    async def test_refuses_bulk_write(self, uow: UOWTypes, answer_factory: AnswerFactory) -> None:
+        answer_in_db = await answer_factory()
+        submission = AnswerSubmission(
+            creator=answer_in_db.creator,
+            question_uid=answer_in_db.question_uid,
+            answer=answer_in_db.answer,
+            extra_answer=answer_in_db.extra_answer,
+            is_correct=not answer_in_db.is_correct,
+        )
+        with pytest.raises(ReadOnlyError):
+            async with uow.reader() as reader:
+                await reader.answer_services.create_many([submission])
+
+    async def test_refuses_commit(self, uow: UOWTypes) -> None:
+        with pytest.raises(ReadOnlyError):
+            async with uow.reader() as reader:
+                await reader.commit()
+
+    async def test_writers_and_readers_overlap(self, uow: UOWTypes, user_data_factory: UserDataFactory) -> None:
+        async with uow.reader() as reader:
+            async with uow.with_timeout(None) as writer:
+                user = await writer.user_services.create(**user_data_factory())
+                await writer.commit()
+            async with uow.reader() as other_reader:
+                assert await other_reader.user_services.get_by_uid(uid=user.uid) == user
+            with pytest.raises(ReadOnlyError):
+                await reader.user_services.create(**user_data_factory())
+
+    async def test_readers_see_committed_rows(
+        self, uow: UOWTypes, user_factory: UserFactory, user_data_factory: UserDataFactory
+    ) -> None:
+        user_in_db = await user_factory()
+        async with uow.reader() as reader:
+            async with uow.with_timeout(None) as writer:
+                user = await writer.user_services.create(**user_data_factory())
+                async with uow.reader() as other_reader:
+                    with pytest.raises(UserDoesNotExistError):
+                        await other_reader.user_services.get_by_uid(uid=user.uid)
+            assert await reader.user_services.get_by_uid(uid=user_in_db.uid) == user_in_db
+            with pytest.raises(UserDoesNotExistError):
+                await reader.user_services.get_by_uid(uid=user.uid)
@@ -0,0 +1,95 @@
+from collections.abc import Awaitable, Callable
+from concurrent.futures import ProcessPoolExecutor
+from typing import TypeAlias
+
+import pytest
+
+from kittens_answers_core.models import Question
+from kittens_answers_core.services.reputation import compute_reputation
+from kittens_answers_core.uow.db import SQLAlchemyUnitOfWork
+from kittens_answers_core.uow.sqlite import SQLiteUnitOfWork
+from tests.uow.fixture_types import AnswerDataDict, AnswerFactory, QuestionFactory, UOWTypes, UserFactory
+
+pytestmark = pytest.mark.anyio
+
+VoteFactory: TypeAlias = Callable[..., Awaitable[None]]
+
+
+@pytest.fixture
+async def question(question_factory: QuestionFactory) -> Question:
+    return await question_factory()
+
+
+@pytest.fixture
+def vote(question: Question, user_factory: UserFactory, answer_factory: AnswerFactory) -> VoteFactory:
+    async def _vote(answer: str, *, is_correct: bool) -> None:
+        await answer_factory(
+            answer_data=AnswerDataDict(
+                answer=[answer], extra_answer=[], is_correct=is_correct, question_uid=question.uid
+            ),
+            question=question,
+            user_uid=(await user_factory()).uid,
+        )
+
+    return _vote
+
+
+class TestComputeReputation:
+    async def test_full_run(self, uow: UOWTypes, question: Question, vote: VoteFactory) -> None:
+        await vote("x", is_correct=True)
+        await vote("x", is_correct=False)
+        await vote("y", is_correct=True)
+
+        with ProcessPoolExecutor(max_workers=2) as executor:
+            run = await compute_reputation(uow, partitions=2, executor=executor)
+
+        async with uow:
+            consensus = await uow.answer_services.get_consensus(question.uid)
+            answers = await uow.answer_services.list_for_question(question.uid)
+            reputations = await uow.user_services.get_reputations([answer.creator for answer in answers])
+        assert run.watermark > 0
+        assert consensus.answer == ["y"]
+        assert consensus.score == pytest.approx(2 / 3)
+        assert sorted((reputation.agreed, reputation.total) for reputation in reputations) == [(0, 0), (0, 0), (1, 1)]
+
+    async def test_incremental_run(self, uow: UOWTypes, question: Question, vote: VoteFactory) -> None:
+        await vote("x", is_correct=True)
+        await vote("x", is_correct=False)
+        await vote("y", is_correct=True)
+        first_run = await compute_reputation(uow)
+
+        await vote("y", is_correct=False)
+        second_run = await compute_reputation(uow, watermark=first_run.watermark)
+
+        async with uow:
+            consensus = await uow.answer_services.get_consensus(question.uid)
+        assert second_run.watermark > first_run.watermark
+        assert second_run.questions == 1
+        assert consensus.answer == ["y"]
+        assert consensus.score == pytest.approx(2 / 3 - 1 / 2)
+        assert await compute_reputation(uow, watermark=second_run.watermark) == second_run.model_copy(
+            update={"users": 0, "questions": 0}
+        )
+
+    async def test_watermark_waits_for_in_flight_answers(
+        self, uow: UOWTypes, question: Question, user_factory: UserFactory, vote: VoteFactory
+    ) -> None:
+        if not isinstance(uow, SQLAlchemyUnitOfWork) or isinstance(uow, SQLiteUnitOfWork):
+            pytest.skip("only postgres commits out of seq order")
+        creator = await user_factory()
+        held = uow.with_timeout(None)
+        async with held:
+            await held.answer_services.create(["x"], [], question.uid, creator.uid, is_correct=True)
+            await vote("y", is_correct=False)
+            first_run = await compute_reputation(uow)
+            await held.commit()
+
+        second_run = await compute_reputation(uow, watermark=first_run.watermark)
+
+        async with uow:
+            consensus = await uow.answer_services.get_consensus(question.uid)
+            [reputation] = await uow.user_services.get_reputations([creator.uid])
+        assert (first_run.watermark, first_run.questions) == (0, 0)
+        assert second_run.questions == 1
+        assert consensus.answer == ["x"]
+        assert (reputation.agreed, reputation.total) == (1, 1)
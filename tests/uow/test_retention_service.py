@@ -0,0 +1,176 @@
+import asyncio
+from datetime import timedelta
+from uuid import UUID, uuid4
+
+import pytest
+
+from kittens_answers_core.errors import QuestionDoesNotExistError
+from kittens_answers_core.identifiers import set_uid_factory, uuid7
+from kittens_answers_core.models import Answer, Question
+from kittens_answers_core.services.retention import RetentionPolicy, apply_retention
+from tests.uow.fixture_types import AnswerDataDict, AnswerFactory, QuestionDataFactory, QuestionFactory, UOWTypes
+
+pytestmark = pytest.mark.anyio
+
+EVERYTHING = timedelta(0)
+
+
+async def _vote(answer_factory: AnswerFactory, question: Question, answer: str, *, is_correct: bool) -> Answer:
+    return await answer_factory(
+        answer_data=AnswerDataDict(answer=[answer], extra_answer=[], is_correct=is_correct, question_uid=question.uid),
+        question=question,
+    )
+
+
+class TestRetention:
+    async def test_superseded_answers(
+        self, uow: UOWTypes, question_factory: QuestionFactory, answer_factory: AnswerFactory
+    ) -> None:
+        question = await question_factory()
+        superseded = [await _vote(answer_factory, question, str(index), is_correct=False) for index in range(3)]
+        correct = await _vote(answer_factory, question, "correct", is_correct=True)
+        later = await _vote(answer_factory, question, "later", is_correct=False)
+        await asyncio.sleep(0.01)
+
+        report = await apply_retention(
+            uow,
+            RetentionPolicy(
+                superseded_answers_after=EVERYTHING,
+                unanswered_questions_after=None,
+                orphaned_roots=False,
+                batch_size=2,
+                pause=0,
+            ),
+        )
+
+        assert report.superseded_answers.rows == len(superseded)
+        assert report.superseded_answers.bytes > 0
+        assert report.batches == 2
+        async with uow:
+            answers = await uow.answer_services.list_for_question(question.uid)
+            statistics = await uow.answer_services.get_statistics(question.uid)
+            await uow.answer_services.rebuild_statistics()
+            assert await uow.answer_services.get_statistics(question.uid) == statistics
+        assert answers == sorted([correct, later], key=lambda answer: answer.uid)
+        assert sorted(statistic.answer for statistic in statistics) == [["correct"], ["later"]]
+
+    async def test_unanswered_questions_and_orphaned_roots(
+        self,
+        uow: UOWTypes,
+        question_factory: QuestionFactory,
+        question_data_factory: QuestionDataFactory,
+        answer_factory: AnswerFactory,
+    ) -> None:
+        unanswered_data = question_data_factory()
+        unanswered_data["question_text"] = "a question nobody ever answered"
+        unanswered = await question_factory(unanswered_data)
+        answered = await question_factory()
+        await _vote(answer_factory, answered, "a", is_correct=True)
+        await asyncio.sleep(0.01)
+
+        report = await apply_retention(
+            uow, RetentionPolicy(superseded_answers_after=None, unanswered_questions_after=EVERYTHING, pause=0)
+        )
+
+        assert report.unanswered_questions.rows == 1
+        assert report.orphaned_roots.rows == 1
+        assert report.total.bytes == report.unanswered_questions.bytes + report.orphaned_roots.bytes
+        async with uow:
+            with pytest.raises(QuestionDoesNotExistError):
+                await uow.question_services.get_by_uid(unanswered.uid)
+            assert await uow.question_services.get_by_uid(answered.uid) == answered
+            assert [match.question for match in await uow.question_services.search(unanswered.text)] == []
+            recreated = await uow.question_services.create(
+                unanswered.question_type,
+                unanswered.text,
+                unanswered.options,
+                unanswered.extra_options,
+                answered.creator,
+            )
+            await uow.commit()
+        assert recreated.text == unanswered.text
+
+    async def test_default_ages_keep_recent_rows(
+        self, uow: UOWTypes, question_factory: QuestionFactory, answer_factory: AnswerFactory
+    ) -> None:
+        question = await question_factory()
+        await question_factory()
+        await _vote(answer_factory, question, "wrong", is_correct=False)
+        await _vote(answer_factory, question, "right", is_correct=True)
+
+        report = await apply_retention(uow, RetentionPolicy(pause=0))
+
+        assert report.total.rows == 0
+
+    async def test_rows_without_uuid7_never_age(
+        self, uow: UOWTypes, question_factory: QuestionFactory, answer_factory: AnswerFactory
+    ) -> None:
+        # random uids that sort below every uuid7 floor
+        set_uid_factory(lambda: UUID(int=uuid4().int & ((1 << 62) - 1) | 4 << 76 | 0b10 << 62))
+        try:
+            unanswered = await question_factory()
+            question = await question_factory()
+            wrong = await _vote(answer_factory, question, "wrong", is_correct=False)
+            await _vote(answer_factory, question, "right", is_correct=True)
+        finally:
+            set_uid_factory(uuid7)
+        await asyncio.sleep(0.01)
+
+        await apply_retention(
+            uow,
+            RetentionPolicy(
+                superseded_answers_after=EVERYTHING,
+                unanswered_questions_after=EVERYTHING,
+                orphaned_roots=False,
+                pause=0,
+            ),
+        )
+
+        async with uow:
+            assert await uow.question_services.get_by_uid(unanswered.uid) == unanswered
+            assert await uow.answer_services.get_by_uid(wrong.uid) == wrong
+
+    async def test_later_means_inserted_later(
+        self, uow: UOWTypes, question_factory: QuestionFactory, answer_factory: AnswerFactory
+    ) -> None:
+        early = uuid7()
+        question = await question_factory()
+        await _vote(answer_factory, question, "right", is_correct=True)
+        # inserted after the correct answer, but with a uid that sorts before it
+        set_uid_factory(lambda: early)
+        try:
+            wrong = await _vote(answer_factory, question, "wrong", is_correct=False)
+        finally:
+            set_uid_factory(uuid7)
+        await asyncio.sleep(0.01)
+
+        await apply_retention(
+            uow,
+            RetentionPolicy(superseded_answers_after=EVERYTHING, unanswered_questions_after=None, pause=0),
+        )
+
+        async with uow:
+            assert await uow.answer_services.get_by_uid(wrong.uid) == wrong
+
+    async def test_watermarks_survive_compaction(
+        self, uow: UOWTypes, question_factory: QuestionFactory, answer_factory: AnswerFactory
+    ) -> None:
+        question = await question_factory()
+        for index in range(3):
+            await _vote(answer_factory, question, str(index), is_correct=False)
+        await _vote(answer_factory, question, "correct", is_correct=True)
+        async with uow:
+            watermark = 0
+            while (page := await uow.answer_services.list_since(watermark))[0]:
+                watermark = page[1]
+        await asyncio.sleep(0.01)
+
+        await apply_retention(
+            uow,
+            RetentionPolicy(superseded_answers_after=EVERYTHING, unanswered_questions_after=None, pause=0),
+        )
+        created = await _vote(answer_factory, question, "new", is_correct=False)
+
+        async with uow:
+            answers, _ = await uow.answer_services.list_since(watermark)
+        assert answers == [created]
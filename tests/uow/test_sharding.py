@@ -0,0 +1,104 @@
+import pytest
+from sqlalchemy import func, select
+
+from kittens_answers_core.models import AnswerSubmission, UserReputation
+from kittens_answers_core.models.db_models import DBAnswer, DBQuestion, DBUser
+from kittens_answers_core.uow.sharded import ShardedUnitOfWork
+from tests.uow.fixture_types import AnswerDataFactory, QuestionDataFactory, UOWTypes, UserDataFactory, UserFactory
+
+pytestmark = pytest.mark.anyio
+
+
+async def _count(uow: ShardedUnitOfWork, model: type[DBUser | DBQuestion | DBAnswer]) -> list[int]:
+    counts = []
+    for shard in uow.shards:
+        async with shard._engine.connect() as connection:  # pyright: ignore [reportPrivateUsage]
+            counts.append(await connection.scalar(select(func.count()).select_from(model)) or 0)
+    return counts
+
+
+class TestRouting:
+    async def test_users_spread(self, uow: UOWTypes, user_data_factory: UserDataFactory) -> None:
+        if not isinstance(uow, ShardedUnitOfWork):
+            return
+        async with uow:
+            users = [await uow.user_services.create(**user_data_factory()) for _ in range(30)]
+            await uow.commit()
+
+        counts = await _count(uow, DBUser)
+        assert sum(counts) == len(users)
+        assert all(counts)
+        async with uow:
+            for user in users:
+                assert await uow.user_services.get_by_foreign_id(user.foreign_id) == user
+                assert await uow.user_services.get_by_uid(user.uid) == user
+
+    async def test_answers_follow_question(
+        self,
+        uow: UOWTypes,
+        question_data_factory: QuestionDataFactory,
+        answer_data_factory: AnswerDataFactory,
+    ) -> None:
+        if not isinstance(uow, ShardedUnitOfWork):
+            return
+        async with uow:
+            creators = [await uow.user_services.create(foreign_id=f"creator-{index}") for index in range(6)]
+            questions = [
+                await uow.question_services.create(creator_id=creators[index].uid, **question_data_factory())
+                for index in range(6)
+            ]
+            results = await uow.answer_services.create_many(
+                [
+                    AnswerSubmission(creator=creator.uid, **answer_data_factory(question))
+                    for creator in creators
+                    for question in questions
+                ]
+            )
+            await uow.commit()
+
+        async with uow:
+            routes = await uow.router.locate_questions([question.uid for question in questions])
+            for result in results:
+                assert await uow.answer_services.get_by_uid(result.answer.uid) == result.answer
+        for index, shard in enumerate(uow.shards):
+            async with shard._engine.connect() as connection:  # pyright: ignore [reportPrivateUsage]
+                question_uids = set(await connection.scalars(select(DBAnswer.question_uid).distinct()))
+            assert question_uids <= {uid for uid, route in routes.items() if route == index}
+        assert len(routes) == len(questions)
+
+    async def test_reference_copies(
+        self, uow: UOWTypes, user_factory: UserFactory, question_data_factory: QuestionDataFactory
+    ) -> None:
+        if not isinstance(uow, ShardedUnitOfWork):
+            return
+        user = await user_factory()
+        async with uow:
+            for _ in range(12):
+                await uow.question_services.create(creator_id=user.uid, **question_data_factory())
+            await uow.user_services.save_reputations([UserReputation(user_uid=user.uid, agreed=1, total=2)])
+            await uow.commit()
+
+        assert sum(count > 0 for count in await _count(uow, DBQuestion)) > 1
+        async with uow:
+            assert await uow.user_services.get_many_by_uid([user.uid]) == [user]
+            assert await uow.user_services.scan() == [user]
+            assert await uow.user_services.get_reputations([user.uid]) == [
+                UserReputation(user_uid=user.uid, agreed=1, total=2)
+            ]
+
+    async def test_rollback_forgets_references(
+        self, uow: UOWTypes, user_factory: UserFactory, question_data_factory: QuestionDataFactory
+    ) -> None:
+        if not isinstance(uow, ShardedUnitOfWork):
+            return
+        user = await user_factory()
+        async with uow:
+            for _ in range(12):
+                await uow.question_services.create(creator_id=user.uid, **question_data_factory())
+
+        async with uow:
+            for _ in range(12):
+                await uow.question_services.create(creator_id=user.uid, **question_data_factory())
+            await uow.commit()
+
+        assert sum(await _count(uow, DBQuestion)) == 12
@@ -0,0 +1,80 @@
+import asyncio
+
+import pytest
+
+from kittens_answers_core.errors import QuestionDoesNotExistError, UserDoesNotExistError
+from kittens_answers_core.services.single_flight import CoalescingReader
+from tests.uow.fixture_types import QuestionDataFactory, QuestionFactory, UOWFactory, UserDataFactory, UserFactory
+
+pytestmark = pytest.mark.anyio
+
+
+class TestCoalescingReader:
+    async def test_user_by_foreign_id(self, uow_factory: UOWFactory, user_factory: UserFactory) -> None:
+        user_in_db = await user_factory()
+        reader = CoalescingReader(uow_factory)
+
+        users = await asyncio.gather(*(reader.get_user_by_foreign_id(user_in_db.foreign_id) for _ in range(10)))
+
+        assert users == [user_in_db] * 10
+        assert (reader.calls, reader.collapsed) == (1, 9)
+        assert await reader.get_user_by_uid(user_in_db.uid) == user_in_db
+        assert (reader.calls, reader.collapsed) == (2, 9)
+
+    async def test_shared_error(self, uow_factory: UOWFactory, user_data_factory: UserDataFactory) -> None:
+        reader = CoalescingReader(uow_factory)
+
+        results = await asyncio.gather(
+            *(reader.get_user_by_foreign_id(**user_data_factory()) for _ in range(2)),
+            *(reader.get_user_by_foreign_id("missing") for _ in range(3)),
+            return_exceptions=True,
+        )
+
+        assert all(isinstance(result, UserDoesNotExistError) for result in results)
+        assert (reader.calls, reader.collapsed) == (3, 2)
+
+    async def test_question(self, uow_factory: UOWFactory, question_factory: QuestionFactory) -> None:
+        question_in_db = await question_factory()
+        reader = CoalescingReader(uow_factory)
+
+        questions = await asyncio.gather(
+            *(
+                reader.get_question(
+                    question_type=question_in_db.question_type,
+                    question_text=question_in_db.text,
+                    options=set(question_in_db.options),
+                    extra_options=set(question_in_db.extra_options),
+                )
+                for _ in range(5)
+            ),
+            *(reader.get_question_by_uid(question_in_db.uid) for _ in range(5)),
+        )
+
+        assert questions == [question_in_db] * 10
+        assert (reader.calls, reader.collapsed) == (2, 8)
+
+    async def test_question_by_normalized_text(
+        self, uow_factory: UOWFactory, question_factory: QuestionFactory
+    ) -> None:
+        question_in_db = await question_factory()
+        reader = CoalescingReader(uow_factory)
+
+        questions = await asyncio.gather(
+            *(
+                reader.get_question(
+                    question_type=question_in_db.question_type,
+                    question_text=text,
+                    options=set(question_in_db.options),
+                    extra_options=set(question_in_db.extra_options),
+                )
+                for text in (question_in_db.text, f"  {question_in_db.text} ", question_in_db.text.replace(" ", "  "))
+            )
+        )
+
+        assert questions == [question_in_db] * 3
+        assert (reader.calls, reader.collapsed) == (1, 2)
+
+    async def test_question_missing(self, uow_factory: UOWFactory, question_data_factory: QuestionDataFactory) -> None:
+        reader = CoalescingReader(uow_factory)
+        with pytest.raises(QuestionDoesNotExistError):
+            await reader.get_question(**question_data_factory())
@@ -0,0 +1,148 @@
+import asyncio
+from typing import Any
+
+import pytest
+from sqlalchemy import event
+
+from kittens_answers_core.models import ChangeKinds, QuestionTypes, Submission
+from kittens_answers_core.services.submission import submit_answer
+from kittens_answers_core.uow.db import SQLAlchemyUnitOfWork
+from kittens_answers_core.uow.sqlite import SQLiteUnitOfWork
+from tests.uow.fixture_types import UOWTypes
+
+pytestmark = pytest.mark.anyio
+
+
+def _submission(**overrides: Any) -> Submission:
+    return Submission.model_validate(
+        {
+            "foreign_id": "submitter",
+            "question_type": QuestionTypes.MANY,
+            "question_text": "which of these are submitted",
+            "options": {"a", "b", "c"},
+            "extra_options": set(),
+            "answer": ["b", "a"],
+            "extra_answer": [],
+            "is_correct": True,
+        }
+        | overrides
+    )
+
+
+class TestSubmitAnswer:
+    async def test_creates_everything(self, uow: UOWTypes) -> None:
+        result = await submit_answer(uow, _submission())
+
+        assert (result.user_created, result.question_created, result.answer_created) == (True, True, True)
+        assert result.answer.answer == ["a", "b"]
+        async with uow:
+            assert await uow.user_services.get_by_foreign_id("submitter") == result.user
+            assert await uow.question_services.get_by_uid(result.question.uid) == result.question
+            assert await uow.answer_services.get_by_uid(result.answer.uid) == result.answer
+            [statistic] = await uow.answer_services.get_statistics(result.question.uid)
+        assert (statistic.answer, statistic.correct_count, statistic.incorrect_count) == (["a", "b"], 1, 0)
+
+    async def test_resubmission_is_a_no_op(self, uow: UOWTypes) -> None:
+        first = await submit_answer(uow, _submission())
+
+        again = await submit_answer(uow, _submission(answer=["a", "b"]))
+
+        assert not again.created
+        assert (again.user, again.question, again.answer) == (first.user, first.question, first.answer)
+        async with uow:
+            assert await uow.answer_services.list_for_question(first.question.uid) == [first.answer]
+            [statistic] = await uow.answer_services.get_statistics(first.question.uid)
+        assert statistic.correct_count == 1
+
+    async def test_reuses_other_users_rows(self, uow: UOWTypes) -> None:
+        first = await submit_answer(uow, _submission())
+
+        same_answer = await submit_answer(uow, _submission(foreign_id="another submitter"))
+        new_answer = await submit_answer(
+            uow, _submission(foreign_id="another submitter", answer=["c"], is_correct=False)
+        )
+
+        assert (same_answer.user_created, same_answer.question_created, same_answer.answer_created) == (
+            True,
+            False,
+            False,
+        )
+        assert same_answer.answer == first.answer
+        assert (new_answer.user, new_answer.question) == (same_answer.user, first.question)
+        assert new_answer.answer_created
+        assert new_answer.answer.creator == same_answer.user.uid
+
+    async def test_new_variant_keeps_root_text(self, uow: UOWTypes) -> None:
+        first = await submit_answer(uow, _submission())
+
+        variant = await submit_answer(
+            uow, _submission(question_text=" which of these  are submitted ", options={"a", "b"})
+        )
+
+        assert variant.question_created
+        assert variant.question.uid != first.question.uid
+        assert variant.question.text == first.question.text
+        async with uow:
+            assert await uow.question_services.get_by_uid(variant.question.uid) == variant.question
+
+    async def test_concurrent_submissions_on_postgres(self, uow: UOWTypes) -> None:
+        if not isinstance(uow, SQLAlchemyUnitOfWork) or isinstance(uow, SQLiteUnitOfWork):
+            return
+        results = await asyncio.gather(*(submit_answer(uow.with_timeout(None), _submission()) for _ in range(5)))
+
+        assert len({(result.user.uid, result.question.uid, result.answer.uid) for result in results}) == 1
+        assert sum(result.answer_created for result in results) == 1
+
+    async def test_fallback_keeps_partial_inserts_on_postgres(self, uow: UOWTypes) -> None:
+        if not isinstance(uow, SQLAlchemyUnitOfWork) or isinstance(uow, SQLiteUnitOfWork):
+            pytest.skip("only postgres submits in a single statement")
+        submission = _submission(foreign_id="late submitter")
+        async with uow:
+            creator = await uow.user_services.create("question creator")
+            await uow.commit()
+
+        held = uow.with_timeout(None)
+        async with held:
+            await held.question_services.create(
+                submission.question_type,
+                submission.question_text,
+                submission.options,
+                submission.extra_options,
+                creator.uid,
+            )
+            async with uow:
+                # the statement inserts the user, then waits on the question held by the other transaction
+                submitting = asyncio.create_task(uow.submit(submission))
+                await asyncio.sleep(0.2)
+                await held.commit()
+                result = await submitting
+                changes = list(uow.changes)
+                await uow.commit()
+
+        assert (result.user_created, result.question_created, result.answer_created) == (True, False, True)
+        assert [(change.kind, change.uid) for change in changes if change.kind == ChangeKinds.USER] == [
+            (ChangeKinds.USER, result.user.uid)
+        ]
+        async with uow:
+            assert await uow.user_services.get_by_foreign_id("late submitter") == result.user
+
+    async def test_single_statement_on_postgres(self, uow: UOWTypes) -> None:
+        if not isinstance(uow, SQLAlchemyUnitOfWork) or isinstance(uow, SQLiteUnitOfWork):
+            return
+        statements: list[str] = []
+
+        def record(*arguments: Any) -> None:
+            if not arguments[2].startswith(("SAVEPOINT", "RELEASE SAVEPOINT")):
+                statements.append(arguments[2])
+
+        engine = uow._engine.sync_engine  # pyright: ignore [reportPrivateUsage]
+        event.listen(engine, "before_cursor_execute", record)
+        try:
+            await submit_answer(uow, _submission())
+            created = len(statements)
+            await submit_answer(uow, _submission())
+        finally:
+            event.remove(engine, "before_cursor_execute", record)
+
+        assert created == 1
+        assert len(statements) == created + 1
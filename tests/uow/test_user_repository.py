@@ -4,6 +4,7 @@ from kittens_answers_core.errors import (
     UserAlreadyExistError,
     UserDoesNotExistError,
 )
+from kittens_answers_core.models import User
 from tests.uow.fixture_types import UIDFactory, UOWTypes, UserDataFactory, UserFactory
 
 pytestmark = pytest.mark.anyio
@@ -39,6 +40,15 @@ class TestGetByUid:
         assert user == user_in_db
 
 
+class TestGetManyByUid:
+    async def test_skips_missing(self, uow: UOWTypes, user_factory: UserFactory, uid_factory: UIDFactory) -> None:
+        users = [await user_factory() for _ in range(5)]
+        async with uow:
+            found = await uow.user_services.get_many_by_uid([user.uid for user in users] + [uid_factory()])
+
+        assert sorted(found, key=lambda user: user.uid) == sorted(users, key=lambda user: user.uid)
+
+
 class TestCreate:
     async def test_if_not_in_db(self, uow: UOWTypes, user_data_factory: UserDataFactory) -> None:
         async with uow:
@@ -53,6 +63,22 @@ class TestCreate:
             async with uow:
                 await uow.user_services.create(foreign_id=user_in_db.foreign_id)
 
+    async def test_duplicates_keep_transaction(
+        self, uow: UOWTypes, user_factory: UserFactory, user_data_factory: UserDataFactory
+    ) -> None:
+        user_in_db = await user_factory()
+        fresh_data = [user_data_factory() for _ in range(3)]
+        async with uow:
+            for user_data in fresh_data:
+                with pytest.raises(UserAlreadyExistError):
+                    await uow.user_services.create(foreign_id=user_in_db.foreign_id)
+                await uow.user_services.create(**user_data)
+            await uow.commit()
+
+        async with uow:
+            for user_data in fresh_data:
+                assert await uow.user_services.get_by_foreign_id(foreign_id=user_data["foreign_id"])
+
     async def test_rollback(self, uow: UOWTypes, user_data_factory: UserDataFactory) -> None:
         user_data = user_data_factory()
         async with uow:
@@ -61,3 +87,15 @@ class TestCreate:
         with pytest.raises(UserDoesNotExistError):
             async with uow:
                 await uow.user_services.get_by_foreign_id(foreign_id=user_data["foreign_id"])
+
+
+class TestScan:
+    async def test_pages(self, uow: UOWTypes, user_factory: UserFactory) -> None:
+        created = [await user_factory() for _ in range(5)]
+        scanned: list[User] = []
+        async with uow:
+            while page := await uow.user_services.scan(scanned[-1].uid if scanned else None, limit=2):
+                assert len(page) <= 2
+                scanned.extend(page)
+        assert [user.uid for user in scanned] == sorted({user.uid for user in scanned})
+        assert all(user in scanned for user in created)
@@ -0,0 +1,95 @@
+import asyncio
+
+import pytest
+from sqlalchemy.exc import IntegrityError
+
+from kittens_answers_core.errors import QuestionDoesNotExistError
+from kittens_answers_core.models import AnswerSubmissionResult, QuestionTypes
+from kittens_answers_core.services.write_behind import AnswerWriteBehind
+from kittens_answers_core.uow.db import SQLAlchemyUnitOfWork
+from tests.uow.fixture_types import QuestionDataFactory, QuestionFactory, UIDFactory, UOWTypes, UserFactory
+
+pytestmark = pytest.mark.anyio
+
+
+class TestAnswerWriteBehind:
+    async def test_coalesced_batch(
+        self,
+        uow: UOWTypes,
+        user_factory: UserFactory,
+        question_factory: QuestionFactory,
+        question_data_factory: QuestionDataFactory,
+    ) -> None:
+        user = await user_factory()
+        question = await question_factory(question_data_factory(question_type=QuestionTypes.MANY), user_uid=user.uid)
+        async with AnswerWriteBehind(uow, max_delay=0.1) as writer:
+            results = await asyncio.gather(
+                *(
+                    writer.submit(answer, [], question.uid, user.uid, is_correct=True)
+                    for answer in (["a"], ["b"], ["b", "a"], ["a", "b"], ["a"])
+                )
+            )
+
+        assert writer.batches == 1
+        assert [result.created for result in results] == [True, True, True, False, False]
+        assert results[0].answer == results[4].answer
+        async with uow:
+            assert len(await uow.answer_services.list_for_question(question_uid=question.uid)) == 3
+
+    async def test_failure_is_isolated(
+        self, uow: UOWTypes, user_factory: UserFactory, question_factory: QuestionFactory, uid_factory: UIDFactory
+    ) -> None:
+        user = await user_factory()
+        question = await question_factory(user_uid=user.uid)
+        async with AnswerWriteBehind(uow, max_delay=0.1) as writer:
+            results = await asyncio.gather(
+                writer.submit(["a"], [], question.uid, user.uid, is_correct=True),
+                writer.submit(["a"], [], uid_factory(), user.uid, is_correct=True),
+                writer.submit(["b"], [], question.uid, user.uid, is_correct=False),
+                return_exceptions=True,
+            )
+
+        first, unknown, last = results
+        assert isinstance(unknown, QuestionDoesNotExistError)
+        assert isinstance(first, AnswerSubmissionResult)
+        assert isinstance(last, AnswerSubmissionResult)
+        assert (first.answer.answer, last.answer.answer) == (["a"], ["b"])
+
+    async def test_database_error_is_isolated(
+        self, uow: UOWTypes, user_factory: UserFactory, question_factory: QuestionFactory, uid_factory: UIDFactory
+    ) -> None:
+        if not isinstance(uow, SQLAlchemyUnitOfWork):
+            pytest.skip("only databases check the creator")
+        user = await user_factory()
+        question = await question_factory(user_uid=user.uid)
+        async with AnswerWriteBehind(uow, max_delay=0.1) as writer:
+            results = await asyncio.gather(
+                *(writer.submit([answer], [], question.uid, user.uid, is_correct=True) for answer in "abc"),
+                writer.submit(["d"], [], question.uid, uid_factory(), is_correct=True),
+                *(writer.submit([answer], [], question.uid, user.uid, is_correct=True) for answer in "ef"),
+                return_exceptions=True,
+            )
+
+        assert isinstance(results[3], IntegrityError)
+        assert all(
+            isinstance(result, AnswerSubmissionResult) and result.created for result in results[:3] + results[4:]
+        )
+        async with uow:
+            assert len(await uow.answer_services.list_for_question(question_uid=question.uid)) == 5
+
+    async def test_backpressure(
+        self, uow: UOWTypes, user_factory: UserFactory, question_factory: QuestionFactory
+    ) -> None:
+        user = await user_factory()
+        question = await question_factory(user_uid=user.uid)
+        async with AnswerWriteBehind(uow, max_batch_size=2, max_queue_size=1) as writer:
+            results = await asyncio.gather(
+                *(writer.submit([str(index)], [], question.uid, user.uid, is_correct=True) for index in range(6))
+            )
+
+        assert writer.batches >= 3
+        assert all(result.created for result in results)
+
+    async def test_not_running(self, uow: UOWTypes, uid_factory: UIDFactory) -> None:
+        with pytest.raises(RuntimeError):
+            await AnswerWriteBehind(uow).submit(["a"], [], uid_factory(), uid_factory(), is_correct=True)